@@ -0,0 +1,166 @@
+"""Headless batch validation of many root directories.
+
+Validates any number of roots in one long-lived process, without the Tk
+folder chooser or the closing "Press any key" prompt:
+
+    python batch_validation.py /mnt/delivery1 /mnt/delivery2
+    python batch_validation.py --roots-file roots.txt --trust-cache
+
+A roots file lists one directory per line; blank lines and lines starting
+with "#" are ignored. Roots are validated one after another by
+`validate_location`, sharing one log file and, across roots, the imported
+modules, the open validation cache, warm checksum process pools and worker
+manifest indexes, so a scheduler launching many small validations pays the
+start-up cost once. Each root gets its own result store and checkpoint
+journal, and `--resume` applies to every root. Run metrics cover the whole
+batch.
+
+The process exit status is the worst outcome over all roots:
+
+    0   every check passed
+    1   validation failures (attributes, checksums, missing checksum
+        files, sequence)
+    2   no roots given, or a root is not a directory
+    3   a root could not be validated (e.g. inventory or filesystem errors)
+"""
+
+import logging
+import os
+import sys
+from datetime import datetime
+
+import logging_config
+from checkpoint_journal import close_checkpoint_journal
+from manifest_writer import close_manifest_writer
+from result_store import close_result_store
+from validation_policy import close_validation_policy
+from run_metrics import get_run_metrics
+from dpx_validation_service import (
+    EXIT_ERROR,
+    EXIT_FAILED,
+    EXIT_PASSED,
+    EXIT_USAGE,
+    apply_arguments,
+    argument_parser,
+    finish_service,
+    validate_location,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_batch_arguments(argv=None):
+    """Parse the roots and the shared run options.
+
+    Args:
+        argv (list[str], optional): Arguments; defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: Parsed options.
+    """
+    parser = argument_parser(description="Headless DPX validation of many root directories")
+    parser.add_argument("roots", nargs="*", help="Root directories to validate")
+    parser.add_argument(
+        "--roots-file",
+        help="File listing root directories, one per line ('#' starts a comment)",
+    )
+
+    return parser.parse_args(argv)
+
+
+def read_roots(arguments):
+    """Return the roots from the command line and the roots file, in order.
+
+    Args:
+        arguments (argparse.Namespace): Options from `parse_batch_arguments`.
+
+    Returns:
+        list[str]: Root directories; duplicates are dropped.
+    """
+    roots = list(arguments.roots)
+    if arguments.roots_file:
+        with open(arguments.roots_file, "r", encoding="utf-8") as roots_file:
+            for line in roots_file:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    roots.append(line)
+
+    return list(dict.fromkeys(os.path.abspath(root) for root in roots))
+
+
+def validate_root(root):
+    """Validate a single root, containing any failure to that root.
+
+    Args:
+        root (str): Root directory.
+
+    Returns:
+        int: `EXIT_*` status for the root.
+    """
+    if not os.path.isdir(root):
+        logger.error(f"Not a directory: {root}")
+        return EXIT_USAGE
+
+    try:
+        passed = validate_location(root, datetime.now(), logger)
+        return EXIT_PASSED if passed else EXIT_FAILED
+
+    except SystemExit:
+        logger.critical(f"Validation of {root} stopped early")
+        return EXIT_ERROR
+
+    except Exception as e:
+        logger.critical(f"Validation of {root} failed: {e}")
+        return EXIT_ERROR
+
+    finally:
+        close_manifest_writer()
+        close_checkpoint_journal()
+        close_validation_policy()
+        close_result_store()
+
+
+def main(argv=None):
+    """Validate every root given and return the batch exit status.
+
+    Args:
+        argv (list[str], optional): Arguments; defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Worst `EXIT_*` status over all roots.
+    """
+    arguments = parse_batch_arguments(argv)
+    try:
+        roots = read_roots(arguments)
+    except OSError as e:
+        print(f"Unable to read roots file: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    if not roots:
+        print("No root directories given", file=sys.stderr)
+        return EXIT_USAGE
+
+    apply_arguments(arguments)
+    logging_config.setup_logger()
+
+    run_metrics = get_run_metrics()
+    if run_metrics is not None:
+        run_metrics.start_profiling()
+
+    statuses = {}
+    for root in roots:
+        statuses[root] = validate_root(root)
+        logger.info(f"Root {root}: exit status {statuses[root]}")
+
+    finish_service(logger)
+    status = max(statuses.values())
+    logger.info(
+        f"Batch complete: {len(roots)} roots, "
+        f"{sum(1 for value in statuses.values() if value == EXIT_PASSED)} passed, exit status {status}"
+    )
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Benchmark: digest throughput per algorithm.
+
+Hashes the same data with every available algorithm (`SUPPORTED_ALGORITHMS`:
+hashlib's md5, sha1, sha256, sha512, blake2b, blake2s, plus xxh3 / xxh128
+and blake3 when `xxhash` / `blake3` are installed) and reports MB/s for each,
+single-threaded and with `--workers` threads, to choose a fixity algorithm
+that keeps up with the storage. Run from the repository root:
+
+    python -m benchmarks.hash_benchmark
+    python -m benchmarks.hash_benchmark --location /mnt/nas/reel --pattern "*.dpx"
+
+Without a location the data is an in-memory buffer, measuring the CPU cost
+alone; with one, files are streamed through `FileReadEngine` exactly as
+during validation (reads included, page cache dropped before each pass
+unless --warm). The `--combined` pass times `MultiDigest` computing all of
+the selected algorithms from one read.
+"""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.read_engine_benchmark import drop_cache
+from validators.multi_digest import KNOWN_ALGORITHMS, SUPPORTED_ALGORITHMS, MultiDigest
+from validators.read_engine import FileReadEngine
+
+
+def hash_buffer(algorithms, buffer, repeat, chunk_size):
+    """Digest `buffer` `repeat` times in `chunk_size` slices.
+
+    Returns:
+        int: Bytes hashed.
+    """
+    view = memoryview(buffer)
+    for _ in range(repeat):
+        digest = MultiDigest(algorithms)
+        for offset in range(0, len(view), chunk_size):
+            digest.update(view[offset:offset + chunk_size])
+        digest.hexdigests()
+
+    return len(buffer) * repeat
+
+
+def hash_file(algorithms, file):
+    """Stream one file through `FileReadEngine` into the digests.
+
+    Returns:
+        int: Bytes hashed.
+    """
+    total = 0
+    digest = MultiDigest(algorithms)
+    for buffer in FileReadEngine(file).read_buffers():
+        digest.update(buffer)
+        total += len(buffer)
+    digest.hexdigests()
+
+    return total
+
+
+def run_pass(algorithms, workers, files, buffer, repeat, chunk_size):
+    """Time one pass over the data with `workers` threads.
+
+    Returns:
+        tuple(int, float): Bytes hashed and elapsed seconds.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if files:
+            total = sum(executor.map(lambda file: hash_file(algorithms, file), files))
+        else:
+            total = sum(executor.map(lambda _: hash_buffer(algorithms, buffer, repeat, chunk_size), range(workers)))
+
+    return total, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--location", help="Directory of files to hash (default: in-memory buffer)")
+    parser.add_argument("--pattern", default="*.dpx", help="Glob pattern (default *.dpx)")
+    parser.add_argument("--limit", type=int, default=200, help="Maximum files to hash")
+    parser.add_argument("--size-mb", type=int, default=256, help="In-memory buffer size per worker in MB")
+    parser.add_argument("--repeat", type=int, default=2, help="In-memory passes per worker")
+    parser.add_argument("--chunk-size", type=int, default=4 * 1024 * 1024, help="Bytes per update")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Threads for the parallel pass")
+    parser.add_argument("--algorithms", nargs="+", default=list(SUPPORTED_ALGORITHMS), choices=SUPPORTED_ALGORITHMS)
+    parser.add_argument("--combined", action="store_true", help="Also time all algorithms from one read")
+    parser.add_argument("--warm", action="store_true", help="Do not drop the page cache between passes")
+    args = parser.parse_args()
+
+    files, buffer = None, None
+    if args.location:
+        files = sorted(glob.glob(os.path.join(args.location, args.pattern)))[:args.limit]
+        if not files:
+            parser.error(f"No files matching {args.pattern} in {args.location}")
+    else:
+        buffer = os.urandom(args.size_mb * 1024 * 1024)
+
+    missing = [algorithm for algorithm in KNOWN_ALGORITHMS if algorithm not in SUPPORTED_ALGORITHMS]
+    if missing:
+        print(f"Not installed: {', '.join(missing)} (pip install xxhash blake3)")
+
+    passes = [[algorithm] for algorithm in args.algorithms]
+    if args.combined:
+        passes.append(args.algorithms)
+
+    results = []
+    for algorithms in passes:
+        rates = []
+        for workers in sorted({1, args.workers}):
+            if files and not args.warm:
+                drop_cache(files)
+            total, elapsed = run_pass(algorithms, workers, files, buffer, args.repeat, args.chunk_size)
+            rates.append(total / elapsed / 1e6 if elapsed else float("inf"))
+        label = "+".join(algorithms)
+        results.append((rates[0], label))
+        print(f"{label:<40} {rates[0]:>9.1f} MB/s  {rates[-1]:>9.1f} MB/s ({args.workers} threads)")
+
+    rate, label = max(results)
+    print(f"Fastest single-threaded: {label} ({rate:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
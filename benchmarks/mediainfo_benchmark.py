@@ -0,0 +1,84 @@
+"""Benchmark: per-file MediaInfo vs batched MediaInfo vs native readers.
+
+Times the original one‑process‑per‑file MediaInfo path against
+`MediaInfoBatchReader` and the in‑process readers (`DPXHeaderReader`,
+`WAVChunkReader`) over the same set of files and prints files/second for
+each. Run from the repository root:
+
+    python -m benchmarks.mediainfo_benchmark /path/to/reel --pattern "*.wav"
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import time
+
+from data.file_attributes_model import switches
+from validators.dpx_header_reader import DPXHeaderReader
+from validators.mediainfo_batch import MediaInfoBatchReader
+from validators.wav_chunk_reader import WAVChunkReader
+
+
+def per_file_run(files):
+    """Run MediaInfo once per file, as `FileValidator.read_attributes` does."""
+    for file in files:
+        subprocess.check_output(["mediainfo", switches, file])
+
+
+def batched_run(files, batch_size, workers):
+    """Run MediaInfo in batches on a worker pool."""
+    batch_reader = MediaInfoBatchReader(files, batch_size=batch_size, workers=workers)
+    batch_reader.read_attributes()
+
+
+def native_run(files):
+    """Read every file in‑process, as the native backends do."""
+    for file in files:
+        if file.lower().endswith(".wav"):
+            WAVChunkReader(file).read_chunks()
+        else:
+            header_reader = DPXHeaderReader(file)
+            header_reader.read_header()
+            header_reader.parse_header()
+
+
+def time_run(label, func, files, *args):
+    """Time a single run and print files/second.
+
+    Returns:
+        float: Files per second.
+    """
+    start = time.perf_counter()
+    func(files, *args)
+    elapsed = time.perf_counter() - start
+    rate = len(files) / elapsed if elapsed else float("inf")
+    print(f"{label:<28} {len(files):>8} files  {elapsed:>9.2f} s  {rate:>10.1f} files/s")
+
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("location", help="Directory containing media files")
+    parser.add_argument("--pattern", default="*.dpx", help="Glob pattern (default *.dpx)")
+    parser.add_argument("--limit", type=int, default=1000, help="Maximum files to read")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.location, args.pattern)))[:args.limit]
+    if not files:
+        parser.error(f"No files matching {args.pattern} in {args.location}")
+
+    per_file_rate = time_run("mediainfo per file", per_file_run, files)
+    batched_rate = time_run(
+        f"mediainfo batched ({args.batch_size}x{args.workers})",
+        batched_run, files, args.batch_size, args.workers,
+    )
+    native_rate = time_run("native in-process", native_run, files)
+    print(f"Speed-up: batched {batched_rate / per_file_rate:.1f}x, native {native_rate / per_file_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Synthetic delivery tree generator for benchmarks.
+
+Builds a tree shaped like a real delivery, of any size:
+
+    <location>/film/<shelfmark>/<shelfmark><frame>.dpx   10-bit 2048x1556 DPX
+    <location>/film/<shelfmark>/<shelfmark>.md5          md5sum manifest
+    <location>/mag/<shelfmark>.wav                       24-bit / 48 kHz WAV
+    <location>/mag/<shelfmark>.wav.md5                   md5 sidecar
+    <location>/inventory.json                            matching inventory
+
+Every frame and WAV passes attribute validation and every checksum matches,
+so a benchmark run over the tree exercises the full success path. Image and
+audio payloads are a repeated random block (hashing cost does not depend on
+content); with `sparse` the payload is left as a hole instead, which is much
+faster to build but reads back from the page cache rather than disk. Run
+from the repository root:
+
+    python -m benchmarks.synthetic_tree /tmp/synthetic --reels 2 --frames 500
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+
+from validators.dpx_header_reader import (
+    HEADER_SIZE,
+    MAGIC_BIG,
+    OFFSET_ELEMENT_BIT_SIZE,
+    OFFSET_ELEMENT_DATA_OFFSET,
+    OFFSET_ELEMENT_DESCRIPTOR,
+    OFFSET_ELEMENT_PACKING,
+    OFFSET_FILE_SIZE,
+    OFFSET_IMAGE_DATA,
+    OFFSET_PIXEL_ASPECT_RATIO,
+    OFFSET_PIXELS_PER_LINE,
+    OFFSET_VERSION,
+)
+
+WIDTH = 2048
+HEIGHT = 1556
+# 10-bit RGB, filled method A: one 32-bit word per pixel
+IMAGE_DATA_OFFSET = 8192
+IMAGE_DATA_SIZE = WIDTH * HEIGHT * 4
+FRAME_SIZE = IMAGE_DATA_OFFSET + IMAGE_DATA_SIZE
+
+SAMPLE_RATE = 48000
+BIT_DEPTH = 24
+CHANNELS = 2
+
+FIRST_FRAME = 86400
+BLOCK_SIZE = 1024 * 1024
+
+
+def dpx_header(name, frame):
+    """Return a big-endian DPX header for a 10-bit 2048x1556 RGB frame."""
+    header = bytearray(HEADER_SIZE)
+    header[0:4] = MAGIC_BIG
+    struct.pack_into(">I", header, OFFSET_IMAGE_DATA, IMAGE_DATA_OFFSET)
+    header[OFFSET_VERSION:OFFSET_VERSION + 4] = b"V2.0"
+    struct.pack_into(">I", header, OFFSET_FILE_SIZE, FRAME_SIZE)
+    header[36:36 + len(name)] = name.encode("ascii")[:100]
+    struct.pack_into(">HH", header, 768, 0, 1)
+    struct.pack_into(">II", header, OFFSET_PIXELS_PER_LINE, WIDTH, HEIGHT)
+    header[OFFSET_ELEMENT_DESCRIPTOR] = 50
+    header[OFFSET_ELEMENT_DESCRIPTOR + 1] = 2
+    header[OFFSET_ELEMENT_DESCRIPTOR + 2] = 2
+    header[OFFSET_ELEMENT_BIT_SIZE] = 10
+    struct.pack_into(">HH", header, OFFSET_ELEMENT_PACKING, 1, 0)
+    struct.pack_into(">I", header, OFFSET_ELEMENT_DATA_OFFSET, IMAGE_DATA_OFFSET)
+    struct.pack_into(">II", header, OFFSET_PIXEL_ASPECT_RATIO, 1, 1)
+    struct.pack_into(">I", header, 1712, frame)
+
+    return bytes(header)
+
+
+def wav_header(data_size):
+    """Return a RIFF/WAVE header for 24-bit / 48 kHz PCM of `data_size` bytes."""
+    block_align = CHANNELS * BIT_DEPTH // 8
+    fmt = struct.pack(
+        "<HHIIHH", 1, CHANNELS, SAMPLE_RATE, SAMPLE_RATE * block_align, block_align, BIT_DEPTH
+    )
+    return (
+        b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + data_size) + b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+class SyntheticTree:
+    """Write a synthetic delivery tree with manifests, sidecars and inventory.
+
+    Args:
+        location (str): Root directory to create.
+        reels (int): Number of DPX sequences.
+        frames (int): Frames per sequence.
+        mags (int): Number of WAV files.
+        mag_seconds (int): Duration of each WAV.
+        sparse (bool): Leave payloads as holes instead of writing data.
+
+    Attributes:
+        inventory_file (str): Path of the generated inventory JSON.
+        film_files (list[str]): Every DPX frame written.
+        mag_files (list[str]): Every WAV written.
+        total_bytes (int): Bytes of media written.
+    """
+    def __init__(self, location, reels=2, frames=100, mags=2, mag_seconds=60, sparse=False):
+
+        self.location = location
+        self.reels = reels
+        self.frames = frames
+        self.mags = mags
+        self.mag_seconds = mag_seconds
+        self.sparse = sparse
+        self.inventory_file = os.path.join(location, "inventory.json")
+        self.film_files = []
+        self.mag_files = []
+        self.total_bytes = 0
+        self.inventory = []
+        self.block = os.urandom(BLOCK_SIZE)
+
+    def write_payload(self, f, digest, size):
+        """Write `size` bytes of payload, updating `digest`."""
+        if self.sparse:
+            position = f.tell()
+            f.truncate(position + size)
+            f.seek(position + size)
+            zero_block = bytes(BLOCK_SIZE)
+            while size:
+                chunk = min(size, BLOCK_SIZE)
+                digest.update(zero_block[:chunk])
+                size -= chunk
+            return
+
+        while size:
+            chunk = self.block[:min(size, BLOCK_SIZE)]
+            f.write(chunk)
+            digest.update(chunk)
+            size -= len(chunk)
+
+    def write_file(self, path, header, payload_size):
+        """Write header + payload and return the file's md5 hex digest."""
+        digest = hashlib.md5(header)
+        with open(path, "wb") as f:
+            f.write(header)
+            self.write_payload(f, digest, payload_size)
+        self.total_bytes += len(header) + payload_size
+
+        return digest.hexdigest()
+
+    def write_reel(self, number):
+        """Write one DPX sequence and its manifest."""
+        shelfmark = f"BL_REEL{number:04d}_S1_F1_V1_"
+        directory = os.path.join(self.location, "film", shelfmark.rstrip("_"))
+        os.makedirs(directory, exist_ok=True)
+
+        manifest_lines = []
+        for frame in range(FIRST_FRAME, FIRST_FRAME + self.frames):
+            name = f"{shelfmark}{frame:08d}.dpx"
+            path = os.path.join(directory, name)
+            header = dpx_header(name, frame) + bytes(IMAGE_DATA_OFFSET - HEADER_SIZE)
+            manifest_lines.append(f"{self.write_file(path, header, IMAGE_DATA_SIZE)}  {name}\n")
+            self.film_files.append(path)
+
+        with open(os.path.join(directory, f"{shelfmark.rstrip('_')}.md5"), "w") as manifest:
+            manifest.writelines(manifest_lines)
+
+        self.inventory.append(
+            {"shelfmark": shelfmark, "found": False, "film": False, "directory": "", "size": 0, "count": 0}
+        )
+
+    def write_mag(self, number):
+        """Write one WAV and its checksum sidecar."""
+        shelfmark = f"BL_MAG{number:04d}_S1_F1_V1"
+        directory = os.path.join(self.location, "mag")
+        os.makedirs(directory, exist_ok=True)
+
+        name = f"{shelfmark}.wav"
+        path = os.path.join(directory, name)
+        data_size = self.mag_seconds * SAMPLE_RATE * CHANNELS * BIT_DEPTH // 8
+        digest = self.write_file(path, wav_header(data_size), data_size)
+        with open(f"{path}.md5", "w") as sidecar:
+            sidecar.write(f"{digest} *{name}\n")
+        self.mag_files.append(path)
+
+        self.inventory.append(
+            {"shelfmark": shelfmark, "found": False, "mag": False, "directory": "", "size": 0, "count": 0}
+        )
+
+    def build(self):
+        """Write every reel, mag and the inventory JSON."""
+        os.makedirs(self.location, exist_ok=True)
+        for number in range(1, self.reels + 1):
+            self.write_reel(number)
+        for number in range(1, self.mags + 1):
+            self.write_mag(number)
+
+        with open(self.inventory_file, "w") as inventory:
+            json.dump({"inventory": self.inventory}, inventory, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("location", help="Directory to create")
+    parser.add_argument("--reels", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=100, help="Frames per reel")
+    parser.add_argument("--mags", type=int, default=2)
+    parser.add_argument("--mag-seconds", type=int, default=60)
+    parser.add_argument("--sparse", action="store_true", help="Write payloads as sparse holes")
+    args = parser.parse_args()
+
+    tree = SyntheticTree(args.location, args.reels, args.frames, args.mags, args.mag_seconds, args.sparse)
+    tree.build()
+    print(
+        f"{len(tree.film_files)} frames, {len(tree.mag_files)} mag files, "
+        f"{tree.total_bytes / 1e9:.2f} GB; inventory {tree.inventory_file}"
+    )
+
+
+if __name__ == "__main__":
+    main()
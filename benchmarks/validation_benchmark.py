@@ -0,0 +1,288 @@
+"""Benchmark: per-stage and end-to-end validation throughput.
+
+Builds a synthetic delivery tree (`SyntheticTree`), then times each stage of
+the service on it and the full `dpx_validation_service.main` run:
+
+    discovery   FileDiscovery walk of the tree
+    inventory   InventoryGenerator load, aggregate and write
+    attributes  FileValidator on every frame and WAV
+    sequence    ChecksumManifest parse + SequenceValidator per reel
+    checksums   ChecksumEngine over every frame and WAV
+    end_to_end  dpx_validation_service.main in a child process
+
+Files/s and MB/s are printed per stage and the results saved as JSON (with
+host, Python and the relevant configuration), so runs on the same machine can
+be compared with --compare. The stub `benchmarks/bin/mediainfo` is put first
+on PATH so no MediaInfo install is needed, and the validation cache is
+disabled so every run does the full work. Run from the repository root:
+
+    python -m benchmarks.validation_benchmark --reels 2 --frames 200
+    python -m benchmarks.validation_benchmark --compare benchmarks/results/<previous>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import config
+from benchmarks.read_engine_benchmark import drop_cache
+from benchmarks.synthetic_tree import SyntheticTree
+from file_discovery import FileDiscovery
+from inventory_generator import InventoryGenerator
+from validators.checksum_engine import ChecksumEngine
+from validators.checksum_manifest import ChecksumManifest
+from validators.dpx_sequence_validator import SequenceValidator
+from validators.file_attributes_validator import FileValidator
+
+repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+stub_directory = os.path.join(repository_root, "benchmarks", "bin")
+
+end_to_end_script = """
+import sys
+import config
+config.CONFIG["cache"]["ENABLED"] = False
+import dpx_validation_service as service
+location = sys.argv[1]
+service.set_source_location = lambda: location
+sys.argv = sys.argv[:1]
+service.main()
+"""
+
+
+class ValidationBenchmark:
+    """Time each validation stage over a synthetic tree.
+
+    Args:
+        tree (SyntheticTree): Built tree to validate.
+        cold (bool): Drop the tree from the page cache before each stage.
+    """
+    def __init__(self, tree, cold=False):
+
+        self.tree = tree
+        self.cold = cold
+        self.media_files = tree.film_files + tree.mag_files
+        self.stages = {}
+        self.plans = []
+
+    def time_stage(self, name, func, files, total_bytes=0):
+        """Run one stage and record its wall time and throughput.
+
+        Args:
+            name (str): Stage name.
+            func (callable): Stage body; returns the number of failures.
+            files (int): Files processed by the stage.
+            total_bytes (int): Bytes read by the stage (0 for metadata only).
+        """
+        if self.cold:
+            drop_cache(self.media_files)
+
+        start = time.perf_counter()
+        failures = func()
+        elapsed = time.perf_counter() - start
+
+        self.stages[name] = {
+            "seconds": round(elapsed, 4),
+            "files": files,
+            "bytes": total_bytes,
+            "files_per_second": round(files / elapsed, 2) if elapsed else None,
+            "mb_per_second": round(total_bytes / elapsed / 1e6, 2) if elapsed and total_bytes else None,
+            "failures": failures,
+        }
+        if failures:
+            print(f"Warning: {name} reported {failures} failure(s)")
+        rate = f"{self.stages[name]['mb_per_second']:>9.1f} MB/s" if total_bytes else ""
+        print(f"{name:<12} {files:>8} files  {elapsed:>9.2f} s  {files / elapsed if elapsed else 0:>10.1f} files/s  {rate}")
+
+    def discovery_stage(self):
+        """Walk the tree, keeping the work plan for later stages."""
+        file_discovery = FileDiscovery(self.tree.location)
+        file_discovery.discover()
+        self.plans = list(file_discovery.directory_plans())
+        return 0
+
+    def inventory_stage(self):
+        """Load, aggregate and write the inventory."""
+        inventory_generator = InventoryGenerator(self.tree.location)
+        inventory_generator.read_json_inventory()
+        inventory_generator.index_inventory()
+        for plan in self.plans:
+            inventory_generator.aggregate_files(plan.media_files_with_sizes())
+        inventory_generator.apply_shelfmark_totals()
+        inventory_generator.write_inventory_data()
+        return 0
+
+    def attributes_stage(self):
+        """Validate attributes of every file; returns failures."""
+        failures = 0
+        for file in self.media_files:
+            file_validator = FileValidator(file)
+            file_validator.read_attributes()
+            file_validator.format_attributes_validation()
+            failures += not file_validator.format_verified
+        return failures
+
+    def sequence_stage(self):
+        """Parse each manifest and check frame continuity; returns missing frames."""
+        failures = 0
+        for plan in self.plans:
+            if not plan.film_files:
+                continue
+            manifest_index = ChecksumManifest(plan.manifests[0])
+            manifest_index.parse_manifest()
+            sequence_validator = SequenceValidator(
+                plan.film_files, plan.manifests[0], plan.dirpath, manifest_index
+            )
+            sequence_validator.count_manifest_lines()
+            sequence_validator.count_file_sequence()
+            failures += sequence_validator.missing_count
+        return failures
+
+    def checksums_stage(self):
+        """Hash every file against its manifest / sidecar; returns failures."""
+        failures = 0
+        for plan in self.plans:
+            if plan.film_files:
+                manifest_index = ChecksumManifest(plan.manifests[0])
+                manifest_index.parse_manifest()
+                jobs = [(file, plan.manifests[0]) for file in plan.film_files]
+                results = ChecksumEngine().run(jobs, manifest_index)
+            else:
+                jobs = [(file, plan.sidecars[file]) for file in plan.mag_files]
+                results = ChecksumEngine().run(jobs)
+            failures += sum(1 for _, hash_verified, _ in results if not hash_verified)
+        return failures
+
+    def end_to_end_stage(self):
+        """Run the whole service in a child process; returns its exit code."""
+        work_directory = tempfile.mkdtemp(prefix="dpx_benchmark_run_")
+        environment = dict(
+            os.environ,
+            JSON_FILE=self.tree.inventory_file,
+            PYTHONPATH=repository_root,
+        )
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-c", end_to_end_script, self.tree.location],
+                cwd=work_directory,
+                env=environment,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        finally:
+            shutil.rmtree(work_directory, ignore_errors=True)
+        return completed.returncode
+
+    def run(self, stages):
+        """Run the requested stages in order."""
+        file_count = len(self.media_files)
+        total_bytes = self.tree.total_bytes
+        frame_count = len(self.tree.film_files)
+        stage_plan = {
+            "discovery": (self.discovery_stage, file_count, 0),
+            "inventory": (self.inventory_stage, file_count, 0),
+            "attributes": (self.attributes_stage, file_count, 0),
+            "sequence": (self.sequence_stage, frame_count, 0),
+            "checksums": (self.checksums_stage, file_count, total_bytes),
+            "end_to_end": (self.end_to_end_stage, file_count, total_bytes),
+        }
+        if not self.plans and set(stages) - {"discovery", "end_to_end"}:
+            self.discovery_stage()
+
+        for name in stages:
+            func, files, stage_bytes = stage_plan[name]
+            self.time_stage(name, func, files, stage_bytes)
+
+
+def compare_results(previous_file, stages):
+    """Print each stage's throughput relative to a previous results file."""
+    with open(previous_file) as f:
+        previous = json.load(f)["stages"]
+
+    print(f"Compared with {previous_file}:")
+    for name, result in stages.items():
+        before = previous.get(name, {}).get("files_per_second")
+        after = result["files_per_second"]
+        if before and after:
+            print(f"{name:<12} {before:>10.1f} -> {after:>10.1f} files/s  ({after / before:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--location", help="Tree directory (default: a temporary directory)")
+    parser.add_argument("--reels", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=100, help="Frames per reel")
+    parser.add_argument("--mags", type=int, default=2)
+    parser.add_argument("--mag-seconds", type=int, default=60)
+    parser.add_argument("--sparse", action="store_true", help="Write payloads as sparse holes")
+    parser.add_argument("--cold", action="store_true", help="Drop the page cache before each stage")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated tree")
+    parser.add_argument(
+        "--stages", nargs="+",
+        default=["discovery", "inventory", "attributes", "sequence", "checksums", "end_to_end"],
+        choices=["discovery", "inventory", "attributes", "sequence", "checksums", "end_to_end"],
+    )
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<host>_<time>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    os.environ["PATH"] = stub_directory + os.pathsep + os.environ.get("PATH", "")
+    config.CONFIG["cache"]["ENABLED"] = False
+
+    location = args.location or tempfile.mkdtemp(prefix="dpx_benchmark_")
+    tree = SyntheticTree(location, args.reels, args.frames, args.mags, args.mag_seconds, args.sparse)
+    start = time.perf_counter()
+    tree.build()
+    print(f"Built {len(tree.film_files)} frames + {len(tree.mag_files)} mag files "
+          f"({tree.total_bytes / 1e9:.2f} GB) in {time.perf_counter() - start:.1f} s at {location}")
+    os.environ["JSON_FILE"] = tree.inventory_file
+
+    try:
+        benchmark = ValidationBenchmark(tree, cold=args.cold)
+        benchmark.run(args.stages)
+    finally:
+        if not args.keep:
+            shutil.rmtree(location, ignore_errors=True)
+
+    created = datetime.now()
+    results = {
+        "created": created.isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "tree": {
+            "reels": args.reels,
+            "frames_per_reel": args.frames,
+            "mags": args.mags,
+            "mag_seconds": args.mag_seconds,
+            "sparse": args.sparse,
+            "cold": args.cold,
+            "bytes": tree.total_bytes,
+        },
+        "config": {section: config.CONFIG[section] for section in ("attributes", "checksums", "pipeline", "scheduler")},
+        "stages": benchmark.stages,
+    }
+
+    output = args.output or os.path.join(
+        repository_root, "benchmarks", "results",
+        f"{platform.node()}_{created.strftime('%Y-%m-%d_%H-%M-%S')}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare_results(args.compare, benchmark.stages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Crash-safe checkpoint journal for resumable validation runs.
+
+This module defines `CheckpointJournal`, an append-only JSON lines file
+recording the progress of a run over one root directory:
+
+    {"run": "/mnt/delivery"}                                  run header
+    {"stage": "inventory"}                                    inventory written
+    {"file": ".../BL_R_00086400.dpx", "kind": "checksum", "verified": true}
+    {"directory": "/mnt/delivery/reel1"}                      directory complete
+
+Every attribute, checksum and header outlier verdict is appended as it is
+recorded, and a directory record once all of its files are done. Records are
+flushed and fsync'd in batches (`SYNC_RECORDS` records or `SYNC_SECONDS`
+seconds, whichever comes first) and at every directory or stage record, so a
+crash loses at most the last batch, which is simply validated again.
+
+With `--resume` the journal of the previous run over the same root is
+replayed: the inventory is not applied twice, completed directories are not
+revisited, and within unfinished directories only files lacking a verdict
+are validated. The journaled verdicts are fed back into the `ResultStore`, so
+the summary and report match those of an uninterrupted run. When manifests
+are being generated (`--write-manifests`) checksum records also carry the
+file's digests, so the manifests of unfinished directories are completed
+without re-reading the files already verified. A torn last line
+(a crash mid-write) is discarded before appending. The journal is removed
+once a run finishes; it is kept when the run stops early.
+
+Journals live in `./checkpoints` (or `CONFIG["checkpoint"]["DIRECTORY"]`),
+named after a hash of the root path. The journal is opened once per run by
+`open_checkpoint_journal`; `get_checkpoint_journal` returns None when
+checkpointing is disabled or no journal is open.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import config
+
+logger = logging.getLogger(__name__)
+
+checkpoint_journal = None
+
+
+def get_checkpoint_journal():
+    """Return the open `CheckpointJournal`, or None."""
+    return checkpoint_journal
+
+
+def open_checkpoint_journal(location, resume=False):
+    """Open the journal for a run over `location`.
+
+    Args:
+        location (str): Root directory being validated.
+        resume (bool): Replay an existing journal instead of starting afresh.
+
+    Returns:
+        CheckpointJournal | None: The open journal, or None when disabled.
+    """
+    global checkpoint_journal
+
+    if not config.CONFIG["checkpoint"]["ENABLED"]:
+        return None
+
+    checkpoint_journal = CheckpointJournal(location)
+    if resume:
+        checkpoint_journal.replay_journal()
+    checkpoint_journal.open_journal()
+
+    return checkpoint_journal
+
+
+def close_checkpoint_journal(completed=False):
+    """Sync and close the open journal, removing it when the run completed.
+
+    Args:
+        completed (bool): The run finished; the journal is no longer needed.
+    """
+    global checkpoint_journal
+
+    if checkpoint_journal is not None:
+        checkpoint_journal.close_journal()
+        if completed:
+            checkpoint_journal.remove_journal()
+    checkpoint_journal = None
+
+
+class CheckpointJournal:
+    """Append-only record of completed work, replayable after a crash.
+
+    Args:
+        location (str): Root directory being validated.
+        journal_file (str, optional): Journal path. Defaults to
+            `<DIRECTORY>/<hash of location>_dpx_journal.jsonl`.
+
+    Attributes:
+        resumed (bool): An earlier journal for `location` was replayed.
+        inventory_complete (bool): The inventory pass was recorded as written.
+        completed_directories (set[str]): Directories recorded as complete.
+        directory_verdicts (dict[str, dict[str, dict[str, bool]]]): For
+            directories not yet complete: file -> verdict kind -> verdict.
+        directory_digests (dict[str, dict[str, dict[str, str]]]): For
+            directories not yet complete: file -> algorithm -> digest.
+        partial_verdicts (set[tuple[str, str]]): (file, kind) verdicts
+            already journaled for files being validated again; not appended
+            a second time.
+    """
+    def __init__(self, location, journal_file=None):
+
+        checkpoint_config = config.CONFIG["checkpoint"]
+        self.location = os.path.abspath(location)
+        directory = checkpoint_config["DIRECTORY"] or os.path.join(os.getcwd(), "checkpoints")
+        location_hash = hashlib.sha1(self.location.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        self.journal_file = journal_file or os.path.join(directory, f"{location_hash}_dpx_journal.jsonl")
+        self.sync_records = checkpoint_config["SYNC_RECORDS"]
+        self.sync_seconds = checkpoint_config["SYNC_SECONDS"]
+        self.journal = None
+        self.lock = threading.Lock()
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.valid_length = 0
+        self.resumed = False
+        self.inventory_complete = False
+        self.completed_directories = set()
+        self.directory_verdicts = {}
+        self.directory_digests = {}
+        self.partial_verdicts = set()
+
+    def read_records(self):
+        """Yield (record, end offset) for each intact journal line.
+
+        Stops at the first line that is unterminated or not valid JSON,
+        which can only be the last line written before a crash.
+        """
+        with open(self.journal_file, "rb") as journal:
+            offset = 0
+            for line in journal:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                offset += len(line)
+                yield record, offset
+
+    def replay_journal(self):
+        """Load completed stages, directories and per-file verdicts.
+
+        Per-file verdicts are only held for directories that are not yet
+        complete, so memory follows the directories in flight at the crash
+        rather than the size of the run.
+        """
+        if not os.path.exists(self.journal_file):
+            logger.info(f"No checkpoint journal for {self.location}; starting from the beginning")
+            return
+
+        try:
+            records = self.read_records()
+            header, self.valid_length = next(records, ({}, 0))
+            if header.get("run") != self.location:
+                logger.warning(f"Checkpoint journal {self.journal_file} is not a run over {self.location}; ignored")
+                return
+
+            for record, offset in records:
+                if "file" in record:
+                    directory = os.path.dirname(record["file"])
+                    if directory not in self.completed_directories:
+                        verdicts = self.directory_verdicts.setdefault(directory, {})
+                        verdicts.setdefault(record["file"], {})[record["kind"]] = record["verified"]
+                        if "digests" in record:
+                            self.directory_digests.setdefault(directory, {})[record["file"]] = record["digests"]
+                elif "directory" in record:
+                    self.completed_directories.add(record["directory"])
+                    self.directory_verdicts.pop(record["directory"], None)
+                    self.directory_digests.pop(record["directory"], None)
+                elif record.get("stage") == "inventory":
+                    self.inventory_complete = True
+                self.valid_length = offset
+
+        except (OSError, KeyError, TypeError) as e:
+            logger.error(f"Unable to replay checkpoint journal {self.journal_file}: {e}")
+            self.inventory_complete = False
+            self.completed_directories = set()
+            self.directory_verdicts = {}
+            self.directory_digests = {}
+            return
+
+        self.resumed = True
+        logger.info(
+            f"Resuming from {self.journal_file}: {len(self.completed_directories)} directories complete, "
+            f"{sum(len(verdicts) for verdicts in self.directory_verdicts.values())} files with verdicts "
+            f"in unfinished directories"
+        )
+
+    def replay_verdicts(self):
+        """Yield (kind, file, verified) for every journaled verdict, in order."""
+        for record, offset in self.read_records():
+            if offset > self.valid_length:
+                break
+            if "file" in record:
+                yield record["kind"], record["file"], record["verified"]
+
+    def open_journal(self):
+        """Open the journal for appending.
+
+        A replayed journal is cut back to its last intact record; otherwise
+        any earlier journal for the location is replaced.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_file)), exist_ok=True)
+        if self.resumed:
+            os.truncate(self.journal_file, self.valid_length)
+            self.journal = open(self.journal_file, "a", encoding="utf-8", errors="surrogateescape")
+        else:
+            self.journal = open(self.journal_file, "w", encoding="utf-8", errors="surrogateescape")
+            self.append({"run": self.location}, sync=True)
+
+    def close_journal(self):
+        """Sync outstanding records and close the journal."""
+        with self.lock:
+            if self.journal is not None:
+                self.sync()
+                self.journal.close()
+                self.journal = None
+
+    def remove_journal(self):
+        """Delete the journal file once the run no longer needs it."""
+        try:
+            os.remove(self.journal_file)
+        except FileNotFoundError:
+            pass
+
+    def append(self, record, sync=False):
+        """Append one record, syncing when the batch is full or `sync` is set."""
+        with self.lock:
+            self.journal.write(json.dumps(record) + "\n")
+            self.unsynced += 1
+            if (
+                sync
+                or self.unsynced >= self.sync_records
+                or time.monotonic() - self.last_sync >= self.sync_seconds
+            ):
+                self.sync()
+
+    def sync(self):
+        """Flush and fsync the journal (lock held)."""
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def record_verdict(self, kind, file, verified, digests=None):
+        """Journal an "attributes", "checksum", "header_outlier" or "structure" verdict.
+
+        Args:
+            kind (str): Verdict kind.
+            file (str): File the verdict applies to.
+            verified (bool): Verdict.
+            digests (dict[str, str], optional): Algorithm -> digest, kept
+                for manifest generation.
+        """
+        if (file, kind) in self.partial_verdicts:
+            return
+        record = {"file": file, "kind": kind, "verified": verified}
+        if digests:
+            record["digests"] = digests
+        self.append(record)
+
+    def record_directory(self, dirpath):
+        """Journal a directory whose files all have their verdicts."""
+        self.append({"directory": os.path.normpath(dirpath)}, sync=True)
+
+    def directory_complete(self, dirpath):
+        """Return True when `dirpath` was recorded as complete."""
+        return os.path.normpath(dirpath) in self.completed_directories
+
+    def file_verdicts(self, dirpath):
+        """Return file -> verdict kind -> verdict for an unfinished directory."""
+        return self.directory_verdicts.get(os.path.normpath(dirpath), {})
+
+    def file_digests(self, dirpath):
+        """Return file -> algorithm -> digest for an unfinished directory."""
+        return self.directory_digests.get(os.path.normpath(dirpath), {})
+
+    def record_inventory(self):
+        """Journal that the inventory pass has been written."""
+        self.append({"stage": "inventory"}, sync=True)
@@ -7,5 +7,125 @@ CONFIG = {
         "FILM": "*.dpx",
         "CHECKSUM": "*.md5",
         "HASH_FORMAT": "md5"
+    },
+    "attributes": {
+        # "native" reads DPX headers in-process, "mediainfo" runs MediaInfo per frame
+        "DPX_BACKEND": "native",
+        # "native" walks WAV chunks in-process, "mediainfo" runs MediaInfo per file
+        "WAV_BACKEND": "native",
+        # Also run MediaInfo on each DPX frame and compare against native values
+        "MEDIAINFO_CROSS_CHECK": False,
+        # Validate DPX attributes once per masked-header fingerprint group
+        "HEADER_FINGERPRINT_GROUPING": False,
+        # Check DPX header offsets and sizes against the files before hashing
+        "STRUCTURE_CHECK": True,
+        # Concurrent header reads for the structure check
+        "STRUCTURE_WORKERS": 16,
+        # Files per MediaInfo invocation (1 = one process per file)
+        "MEDIAINFO_BATCH_SIZE": 200,
+        # Concurrent MediaInfo processes when batching
+        "MEDIAINFO_WORKERS": 4
+    },
+    "checksums": {
+        # Concurrent hashing workers
+        "WORKERS": 4,
+        # "thread" or "process"
+        "EXECUTOR": "thread",
+        # Validate DPX attributes and checksums from a single read per frame
+        "FUSED_READ": True,
+        # "buffered", "readinto", "mmap" or "direct" (O_DIRECT)
+        "READ_MODE": "readinto",
+        # Bytes per read buffer
+        "BUFFER_SIZE": 4 * 1024 * 1024,
+        # posix_fadvise SEQUENTIAL / DONTNEED hints where supported
+        "FADVISE": True,
+        # Digests computed in the same read as the manifest's own (md5, sha1,
+        # sha256, sha512, blake2b, blake2s; xxh3, xxh128, blake3 when
+        # installed); also the preferred checksum files, in order
+        "ALGORITHMS": ["md5"],
+        # Write md5sum-format manifests / sidecars for these algorithms (--write-manifests)
+        "WRITE_MANIFESTS": []
+    },
+    "fast_fail": {
+        # Reject a DPX sequence once its failures cross a threshold and skip
+        # the frames not yet read; off validates every frame (--fast-fail)
+        "ENABLED": False,
+        # Failed or missing frames rejecting a sequence (0 = no limit)
+        "MAX_FAILURES": 100,
+        # Percentage of the sequence's frames (or of the sample) rejecting it (0 = no limit)
+        "MAX_FAILURE_PERCENT": 5.0,
+        # Failures needed before the percentage applies (short sequences)
+        "MIN_FAILURES": 10,
+        # Frames spread evenly over the sequence validated before the rest
+        "SAMPLE_SIZE": 32
+    },
+    "pipeline": {
+        # Run the validation phase as a streaming staged pipeline
+        "ENABLED": True,
+        # Bounded queue length between stages (buffers / tasks)
+        "QUEUE_SIZE": 16,
+        # Concurrency per stage
+        "SEQUENCE_WORKERS": 1,
+        "READ_WORKERS": 4,
+        "HASH_WORKERS": 4,
+        "ATTRIBUTE_WORKERS": 2,
+        # Read buffers shared by the read and hash stages; memory is bounded
+        # by BUFFER_POOL x BUFFER_SIZE whatever the queue length
+        "BUFFER_POOL": 20
+    },
+    "scheduler": {
+        # Directories validated concurrently (1 = one after another)
+        "MAX_DIRECTORIES": 4,
+        # Default concurrent directories per volume (st_dev)
+        "VOLUME_CONCURRENCY": 2,
+        # Per-volume caps keyed by any path on that volume
+        "VOLUME_OVERRIDES": {}
+    },
+    "discovery": {
+        # Concurrent directory listings during discovery
+        "WORKERS": 16
+    },
+    "cache": {
+        # Persist digests and attribute verdicts keyed on file identity
+        "ENABLED": True,
+        # SQLite file; None uses ./cache/validation_cache.sqlite
+        "PATH": None,
+        # Serve unchanged files from the cache (--trust-cache / --verify-all)
+        "TRUST_CACHE": False,
+        # Eviction by entry age and by number of entries per table
+        "MAX_AGE_DAYS": 180,
+        "MAX_ENTRIES": 10000000,
+        # Eviction by database size in MB, oldest entries first (0 = no limit)
+        "MAX_SIZE_MB": 2048
+    },
+    "checkpoint": {
+        # Journal verdicts so an interrupted run can be resumed
+        "ENABLED": True,
+        # Journal directory; None uses ./checkpoints
+        "DIRECTORY": None,
+        # fsync the journal every N records or N seconds
+        "SYNC_RECORDS": 1000,
+        "SYNC_SECONDS": 5,
+        # Replay the journal of an interrupted run (--resume)
+        "RESUME": False
+    },
+    "results": {
+        # Results database directory; None uses ./results
+        "DIRECTORY": None,
+        # Outcomes buffered in memory before spilling to SQLite
+        "SPILL_SIZE": 100000
+    },
+    "metrics": {
+        # Record per-stage timings, throughput and latency histograms
+        "ENABLED": True,
+        # Output directory; None uses ./metrics
+        "DIRECTORY": None,
+        # Prometheus textfile-collector file; None uses <DIRECTORY>/dpx_validation.prom
+        "PROMETHEUS_FILE": None,
+        # Latency histogram bucket upper bounds (seconds)
+        "LATENCY_BUCKETS": [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300],
+        # Single-run profiling hooks (--profile / --trace-memory)
+        "PROFILE": False,
+        "TRACE_MEMORY": False
     }
-}
\ No newline at end of file
+}
@@ -0,0 +1,117 @@
+"""Volume-aware directory scheduling.
+
+This module defines `DirectoryScheduler`, which validates several directories
+of the work plan concurrently while limiting how many run against each
+underlying volume at once. Directories are grouped by device (`st_dev`, as
+recorded by `FileDiscovery`); each volume gets its own concurrency cap, so
+reels on different arrays are validated in parallel while a single
+spindle‑backed volume is not thrashed by competing sequential reads.
+
+Settings (`config.CONFIG["scheduler"]`):
+    MAX_DIRECTORIES     Directories validated concurrently in total.
+    VOLUME_CONCURRENCY  Default per‑volume cap.
+    VOLUME_OVERRIDES    Per‑volume caps keyed by any path on the volume
+                        (e.g. {"/mnt/spindle": 1}).
+
+Within a volume, directories start in work plan order.
+
+The scheduler either runs a per-directory callable on its own thread pool
+(`run`, used when the pipeline is disabled) or only admits directories to
+the shared `ValidationPipeline` (`next_plans` / `directory_finished`).
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryScheduler:
+    """Run or admit directories with total and per-volume limits.
+
+    Args:
+        plans (list[DirectoryPlan]): Directories to validate.
+        validate (callable, optional): Called with a single plan by `run`;
+            runs its validation. Not needed when the scheduler only admits
+            directories to a pipeline.
+        max_directories (int, optional): Total concurrent directories.
+        volume_concurrency (int, optional): Default per-volume cap.
+    """
+    def __init__(self, plans, validate=None, max_directories=None, volume_concurrency=None):
+
+        scheduler_config = config.CONFIG["scheduler"]
+        self.plans = plans
+        self.validate = validate
+        self.max_directories = max_directories or scheduler_config["MAX_DIRECTORIES"]
+        self.volume_concurrency = volume_concurrency or scheduler_config["VOLUME_CONCURRENCY"]
+        self.volume_limits = {}
+        self.volumes = {}
+        self.active = {}
+
+        for path, limit in scheduler_config["VOLUME_OVERRIDES"].items():
+            try:
+                self.volume_limits[os.stat(path).st_dev] = limit
+            except OSError as e:
+                logger.warning(f"Ignoring volume override for {path}: {e}")
+
+    def group_by_volume(self):
+        """Queue each plan under its device, preserving plan order."""
+        for plan in self.plans:
+            self.volumes.setdefault(plan.device, deque()).append(plan)
+            self.active.setdefault(plan.device, 0)
+
+        for device, plans in self.volumes.items():
+            logger.info(
+                f"Volume {device}: {len(plans)} directories, "
+                f"concurrency {self.volume_limit(device)}"
+            )
+
+    def volume_limit(self, device):
+        """Return the concurrency cap for a device."""
+        return self.volume_limits.get(device, self.volume_concurrency)
+
+    def next_plans(self, running):
+        """Yield plans that may start now without exceeding any cap.
+
+        Volumes are visited round-robin so one volume with many directories
+        does not hold every free slot.
+        """
+        while running < self.max_directories:
+            started = False
+            for device, plans in self.volumes.items():
+                if running >= self.max_directories:
+                    break
+                if plans and self.active[device] < self.volume_limit(device):
+                    self.active[device] += 1
+                    running += 1
+                    started = True
+                    yield plans.popleft()
+            if not started:
+                return
+
+    def directory_finished(self, plan):
+        """Free the slot of a finished directory on its volume."""
+        self.active[plan.device] -= 1
+
+    def run(self):
+        """Validate every plan, re-raising the first error encountered."""
+        self.group_by_volume()
+
+        with ThreadPoolExecutor(max_workers=self.max_directories) as executor:
+            pending = {}
+            for plan in self.next_plans(0):
+                pending[executor.submit(self.validate, plan)] = plan
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    plan = pending.pop(future)
+                    self.directory_finished(plan)
+                    future.result()
+
+                for plan in self.next_plans(len(pending)):
+                    pending[executor.submit(self.validate, plan)] = plan
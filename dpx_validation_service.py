@@ -14,46 +14,77 @@ It performs two broad phases:
    - DPX sequence completeness (frame count) via `SequenceValidator`.
 
 High‑level flow (see `main`):
-    initialise -> inventory pass (spinner + progress messages) ->
-    validation pass (attribute + checksum + sequence) -> summary logging.
+    initialise -> discovery (work plan) -> inventory pass (spinner +
+    progress messages) -> validation pass (attribute + checksum + sequence,
+    streamed through `ValidationPipeline` when enabled) -> summary logging.
+
+Each DPX sequence is checked cheapest first (sequence, structure, a sample
+of frames, then the rest); with `--fast-fail`, `ValidationPolicy` rejects a
+sequence once its failures cross the fast-fail thresholds and the frames
+not yet read are skipped.
+
+Progress is journaled by `CheckpointJournal` as the run goes; after an
+interruption `--resume` replays the journal and validates only the work that
+was not finished.
 
 Side effects:
-    Logs progress and errors, updates several module‑level cumulative lists
-    used for the final summary, and prints billboard style status messages.
+    Logs progress and errors, records per-file outcomes in the `ResultStore`
+    (SQLite, under ./results) used for the final summary, and prints
+    billboard style status messages.
 
 Exit codes:
     On unrecoverable errors (e.g. no directory chosen, filesystem errors) the
     process exits with a non‑zero status after logging a critical message.
+    The headless `batch_validation` entry point returns the `EXIT_*` codes
+    below.
 
 Public entry point:
-    Run the module directly to launch the validation workflow.
+    Run the module directly to launch the validation workflow; `tkinter`,
+    `tqdm` and `dotenv` are only imported when used, so the module also
+    loads quickly for headless use (`validate_location`).
 """
 
+import argparse
 import logging
 import os
-from dotenv import load_dotenv
 import glob
-import tkinter as tk
-from tkinter import filedialog
 import sys
+import time
 from datetime import datetime
-from tqdm import tqdm
 
 import logging_config
 import data.billboard_text as billboard_text
 import config
 
 from progress_loop import Spinner
+from file_discovery import FileDiscovery
+from validation_pipeline import ValidationPipeline
+from directory_scheduler import DirectoryScheduler
 from inventory_generator import InventoryGenerator
 from validators.dpx_sequence_validator import SequenceValidator
+from validators.dpx_structure_validator import DPXStructureValidator
 from validators.checksum_validator import ChecksumValidator
+from validators.checksum_manifest import ChecksumManifest
+from validators.checksum_engine import ChecksumEngine, shutdown_process_pools
+from validators.fused_frame_validator import verify_frame
+from validation_cache import get_validation_cache, close_validation_cache
+from run_metrics import get_run_metrics, observe_stage
+from result_store import get_result_store, close_result_store
+from checkpoint_journal import get_checkpoint_journal, open_checkpoint_journal, close_checkpoint_journal
+from manifest_writer import get_manifest_writer, close_manifest_writer
+from validation_policy import get_validation_policy, close_validation_policy
+from validators.multi_digest import SUPPORTED_ALGORITHMS
 from validators.file_attributes_validator import FileValidator
+from validators.header_fingerprint import HeaderFingerprinter
+from validators.mediainfo_batch import MediaInfoBatchReader
+
+# Exit codes: every check passed / validation failures / bad arguments or
+# root / the run could not complete
+EXIT_PASSED = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
 
-cumulative_mag_files = []
-cumulative_film_files = []
-file_attributes_failed = []
-checksums_verified = []
-checksums_failed = []
 
 def test_source_location():
     """Return a test source directory from the environment if configured.
@@ -68,6 +99,8 @@ def test_source_location():
     Side Effects:
         Logs errors; may call sys.exit() on failure.
     """
+    from dotenv import load_dotenv
+
     load_dotenv()
     try:
         location = os.getenv("TEST_LOCATION")
@@ -97,6 +130,9 @@ def set_source_location():
     Side Effects:
         Opens a GUI dialog; logs errors and may terminate the process.
     """
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     root.attributes("-topmost", True)
@@ -117,6 +153,100 @@ def set_source_location():
         logging.error("Unable able to open directory", e)
 
 
+def argument_parser(description="DPX File Validation Service"):
+    """Build the parser for the run options shared by every entry point.
+
+    Args:
+        description (str): Parser description.
+
+    Returns:
+        argparse.ArgumentParser: Parser with the run options.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument(
+        "--trust-cache",
+        action="store_true",
+        help="Serve results for unchanged files from the validation cache",
+    )
+    cache_mode.add_argument(
+        "--verify-all",
+        action="store_true",
+        help="Re-validate every file, refreshing the validation cache",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile this run with cProfile (written next to the run metrics)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Trace allocations with tracemalloc and add the top sites to the run metrics",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run over the same directory from its checkpoint journal",
+    )
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        choices=SUPPORTED_ALGORITHMS,
+        metavar="ALG",
+        help="Digests computed in the same read, and the checksum files preferred, "
+        f"in order ({', '.join(SUPPORTED_ALGORITHMS)})",
+    )
+    parser.add_argument(
+        "--write-manifests",
+        nargs="+",
+        choices=SUPPORTED_ALGORITHMS,
+        metavar="ALG",
+        help="Write md5sum-format manifests and sidecars for these algorithms from verified files",
+    )
+    parser.add_argument(
+        "--fast-fail",
+        action="store_true",
+        help="Reject a sequence once its failures cross the fast-fail thresholds and skip its remaining frames",
+    )
+
+    return parser
+
+
+def parse_arguments():
+    """Parse command line options.
+
+    Returns:
+        argparse.Namespace: Parsed options.
+    """
+    return argument_parser().parse_args()
+
+
+def apply_arguments(arguments):
+    """Apply parsed command line options to the runtime configuration.
+
+    Args:
+        arguments (argparse.Namespace): Options from `parse_arguments`.
+    """
+    if arguments.trust_cache:
+        config.CONFIG["cache"]["TRUST_CACHE"] = True
+    elif arguments.verify_all:
+        config.CONFIG["cache"]["TRUST_CACHE"] = False
+
+    if arguments.profile:
+        config.CONFIG["metrics"]["PROFILE"] = True
+    if arguments.trace_memory:
+        config.CONFIG["metrics"]["TRACE_MEMORY"] = True
+    if arguments.resume:
+        config.CONFIG["checkpoint"]["RESUME"] = True
+    if arguments.algorithms:
+        config.CONFIG["checksums"]["ALGORITHMS"] = arguments.algorithms
+    if arguments.write_manifests:
+        config.CONFIG["checksums"]["WRITE_MANIFESTS"] = arguments.write_manifests
+    if arguments.fast_fail:
+        config.CONFIG["fast_fail"]["ENABLED"] = True
+
+
 def intialise_service():
     """Initialise logging and select the source location.
 
@@ -135,53 +265,52 @@ def intialise_service():
     return start_time, location, logger
 
 
-def inventory_validation(location, file):
-    """Generate inventory metadata for a single file.
-
-    Steps:
-        1. Parse file name & type.
-        2. Load / parse JSON inventory file if present.
-        3. Parse object keys (domain specific metadata derivation).
-        4. Write inventory data out (side effect defined by InventoryGenerator).
+def load_inventory(location):
+    """Load and index the JSON inventory once for the run.
 
     Args:
-        location (str): Directory path used as the context root.
-        file (str): Absolute path (or relative within location) of the file.
+        location (str): Root directory being processed.
+
+    Returns:
+        InventoryGenerator: Generator holding the indexed inventory.
     """
-    inventory_generator = InventoryGenerator(location, file)
-    inventory_generator.parse_file_name_and_type()
+    inventory_generator = InventoryGenerator(location)
     inventory_generator.read_json_inventory()
-    inventory_generator.parse_object_keys()
-    inventory_generator.write_inventory_data()
+    inventory_generator.index_inventory()
 
+    return inventory_generator
 
-def file_attributes_validation(file):
+
+def file_attributes_validation(file, file_attributes=None):
     """Validate technical / format attributes for the given file.
 
     Args:
         file (str): Path to the media file (DPX or mag).
+        file_attributes (bytes, optional): Prefetched MediaInfo JSON.
 
     Returns:
         bool: True if format attributes are verified, False otherwise.
     """
-    file_validator = FileValidator(file)
+    file_validator = FileValidator(file, file_attributes=file_attributes)
     file_validator.read_attributes()
     file_validator.format_attributes_validation()
 
     return file_validator.format_verified
 
 
-def checksum_validation(file, checksums):
+def checksum_validation(file, checksums, manifest_index=None):
     """Validate a file against a checksum sidecar / manifest.
 
     Args:
         file (str): Path to the file whose integrity is being checked.
         checksums (str): Path to the checksum sidecar or manifest file.
+        manifest_index (ChecksumManifest, optional): Shared parsed index of
+            `checksums`.
 
     Returns:
         bool: True if the file's computed hash matches the manifest entry.
     """
-    checksum_validator = ChecksumValidator(file, checksums)
+    checksum_validator = ChecksumValidator(file, checksums, manifest_index)
     checksum_validator.generate_file_hash()
     checksum_validator.file_name_extract()
     checksum_validator.seek_in_manifest()
@@ -190,112 +319,656 @@ def checksum_validation(file, checksums):
     return checksum_validator.hash_verified
 
 
-def dpx_sequence_check(files, path):
+def dpx_sequence_check(files, path, manifests=None):
     """Run DPX sequence completeness checks for a directory of frames.
 
-    Resolves the expected checksum/manifest file pattern from config, locates
-    it, and uses `SequenceValidator` to compare manifest line count with the
-    number of DPX frame files present.
+    Uses the manifests found during discovery (or resolves the expected
+    checksum/manifest file pattern from config and locates it), parses the
+    manifest once into a `ChecksumManifest` index, and uses
+    `SequenceValidator` to compare manifest line count with the number of DPX
+    frame files present. The index is kept on the validator
+    (`manifest_index`) for reuse by `film_checksum_validation`. Missing
+    frames and frames the manifest does not list count towards the
+    sequence's fast-fail thresholds.
 
     Args:
         files (list[str]): Ordered list of DPX frame file paths.
         path (str): Directory containing the sequence and manifest.
+        manifests (list[str], optional): Manifest paths from the work plan.
 
     Returns:
         tuple(list[str], SequenceValidator): The located manifest path(s) and
         the configured validator instance (post counting operations).
     """
-    md5 = config.CONFIG["extensions"]["CHECKSUM"]
-    checksum_manifest = glob.glob(os.path.join(path, md5))
-    sequence_validator = SequenceValidator(files, checksum_manifest[0], path)
+    if manifests is None:
+        md5 = config.CONFIG["extensions"]["CHECKSUM"]
+        manifests = glob.glob(os.path.join(path, md5))
+    started = time.perf_counter()
+    checksum_manifest = manifests
+    manifest_index = ChecksumManifest(checksum_manifest[0])
+    manifest_index.parse_manifest()
+    manifest_writer = get_manifest_writer()
+    if manifest_writer is not None:
+        manifest_writer.register_manifest(path, checksum_manifest[0])
+    sequence_validator = SequenceValidator(files, checksum_manifest[0], path, manifest_index)
     sequence_validator.count_manifest_lines()
     sequence_validator.count_file_sequence()
+    record_result("sequence", path, sequence_validator.sequence_verified())
+    apply_sequence_policy(files, path, sequence_validator)
+    observe_stage("sequence", started, files=len(files))
 
     return checksum_manifest, sequence_validator
 
 
-def process_file_inventory(files, path):
-    """Process inventory generation for a list of media files.
+def apply_sequence_policy(files, path, sequence_validator):
+    """Open a sequence's fast-fail tally with the sequence check's findings.
 
     Args:
-        files (list[str]): File paths to include in inventory.
-        path (str): Directory context passed to inventory generation.
+        files (list[str]): Every DPX frame of the sequence.
+        path (str): Directory containing the sequence.
+        sequence_validator (SequenceValidator): Validator after counting.
     """
+    validation_policy = get_validation_policy()
+    if validation_policy is None:
+        return
+
+    validation_policy.start_sequence(path, files)
+    missing_frames = max(sequence_validator.missing_count, sequence_validator.line_count - len(files))
+    if missing_frames > 0 and validation_policy.add_missing(path, missing_frames):
+        reject_sequence(path)
+
+    manifest_index = sequence_validator.manifest_index
     for file in files:
-        inventory_validation(path, file)
+        if manifest_index.lookup(os.path.basename(file)) is None:
+            if validation_policy.add_failure(file, "manifest"):
+                reject_sequence(path)
+
+
+def reject_sequence(dirpath):
+    """Record a sequence rejected by the fast-fail policy.
+
+    Its partial generated manifests are discarded.
+
+    Args:
+        dirpath (str): Directory holding the sequence.
+    """
+    record_result("rejected", dirpath, False)
+    manifest_writer = get_manifest_writer()
+    if manifest_writer is not None:
+        manifest_writer.discard_directory(dirpath)
+
+
+def rejection_check(files):
+    """Return the abort check for a batch of frames of one sequence.
+
+    Args:
+        files (list[str]): DPX frames of one directory.
+
+    Returns:
+        callable | None: Returns True once the sequence is rejected; None
+        when fast-fail is disabled.
+    """
+    validation_policy = get_validation_policy()
+    if validation_policy is None or not files:
+        return None
+
+    dirpath = os.path.dirname(files[0])
+    return lambda: validation_policy.rejected(dirpath)
+
+
+def skip_unstarted_jobs(checksum_engine):
+    """Count the frames an aborted `ChecksumEngine` run did not start."""
+    validation_policy = get_validation_policy()
+    if validation_policy is not None:
+        validation_policy.skip_files(file for file, _ in checksum_engine.skipped_jobs)
+
+
+def dpx_structure_check(files):
+    """Check DPX frame sizes and offsets before any frame is hashed.
+
+    Headers are read concurrently by `DPXStructureValidator`; truncated,
+    padded or inconsistent frames are recorded as structure failures at
+    once, ahead of the attribute and checksum passes.
+
+    Args:
+        files (list[str]): DPX frame file paths still to validate.
+    """
+    if not config.CONFIG["attributes"]["STRUCTURE_CHECK"] or not files:
+        return
+
+    started = time.perf_counter()
+    structure_validator = DPXStructureValidator(files)
+    structure_validator.check_frames()
+    for file in structure_validator.failed:
+        record_result("structure", file, False)
+    observe_stage("structure", started, files=len(files))
+
+
+def requires_mediainfo(file):
+    """Return True when attribute validation of `file` will run MediaInfo.
+
+    Args:
+        file (str): Media file path.
+    """
+    attributes = config.CONFIG["attributes"]
+    if file.lower().endswith(".wav"):
+        return attributes["WAV_BACKEND"] == "mediainfo"
+    if not file.lower().endswith(".dpx"):
+        return True
+    return attributes["DPX_BACKEND"] == "mediainfo" or attributes["MEDIAINFO_CROSS_CHECK"]
+
+
+def prefetch_mediainfo_attributes(files):
+    """Read MediaInfo JSON in batches for the files that need it.
+
+    Args:
+        files (list[str]): Media file paths about to be validated.
+
+    Files with a trusted cached attribute verdict are left out.
+
+    Returns:
+        dict[str, bytes]: File path -> MediaInfo JSON; empty when batching is
+        disabled (`MEDIAINFO_BATCH_SIZE` <= 1) or no file needs MediaInfo.
+    """
+    mediainfo_files = [
+        file for file in files if requires_mediainfo(file) and not FileValidator(file).read_cached_verdict()
+    ]
+    if config.CONFIG["attributes"]["MEDIAINFO_BATCH_SIZE"] <= 1 or not mediainfo_files:
+        return {}
+
+    batch_reader = MediaInfoBatchReader(mediainfo_files)
+    batch_reader.read_attributes()
+
+    return batch_reader.file_attributes
+
+
+def process_file_inventory(inventory_generator, files):
+    """Aggregate inventory size and count totals for a list of media files.
+
+    Args:
+        inventory_generator (InventoryGenerator): Loaded, indexed inventory.
+        files (list[tuple[str, int]]): (file path, size) pairs gathered
+            during discovery.
+    """
+    inventory_generator.aggregate_files(files)
 
 
 def process_file_validation(files):
     """Validate format attributes for each file, recording failures.
 
+    DPX sequences are validated once per header fingerprint group when
+    `HEADER_FINGERPRINT_GROUPING` is enabled; otherwise every file is
+    validated individually.
+
     Args:
         files (list[str]): Media file paths to validate.
     """
+    if config.CONFIG["attributes"]["HEADER_FINGERPRINT_GROUPING"] and all(
+        file.lower().endswith(".dpx") for file in files
+    ):
+        process_fingerprint_validation(files)
+        return
+
+    from tqdm import tqdm
+
+    prefetched = prefetch_mediainfo_attributes(files)
     for file in tqdm(files, desc="MediaInfo"):
-        format_verified = file_attributes_validation(file)
-        if not format_verified:
-            file_attributes_failed.append(file)
-        
+        format_verified = file_attributes_validation(file, prefetched.get(file))
+        record_result("attributes", file, format_verified)
+
+
+def process_fingerprint_validation(files):
+    """Validate DPX attributes once per distinct masked header.
+
+    Frames are grouped by `HeaderFingerprinter`; the first frame of each
+    group is validated and its verdict applies to the whole group. Frames
+    outside the majority group are recorded as header outliers, unreadable
+    headers as attribute failures.
+
+    Args:
+        files (list[str]): DPX frame file paths.
+    """
+    from tqdm import tqdm
+
+    fingerprinter = HeaderFingerprinter(files)
+    fingerprinter.group_frames()
+    fingerprinter.find_outliers()
+
+    prefetched = prefetch_mediainfo_attributes(
+        [group[0] for group in fingerprinter.groups.values()]
+    )
+    for group in tqdm(fingerprinter.groups.values(), desc="Header groups"):
+        format_verified = file_attributes_validation(group[0], prefetched.get(group[0]))
+        for file in group:
+            record_result("attributes", file, format_verified)
+
+    for file in fingerprinter.unreadable:
+        record_result("attributes", file, False)
+    for file in fingerprinter.outliers:
+        record_result("header_outlier", file, True)
 
-def mag_checksum_validation(files):
+
+def mag_checksum_validation(files, sidecars=None):
     """Validate checksum sidecars for mag files (one sidecar per file).
 
-    For each file, constructs sidecar filename using configured extension and
-    runs checksum comparison if present; logs an error when missing.
+    For each file, takes its sidecar from the work plan (or constructs the
+    sidecar filename using configured extension and checks it exists) and
+    runs checksum comparison if present; logs an error when missing. Present
+    sidecars are verified concurrently by `ChecksumEngine`.
 
     Args:
         files (list[str]): Mag file paths.
+        sidecars (dict[str, str], optional): Mag file -> sidecar path, as
+            found during discovery.
     """
     checksum_format = config.CONFIG["extensions"]["HASH_FORMAT"]
-    for file in tqdm(files, desc="Checksums"):
-        checksum_file = f"{file}.{checksum_format}"
-        
-        if os.path.exists(checksum_file):
-            hash_verified = checksum_validation(file, checksum_file)
-
-            if hash_verified:
-                checksums_verified.append(file)
-            else:
-                checksums_failed.append(file)
+    jobs = []
+    for file in files:
+        if sidecars is not None:
+            checksum_file = sidecars.get(file)
+        else:
+            checksum_file = f"{file}.{checksum_format}"
+            if not os.path.exists(checksum_file):
+                checksum_file = None
+
+        if checksum_file:
+            jobs.append((file, checksum_file))
         else:
             logging.error(f"No checksum file for {file}")
+            record_result("checksum_missing", file, False)
+
+    record_checksum_results(ChecksumEngine().run(jobs))
 
 
-def film_checksum_validation(files, checksum_file):
+def film_checksum_validation(files, checksum_file, manifest_index=None):
     """Validate a batch of film (DPX) files against a shared manifest.
 
+    Frames are hashed concurrently by `ChecksumEngine`; results are recorded
+    in job order. No further frame is started once the sequence is
+    rejected by the fast-fail policy.
+
+    Args:
+        files (list[str]): DPX frame file paths.
+        checksum_file (str): Path to the manifest containing expected hashes.
+        manifest_index (ChecksumManifest, optional): Parsed index of
+            `checksum_file`; parsed here when not supplied.
+    """
+    if manifest_index is None:
+        manifest_index = ChecksumManifest(checksum_file)
+        manifest_index.parse_manifest()
+
+    jobs = [(file, checksum_file) for file in files]
+    checksum_engine = ChecksumEngine()
+    record_checksum_results(checksum_engine.run(jobs, manifest_index, abort=rejection_check(files)))
+    skip_unstarted_jobs(checksum_engine)
+
+
+def fused_read_enabled():
+    """Return True when DPX frames should be validated with a single read.
+
+    The fused read needs the native DPX backend and per-frame attribute
+    validation; MediaInfo backends, the cross-check and fingerprint grouping
+    fall back to separate attribute and checksum passes.
+    """
+    attributes = config.CONFIG["attributes"]
+    return (
+        config.CONFIG["checksums"]["FUSED_READ"]
+        and attributes["DPX_BACKEND"] == "native"
+        and not attributes["MEDIAINFO_CROSS_CHECK"]
+        and not attributes["HEADER_FINGERPRINT_GROUPING"]
+    )
+
+
+def fused_film_validation(files, checksum_file, manifest_index):
+    """Validate DPX attributes and checksums from one read of each frame.
+
+    No further frame is started once the sequence is rejected by the
+    fast-fail policy.
+
     Args:
         files (list[str]): DPX frame file paths.
         checksum_file (str): Path to the manifest containing expected hashes.
+        manifest_index (ChecksumManifest): Parsed index of `checksum_file`.
+    """
+    jobs = [(file, checksum_file) for file in files]
+    checksum_engine = ChecksumEngine()
+    results = checksum_engine.run(
+        jobs, manifest_index, desc="Attributes + checksums", worker=verify_frame, abort=rejection_check(files)
+    )
+    for file, format_verified, hash_verified, digests in results:
+        record_result("attributes", file, format_verified)
+        record_result("checksum", file, hash_verified, digests)
+    skip_unstarted_jobs(checksum_engine)
+
+
+def record_checksum_results(results):
+    """Record checksum outcomes as verified / failed.
+
+    Args:
+        results (Iterable[tuple[str, bool, dict]]): (file, hash_verified,
+            digests) triples.
     """
-    for file in tqdm(files, desc="Checksums"):
-        hash_verified = checksum_validation(file, checksum_file)
+    for file, hash_verified, digests in results:
+        record_result("checksum", file, hash_verified, digests)
+
+
+def discover_work_plan(location):
+    """Walk the tree once and return the per-directory work plan.
+
+    Args:
+        location (str): Root directory to validate.
+
+    Returns:
+        list[DirectoryPlan]: Plans for directories holding media, in path order.
+    """
+    file_discovery = FileDiscovery(location)
+    file_discovery.discover()
+
+    return list(file_discovery.directory_plans())
+
+
+def validate_directory(plan):
+    """Run the validation phase for one directory of the work plan.
 
-        if hash_verified:
-            checksums_verified.append(file)
+    Mag files get attribute and sidecar checksum validation; DPX frames get
+    the sequence and structure checks followed by attribute and manifest
+    checksum validation (fused into a single read when enabled), sample
+    frames first. A sequence rejected by the fast-fail policy skips the
+    rest.
+
+    Args:
+        plan (DirectoryPlan): Discovered files for the directory.
+    """
+    mag_files = plan.pending_files(plan.mag_files)
+    film_files = plan.pending_files(plan.film_files)
+
+    if plan.mag_files:
+        billboard_text.mag_files_processing_text(path=plan.dirpath)
+        get_result_store().add("mag", plan.mag_files)
+        process_file_validation(files=mag_files)
+        mag_checksum_validation(files=mag_files, sidecars=plan.sidecars)
+
+    if plan.film_files:
+        billboard_text.dpx_files_processing_text(path=plan.dirpath)
+        get_result_store().add("film", plan.film_files)
+        checksums, sequence_validation = dpx_sequence_check(
+            files=plan.film_files, path=plan.dirpath, manifests=plan.manifests
+        )
+        dpx_structure_check(film_files)
+        validation_policy = get_validation_policy()
+        if validation_policy is not None:
+            film_files = validation_policy.order_files(plan.dirpath, film_files)
+            if validation_policy.rejected(plan.dirpath):
+                validation_policy.skip_files(film_files)
+                return
+        if fused_read_enabled():
+            fused_film_validation(
+                files=film_files,
+                checksum_file=checksums[0],
+                manifest_index=sequence_validation.manifest_index,
+            )
         else:
-            checksums_failed.append(file)
+            process_file_validation(files=film_files)
+            film_checksum_validation(
+                files=film_files,
+                checksum_file=checksums[0],
+                manifest_index=sequence_validation.manifest_index,
+            )
 
 
-def main():
-    """Module entry point executing the full validation workflow.
+def pipeline_enabled():
+    """Return True when the validation phase runs as a streaming pipeline.
 
-    Phases:
-        1. Initialise service (logging + start time + directory selection).
-        2. Walk tree generating inventory data.
-        3. Walk tree validating attributes, DPX sequence integrity, and
-           checksums (mag per-file, DPX via manifest).
-        4. Log summary statistics.
+    Header fingerprint grouping validates whole directories at once and so
+    uses the per-directory loop instead.
+    """
+    return (
+        config.CONFIG["pipeline"]["ENABLED"]
+        and not config.CONFIG["attributes"]["HEADER_FINGERPRINT_GROUPING"]
+    )
 
-    Side Effects:
-        Performs logging, updates module-level tracking lists, prints status
-        messages, and may terminate process on severe errors.
+
+def prepare_directory(plan):
+    """Pipeline sequence stage: record a directory, check its sequence and structure.
+
+    MediaInfo JSON is then prefetched in batches for the directory's files
+    that need it (frames of a rejected sequence excepted).
+
+    Args:
+        plan (DirectoryPlan): Discovered files for the directory.
+
+    Returns:
+        tuple(str | None, ChecksumManifest | None, dict[str, bytes]): The DPX
+        manifest path and its parsed index, or None for both when the
+        directory has no frames, and the prefetched MediaInfo JSON by file.
     """
-    MAG = config.CONFIG["extensions"]["MAG"]
-    FILM = config.CONFIG["extensions"]["FILM"]
+    mag_files = plan.pending_files(plan.mag_files)
+    get_result_store().add("mag", plan.mag_files)
+    if not plan.film_files:
+        return None, None, prefetch_mediainfo_attributes(mag_files)
 
-    start_time, location, logger = intialise_service()
+    film_files = plan.pending_files(plan.film_files)
+    get_result_store().add("film", plan.film_files)
+    checksums, sequence_validation = dpx_sequence_check(
+        files=plan.film_files, path=plan.dirpath, manifests=plan.manifests
+    )
+    dpx_structure_check(film_files)
+
+    validation_policy = get_validation_policy()
+    if validation_policy is not None and validation_policy.rejected(plan.dirpath):
+        film_files = []
+
+    return (
+        checksums[0],
+        sequence_validation.manifest_index,
+        prefetch_mediainfo_attributes(mag_files + film_files),
+    )
+
+
+def record_result(kind, file, verified, digests=None):
+    """Record a single verdict in the result store and checkpoint journal.
+
+    Also the pipeline sink. Failed frames count towards their sequence's
+    fast-fail thresholds. The digests of a verified file are passed on to
+    the `ManifestWriter` when manifests are being generated, unless its
+    sequence was rejected.
+
+    Args:
+        kind (str): "attributes", "checksum", "checksum_missing",
+            "header_outlier", "structure", or "sequence" / "rejected" (`file`
+            is then the directory).
+        file (str): File the verdict applies to.
+        verified (bool): Verdict.
+        digests (dict[str, str], optional): Algorithm -> digest computed
+            for a "checksum" verdict.
+    """
+    manifest_writer = get_manifest_writer()
+    if manifest_writer is None:
+        digests = None
+
+    checkpoint_journal = get_checkpoint_journal()
+    if checkpoint_journal is not None:
+        checkpoint_journal.record_verdict(kind, file, verified, digests)
+    store_result(kind, file, verified)
+
+    validation_policy = get_validation_policy()
+    if validation_policy is not None:
+        if not verified and kind in ("attributes", "checksum", "structure"):
+            if validation_policy.add_failure(file, kind):
+                reject_sequence(os.path.dirname(file))
+        if digests and validation_policy.rejected(os.path.dirname(file)):
+            digests = None
+
+    if digests and verified:
+        manifest_writer.add_digests(file, digests)
+
+
+def store_result(kind, file, verified):
+    """Add a single verdict to the result store.
+
+    Args:
+        kind (str): Verdict kind, as for `record_result`.
+        file (str): File (or directory) the verdict applies to.
+        verified (bool): Verdict.
+    """
+    if kind == "checksum":
+        get_result_store().add("checksum_verified" if verified else "checksum_failed", [file])
+    elif kind == "header_outlier":
+        get_result_store().add("header_outlier", [file])
+    elif kind == "checksum_missing":
+        get_result_store().add("checksum_missing", [file])
+    elif kind == "rejected":
+        get_result_store().add("sequence_rejected", [file])
+    elif not verified:
+        get_result_store().add(f"{kind}_failed", [file])
+
+
+def record_directory(plan):
+    """Journal a directory whose files all have their verdicts.
+
+    Its generated manifests are written first, so a directory recorded as
+    complete never needs them again, and its fast-fail tally is closed.
+
+    Args:
+        plan (DirectoryPlan): The completed directory.
+    """
+    manifest_writer = get_manifest_writer()
+    if manifest_writer is not None:
+        manifest_writer.finish_directory(plan.dirpath)
 
+    validation_policy = get_validation_policy()
+    if validation_policy is not None:
+        validation_policy.finish_sequence(plan.dirpath)
+
+    checkpoint_journal = get_checkpoint_journal()
+    if checkpoint_journal is not None:
+        checkpoint_journal.record_directory(plan.dirpath)
+
+
+def resume_work_plan(work_plan, checkpoint_journal):
+    """Apply an interrupted run's journal to the work plan.
+
+    Directories the journal records as complete are dropped from the plan;
+    in the others, files with every verdict they need (attributes, plus a
+    checksum where a manifest or sidecar applies) are marked as completed.
+    The journaled verdicts of both are added to the result store, so the
+    summary matches an uninterrupted run. Verdicts already journaled for
+    files that are validated again are not journaled twice, the journaled
+    digests of completed frames go to the manifests being generated, and
+    the failures of completed frames count towards the fast-fail
+    thresholds again.
+
+    Args:
+        work_plan (list[DirectoryPlan]): Directories found by discovery.
+        checkpoint_journal (CheckpointJournal): Replayed journal.
+
+    Returns:
+        list[DirectoryPlan]: Directories with work remaining.
+    """
+    result_store = get_result_store()
+    manifest_writer = get_manifest_writer()
+    validation_policy = get_validation_policy()
+    remaining = []
+    for plan in work_plan:
+        if checkpoint_journal.directory_complete(plan.dirpath):
+            result_store.add("mag", plan.mag_files)
+            result_store.add("film", plan.film_files)
+            continue
+
+        if validation_policy is not None and plan.film_files:
+            validation_policy.start_sequence(plan.dirpath, plan.film_files)
+        file_digests = checkpoint_journal.file_digests(plan.dirpath)
+        for file, verdicts in checkpoint_journal.file_verdicts(plan.dirpath).items():
+            if file not in plan.file_sizes:
+                continue
+            needs_checksum = file in plan.sidecars or file not in plan.mag_files
+            if "attributes" in verdicts and ("checksum" in verdicts or not needs_checksum):
+                plan.completed_files.add(file)
+                for kind, verified in verdicts.items():
+                    store_result(kind, file, verified)
+                    if validation_policy is None or verified or kind not in ("attributes", "checksum", "structure"):
+                        continue
+                    if validation_policy.add_failure(file, kind):
+                        reject_sequence(plan.dirpath)
+                if manifest_writer is not None and verdicts.get("checksum") and file in file_digests:
+                    if file not in plan.mag_files:
+                        manifest_writer.add_digests(file, file_digests[file])
+            else:
+                checkpoint_journal.partial_verdicts.update((file, kind) for kind in verdicts)
+        remaining.append(plan)
+
+    replayed_sequences = set()
+    for kind, file, verified in checkpoint_journal.replay_verdicts():
+        if kind in ("sequence", "rejected"):
+            if checkpoint_journal.directory_complete(file) and (kind, file) not in replayed_sequences:
+                replayed_sequences.add((kind, file))
+                store_result(kind, file, verified)
+        elif checkpoint_journal.directory_complete(os.path.dirname(file)):
+            store_result(kind, file, verified)
+
+    logging.getLogger(__name__).info(
+        f"Resumed: {len(work_plan) - len(remaining)} directories and "
+        f"{sum(len(plan.completed_files) for plan in remaining)} files already validated"
+    )
+
+    return remaining
+
+
+def validate_plan(plan):
+    """Validate a single directory, as scheduled by `DirectoryScheduler`.
+
+    Args:
+        plan (DirectoryPlan): Discovered files for the directory.
+    """
+    validate_directory(plan)
+    record_directory(plan)
+
+
+def run_validation(work_plan):
+    """Run the validation phase over every directory of the work plan.
+
+    The plan is streamed through one pipeline. When the scheduler allows
+    more than one directory at a time it admits directories to that pipeline
+    with per-volume limits; otherwise they go through in plan order. With the
+    pipeline disabled directories are validated one by one, or concurrently
+    by the scheduler.
+
+    Args:
+        work_plan (list[DirectoryPlan]): Directories to validate.
+    """
+    concurrent = config.CONFIG["scheduler"]["MAX_DIRECTORIES"] > 1
+    if pipeline_enabled():
+        ValidationPipeline(
+            work_plan, prepare_directory, record_result, finish_directory=record_directory,
+            scheduler=DirectoryScheduler(work_plan) if concurrent else None,
+        ).run()
+    elif concurrent:
+        DirectoryScheduler(work_plan, validate_plan).run()
+    else:
+        for plan in work_plan:
+            validate_plan(plan)
+
+
+def validate_location(location, start_time, logger):
+    """Validate one root directory: discovery, inventory, validation, summary.
+
+    Verdicts are journaled throughout; when `RESUME` is set (`--resume`) the
+    journal of an interrupted run over the same directory is replayed first
+    and only the unfinished work is done.
+
+    Args:
+        location (str): Root directory to validate.
+        start_time (datetime): When the run over `location` started.
+        logger (logging.Logger): Service logger.
+
+    Returns:
+        bool: True when no attribute, checksum, sequence or structure check
+        failed, no sequence was rejected and no checksum file was missing.
+
+    Side Effects:
+        Performs logging, records outcomes in the result store, prints status
+        messages, and exits on severe errors.
+    """
     logger.info(f"Location: {location}")
     logger.info(f"Start time: {start_time}")
 
@@ -306,13 +979,30 @@ def main():
 
     # File Inventory Checks
     try:
-        for dirpath, _, _ in os.walk(location):
-            mag_files = sorted(glob.glob(os.path.join(dirpath, MAG)))
-            film_files = sorted(glob.glob(os.path.join(dirpath, FILM)))
-
-            if mag_files or film_files:
-                file_inventory_list = mag_files + film_files
-                process_file_inventory(files=file_inventory_list, path=dirpath)
+        started = time.perf_counter()
+        work_plan = discover_work_plan(location)
+        media_count = sum(len(plan.mag_files) + len(plan.film_files) for plan in work_plan)
+        observe_stage("discovery", started, files=media_count)
+
+        checkpoint_journal = open_checkpoint_journal(
+            location, resume=config.CONFIG["checkpoint"]["RESUME"]
+        )
+        if checkpoint_journal is not None and checkpoint_journal.inventory_complete:
+            logger.info("Inventory already written by the interrupted run")
+        else:
+            started = time.perf_counter()
+            inventory_generator = load_inventory(location)
+            for plan in work_plan:
+                process_file_inventory(inventory_generator, files=plan.media_files_with_sizes())
+
+            inventory_generator.apply_shelfmark_totals()
+            inventory_generator.write_inventory_data()
+            observe_stage("inventory", started, files=media_count)
+            if checkpoint_journal is not None:
+                checkpoint_journal.record_inventory()
+
+        if checkpoint_journal is not None and checkpoint_journal.resumed:
+            work_plan = resume_work_plan(work_plan, checkpoint_journal)
     
     except Exception as e:
         logger.critical(f"Error processing directory: {e}")
@@ -324,38 +1014,103 @@ def main():
     # File-Checksum Validation Checks
     billboard_text.validation_text()
     
+    validation_complete = False
     try:
-        for dirpath, _, _ in os.walk(location):
-            mag_files = sorted(glob.glob(os.path.join(dirpath, MAG)))
-            film_files = sorted(glob.glob(os.path.join(dirpath, FILM)))
-
-            if mag_files:
-                billboard_text.mag_files_processing_text(path=dirpath)
-                cumulative_mag_files.extend(mag_files)
-                process_file_validation(files=mag_files)
-                mag_checksum_validation(files=mag_files)
-
-            if film_files:
-                billboard_text.dpx_files_processing_text(path=dirpath)
-                cumulative_film_files.extend(film_files)
-                checksums, sequence_validation = dpx_sequence_check(files=film_files, path=dirpath)
-                process_file_validation(files=film_files)
-                film_checksum_validation(files=film_files, checksum_file=checksums[0])
-        
+        started = time.perf_counter()
+        run_validation(work_plan)
+        observe_stage("validation", started, files=media_count)
+        validation_complete = True
 
     except Exception as e:
         logger.critical(f"Error processinf files: {e}")
         sys.exit(1)
 
+    finally:
+        close_manifest_writer(completed=validation_complete)
+        close_checkpoint_journal(completed=validation_complete)
+        close_validation_policy()
+
     end_time = datetime.now()
     duration = end_time - start_time
 
     logger.info(f"End time: {end_time}")
     logger.info(f"Total time: {duration}")
-    logger.info(f"Film scans: {len(cumulative_film_files)}")
-    logger.info(f"Mag files: {len(cumulative_mag_files)}")
-    logger.info(f"Failed file attributes: {len(file_attributes_failed)}")
-    logger.info(f"Failed checksums: {len(checksums_failed)}")
+    result_store = get_result_store()
+    logger.info(f"Film scans: {result_store.count('film')}")
+    logger.info(f"Mag files: {result_store.count('mag')}")
+    logger.info(f"Failed file attributes: {result_store.count('attributes_failed')}")
+    logger.info(f"Header outliers: {result_store.count('header_outlier')}")
+    logger.info(f"Failed checksums: {result_store.count('checksum_failed')}")
+    logger.info(f"Missing checksum files: {result_store.count('checksum_missing')}")
+    logger.info(f"Failed sequences: {result_store.count('sequence_failed')}")
+    logger.info(f"Failed structure checks: {result_store.count('structure_failed')}")
+    logger.info(f"Rejected sequences: {result_store.count('sequence_rejected')}")
+    if result_store.count("sequence_rejected"):
+        logger.warning(
+            "Checksum and attribute results are incomplete: frames of rejected sequences were not validated"
+        )
+    logger.info(f"Results database: {result_store.store_file}")
+    passed = not any(
+        result_store.count(kind)
+        for kind in (
+            "attributes_failed", "checksum_failed", "checksum_missing", "sequence_failed", "structure_failed",
+            "sequence_rejected",
+        )
+    )
+    close_result_store()
+
+    return passed
+
+
+def finish_service(logger):
+    """Close the validation cache and write the run metrics.
+
+    Args:
+        logger (logging.Logger): Service logger.
+    """
+    validation_cache = get_validation_cache()
+    if validation_cache is not None:
+        logger.info(f"Validation cache hits: {validation_cache.hits}, misses: {validation_cache.misses}")
+    close_validation_cache()
+    shutdown_process_pools()
+
+    run_metrics = get_run_metrics()
+    if run_metrics is not None:
+        run_summary = run_metrics.write_metrics()
+        for stage, values in run_summary["stages"].items():
+            logger.info(
+                f"Stage {stage}: {values['wall_seconds']:.1f} s, {values['files']} files, "
+                f"{values['bytes'] / 1e6:.1f} MB"
+            )
+        if run_summary["peak_rss_bytes"] is not None:
+            logger.info(f"Peak RSS: {run_summary['peak_rss_bytes'] / 1e6:.1f} MB")
+
+
+def main():
+    """Module entry point executing the full validation workflow.
+
+    Phases:
+        1. Initialise service (logging + start time + directory selection).
+        2. Walk tree once building the work plan, then generate inventory
+           data from it.
+        3. Validate each planned directory: attributes, DPX sequence
+           integrity, and checksums (mag per-file, DPX via manifest).
+        4. Log summary statistics and write the run metrics (per-stage
+           timings, latency histograms, peak RSS).
+
+    Side Effects:
+        Performs logging, records outcomes in the result store, prints status
+        messages, and may terminate process on severe errors.
+    """
+    apply_arguments(parse_arguments())
+    start_time, location, logger = intialise_service()
+
+    run_metrics = get_run_metrics()
+    if run_metrics is not None:
+        run_metrics.start_profiling()
+
+    validate_location(location, start_time, logger)
+    finish_service(logger)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+"""Concurrent directory discovery and work planning.
+
+This module defines `FileDiscovery`, which walks a directory tree once with
+`os.scandir`, fanning directory listings out over a bounded thread pool
+(`WORKERS` in `config.CONFIG["discovery"]`). On SMB / NFS mounts every
+listing and stat is a network round trip; keeping many of them in flight at
+once hides that latency.
+
+The walk produces an in‑memory work plan: one `DirectoryPlan` per directory
+holding the mag (WAV) files, DPX frames, checksum manifests, per‑file
+checksum sidecars, the directory's volume (`st_dev`) and the size of every
+file, taken from the `DirEntry.stat()` result gathered during the listing. Both the inventory and
+the validation phases consume the plan, so no phase needs to list, glob or
+stat the tree again:
+
+    d = FileDiscovery(location)
+    d.discover()
+    for plan in d.directory_plans():
+        plan.film_files, plan.manifests, plan.sidecars, ...
+
+Checksum files are recognised by the extension of every known digest
+algorithm (`.md5`, `.sha256`, `.blake2b`, `.xxh128`, `.b3`, ...) and by the
+`CHECKSUM` pattern, whose algorithm is then detected from the contents
+(`ChecksumManifest`). Where a mag file or sequence has several, the
+algorithms are preferred in `ALGORITHMS` order, then `HASH_FORMAT`, then the
+rest.
+
+As with `os.walk(followlinks=False)`, symlinked directories are not
+descended into, so a link back up the tree cannot repeat it; hidden
+directories are walked. As with `glob`, hidden files (names starting with
+".") are ignored.
+"""
+
+import fnmatch
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import config
+from validators.checksum_manifest import manifest_algorithm
+from validators.multi_digest import ALGORITHM_ALIASES, KNOWN_ALGORITHMS
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryPlan:
+    """Work plan for a single directory.
+
+    Args:
+        dirpath (str): Directory the plan describes.
+
+    Attributes:
+        mag_files (list[str]): Sorted WAV file paths.
+        film_files (list[str]): Sorted DPX frame paths.
+        manifests (list[str]): Checksum manifest paths (checksum files that
+            are not a mag file's sidecar), preferred algorithm first.
+        sidecars (dict[str, str]): Mag file path -> its checksum sidecar.
+        file_sizes (dict[str, int]): File path -> size in bytes.
+        device (int | None): `st_dev` of the directory's volume.
+        completed_files (set[str]): Files already validated by an earlier,
+            interrupted run (see `CheckpointJournal`); skipped on resume.
+    """
+    def __init__(self, dirpath):
+
+        self.dirpath = dirpath
+        self.mag_files = []
+        self.film_files = []
+        self.manifests = []
+        self.sidecars = {}
+        self.file_sizes = {}
+        self.device = None
+        self.completed_files = set()
+
+    def media_files_with_sizes(self):
+        """Return (file path, size) pairs for the mag and DPX files."""
+        return [(file, self.file_sizes[file]) for file in self.mag_files + self.film_files]
+
+    def pending_files(self, files):
+        """Return `files` without those in `completed_files`."""
+        if not self.completed_files:
+            return files
+        return [file for file in files if file not in self.completed_files]
+
+
+class FileDiscovery:
+    """Discover media files, manifests and sidecars across a directory tree.
+
+    Args:
+        location (str): Root directory to walk.
+        workers (int, optional): Concurrent directory listings. Defaults to
+            the configured `WORKERS`.
+
+    Attributes:
+        directories (dict[str, DirectoryPlan]): Directory path -> plan.
+    """
+    def __init__(self, location, workers=None):
+
+        extensions = config.CONFIG["extensions"]
+        self.location = location
+        self.workers = workers or config.CONFIG["discovery"]["WORKERS"]
+        self.mag_pattern = extensions["MAG"]
+        self.film_pattern = extensions["FILM"]
+        self.checksum_pattern = extensions["CHECKSUM"]
+        self.algorithms = list(
+            dict.fromkeys(
+                [*config.CONFIG["checksums"]["ALGORITHMS"], extensions["HASH_FORMAT"], *KNOWN_ALGORITHMS]
+            )
+        )
+        self.sidecar_extensions = [
+            f".{extension}"
+            for algorithm in self.algorithms
+            for extension in [algorithm, *(alias for alias, name in ALGORITHM_ALIASES.items() if name == algorithm)]
+        ]
+        self.directories = {}
+
+    def scan_directory(self, dirpath):
+        """List one directory and build its plan.
+
+        Args:
+            dirpath (str): Directory to list.
+
+        Returns:
+            tuple(DirectoryPlan, list[str]): The directory's plan and its
+            subdirectories.
+        """
+        plan = DirectoryPlan(dirpath)
+        checksum_files = []
+        subdirectories = []
+        try:
+            plan.device = os.stat(dirpath).st_dev
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                        continue
+                    if entry.name.startswith(".") or not entry.is_file():
+                        continue
+
+                    plan.file_sizes[entry.path] = entry.stat().st_size
+                    if fnmatch.fnmatch(entry.name, self.mag_pattern):
+                        plan.mag_files.append(entry.path)
+                    elif fnmatch.fnmatch(entry.name, self.film_pattern):
+                        plan.film_files.append(entry.path)
+                    elif manifest_algorithm(entry.name) or fnmatch.fnmatch(entry.name, self.checksum_pattern):
+                        checksum_files.append(entry.path)
+
+        except OSError as e:
+            logger.error(f"Unable to list directory {dirpath}: {e}")
+
+        plan.mag_files.sort()
+        plan.film_files.sort()
+        self.match_checksum_files(plan, checksum_files)
+
+        return plan, subdirectories
+
+    def match_checksum_files(self, plan, checksum_files):
+        """Split checksum files into mag sidecars and sequence manifests.
+
+        Each mag file takes its sidecar of the most preferred algorithm; all
+        of a mag file's sidecars are kept out of the manifests.
+        """
+        sidecars = set()
+        for file in plan.mag_files:
+            for extension in self.sidecar_extensions:
+                sidecar = file + extension
+                if sidecar in plan.file_sizes:
+                    plan.sidecars.setdefault(file, sidecar)
+                    sidecars.add(sidecar)
+
+        plan.manifests = sorted(
+            (file for file in checksum_files if file not in sidecars),
+            key=lambda file: (self.algorithm_preference(file), file),
+        )
+
+    def algorithm_preference(self, checksum_file):
+        """Return the rank of a checksum file's algorithm (lower is preferred)."""
+        algorithm = manifest_algorithm(checksum_file)
+        if algorithm in self.algorithms:
+            return self.algorithms.index(algorithm)
+        return len(self.algorithms)
+
+    def discover(self):
+        """Walk the tree, listing up to `workers` directories concurrently."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {executor.submit(self.scan_directory, self.location)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    plan, subdirectories = future.result()
+                    self.directories[plan.dirpath] = plan
+                    for subdirectory in subdirectories:
+                        pending.add(executor.submit(self.scan_directory, subdirectory))
+
+    def directory_plans(self):
+        """Yield the plans of directories holding media files, in path order."""
+        for dirpath in sorted(self.directories):
+            plan = self.directories[dirpath]
+            if plan.mag_files or plan.film_files:
+                yield plan
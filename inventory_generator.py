@@ -12,20 +12,23 @@ records (dictionaries). Each record tracks:
     size: Aggregate byte size of all matching files encountered.
     count: Number of files contributing to the aggregate size.
 
-The generator walks a supplied list of files and updates the JSON structure in place:
+The JSON inventory is loaded once per run and its records indexed by
+shelfmark. Discovered files (with sizes gathered during discovery) are first
+aggregated into per‑shelfmark totals in one pass, then each total updates the
+structure in memory:
     1. Determine the shelfmark & type from the filename.
     2. Mark the matching inventory entry as found and record its directory.
-    3. Accumulate size and increment count.
+    3. Accumulate size and count.
     4. Confirm that the file type matches the expected format.
-    5. Persist the modifications back to the JSON file.
+Once every total has been applied, the modifications are persisted back to
+the JSON file with a single atomic replace.
 """
 
-from dotenv import load_dotenv
 import logging
 import sys
-import glob
 import os
 import json
+import tempfile
 
 import config
 
@@ -33,24 +36,34 @@ logger = logging.getLogger(__name__)
 
 
 class InventoryGenerator:
-    """Encapsulate per‑file updates to a JSON inventory.
+    """Apply per‑file updates to an in‑memory, shelfmark‑indexed JSON inventory.
 
     Attributes are populated during instantiation and subsequent parsing
     methods; many represent key names inside each inventory record (shelfmark,
     found, format, directory, size, count)
 
+    Typical use:
+        g = InventoryGenerator(location)
+        g.read_json_inventory()
+        g.index_inventory()
+        g.aggregate_files(files_with_sizes)     # repeat per directory
+        g.apply_shelfmark_totals()
+        g.write_inventory_data()
+
     Args:
         location (str): Root directory being processed.
-        file (str): Path to the current file whose metadata will update the inventory.
     """
-    def __init__(self, location, file):
+    def __init__(self, location):
+        from dotenv import load_dotenv
+
         load_dotenv()
 
         self.json_data = os.getenv("JSON_FILE")
         self.location = location
-        self.file = file
-        self.file_list = glob.glob(location + "/**/*.*", recursive=True)
+        self.file = None
         self.object_list = []
+        self.shelfmark_index = {}
+        self.shelfmark_totals = {}
         self.object = {}
         self.shelfmark = None
         self.found = None
@@ -71,13 +84,15 @@ class InventoryGenerator:
         the full stem and sets type to "mag".
         """
         try:
+            self.filename = None
+            self.type = None
             self.dirpath = os.path.dirname(self.file)
             if self.file.endswith(".dpx"):
-                self.filename = os.path.basename(self.file.split(".")[0][:-8])
+                self.filename = os.path.basename(self.file).split(".")[0][:-8]
                 self.type = "film"
 
             elif self.file.endswith(".wav"):
-                self.filename = os.path.basename(self.file.split(".")[0])
+                self.filename = os.path.basename(self.file).split(".")[0]
                 self.type = "mag"
 
         except AttributeError as ae:
@@ -100,33 +115,79 @@ class InventoryGenerator:
             logger.critical("JSON inventory file not found. SYSTEM EXIT.", {e})
             sys.exit(1)
 
+    def index_inventory(self):
+        """Index inventory records by shelfmark value.
+
+        The shelfmark is the value of each record's first key. Records sharing
+        a shelfmark are kept together, in inventory order.
+        """
+        try:
+            for record in self.object_list["inventory"]:
+                shelfmark = record[next(iter(record))]
+                self.shelfmark_index.setdefault(shelfmark, []).append(record)
+
+        except KeyError as ke:
+            logger.error("Key error occurred while indexing inventory.", {ke})
+        except Exception as e:
+            logger.error("Error occurred while indexing inventory.", {e})
+
+    def aggregate_files(self, files):
+        """Accumulate per-shelfmark size and count totals for discovered files.
+
+        The directory recorded for a shelfmark is that of its first file.
+
+        Args:
+            files (Iterable[tuple[str, int]]): (file path, size in bytes).
+        """
+        for self.file, file_size in files:
+            self.parse_file_name_and_type()
+            if self.type is None:
+                continue
+
+            totals = self.shelfmark_totals.setdefault(
+                (self.filename, self.type),
+                {"directory": self.dirpath, "size": 0, "count": 0},
+            )
+            totals["size"] += file_size
+            totals["count"] += 1
+
+    def apply_shelfmark_totals(self):
+        """Apply the aggregated totals to the matching inventory records."""
+        for (self.filename, self.type), totals in self.shelfmark_totals.items():
+            self.dirpath = totals["directory"]
+            self.update_matching_records(totals["size"], totals["count"])
+
+    def update_matching_records(self, file_size, file_count):
+        """Update every record indexed under the current shelfmark.
+
+        Args:
+            file_size (int): Bytes to add.
+            file_count (int): Files to add to the record count.
+        """
+        for self.object in self.shelfmark_index.get(self.filename, []):
+            self.parse_object_keys()
+            self.verify_shelfmark_found()
+            if self.object[self.found]:
+                self.get_size_and_count(file_size, file_count)
+                self.verify_file_type()
+
     def parse_object_keys(self):
-        """Iterate inventory entries mapping expected semantic keys.
+        """Map the current record's keys onto semantic attribute names.
 
         Each inventory record's keys are enumerated positionally assigning
-        them to semantic attribute names (shelfmark, found, format, etc.). When
-        a record indicates a matching shelfmark and hasn't yet been marked
-        found, size/count aggregation and format validation are performed.
+        them to semantic attribute names (shelfmark, found, format, etc.).
         """
         try:
-            for self.object in self.object_list["inventory"]:
-                key_list = list(self.object.keys())
-                self.shelfmark = key_list[0]
-                self.found = key_list[1]
-                self.format = key_list[2]
-                self.directory = key_list[3]
-                self.size = key_list[4]
-                self.count = key_list[5]
-
-                self.verify_shelfmark_found()
-                if self.object[self.found]:
-                    self.get_size_and_count()
-                    self.verify_file_type()
-                else:
-                    pass
+            key_list = list(self.object.keys())
+            self.shelfmark = key_list[0]
+            self.found = key_list[1]
+            self.format = key_list[2]
+            self.directory = key_list[3]
+            self.size = key_list[4]
+            self.count = key_list[5]
 
-        except KeyError as ke:
-            logger.error("Key error occurred while parsing object keys.", {ke})
+        except IndexError as ie:
+            logger.error("Index error occurred while parsing object keys.", {ie})
         except Exception as e:
             logger.error("Error occurred while parsing object keys.", {e})
 
@@ -154,15 +215,18 @@ class InventoryGenerator:
                 "Unexpected error occurred during shelfmark verification.", {e}
             )
 
-    def get_size_and_count(self):
-        """Accumulate total byte size and increment file count for shelfmark."""
+    def get_size_and_count(self, file_size, file_count):
+        """Accumulate total byte size and file count for shelfmark.
+
+        Args:
+            file_size (int): Size in bytes of the files represented.
+            file_count (int): Number of files represented by `file_size`.
+        """
         try:
             if self.filename == self.object[self.shelfmark]:
-                self.shelmark_data_size = (
-                    os.path.getsize(self.file) + self.object[self.size]
-                )
+                self.shelmark_data_size = file_size + self.object[self.size]
                 self.object[self.size] = self.shelmark_data_size
-                self.object[self.count] += 1
+                self.object[self.count] += file_count
             else:
                 pass
         except AttributeError as ae:
@@ -193,10 +257,26 @@ class InventoryGenerator:
             )
 
     def write_inventory_data(self):
-        """Persist the updated inventory structure back to the JSON file."""
+        """Persist the updated inventory structure back to the JSON file.
+
+        The JSON is written to a temporary file beside the inventory and moved
+        into place with an atomic replace, so an interrupted write never
+        leaves a truncated inventory behind.
+        """
         try:
-            with open(self.json_data, "w") as wf:
-                json.dump(self.object_list, wf, indent=4)
+            inventory_dir = os.path.dirname(os.path.abspath(self.json_data))
+            fd, temp_file = tempfile.mkstemp(dir=inventory_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as wf:
+                    json.dump(self.object_list, wf, indent=4)
+                    wf.flush()
+                    os.fsync(wf.fileno())
+                if os.path.exists(self.json_data):
+                    os.chmod(temp_file, os.stat(self.json_data).st_mode)
+                os.replace(temp_file, self.json_data)
+            except BaseException:
+                os.remove(temp_file)
+                raise
 
         except IOError as e:
             logger.error("Failed to write inventory data to JSON file.", {e})
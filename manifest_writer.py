@@ -0,0 +1,264 @@
+"""md5sum-format manifest and sidecar generation.
+
+This module defines `ManifestWriter`, which writes new checksum files from
+the digests computed during validation (`WRITE_MANIFESTS` in
+`config.CONFIG["checksums"]`, or `--write-manifests`), so a delivery's md5
+manifests can be joined by sha256 / sha512 / blake2b ones without reading
+the files a second time:
+
+    reel1/BL_R_0001.md5        existing manifest, validated
+    reel1/BL_R_0001.sha256     written, one "<digest>  <name>" line per frame
+    mag/BL_M_0001.wav.sha256   written sidecar
+
+Files are written in the md5sum text layout, so `sha256sum -c` and friends
+can check them (xxh3 files in the tagged layout `xxhsum -c` expects). Only files whose checksum verified against the existing
+manifest or sidecar are written, so a generated manifest never vouches for a
+file that failed; its line count then no longer matches the sequence, which
+the next validation reports.
+
+Frame entries are appended to a hidden temporary file per directory and
+algorithm (`.dpx_manifest.<alg>.partial`) as verdicts arrive. Once the directory is complete it is synced and
+renamed into place, next to the existing manifest (`<manifest stem>.<alg>`,
+or `<directory name>.<alg>` without one). Sidecars are written as soon as
+their mag file verifies. Existing checksum files are never overwritten, and
+the temporary files of a run that stops early are removed.
+
+The writer is opened lazily, once per run, by `get_manifest_writer`; it
+returns None when no manifests are to be written.
+"""
+
+import fnmatch
+import logging
+import os
+import tempfile
+import threading
+
+import config
+
+logger = logging.getLogger(__name__)
+
+manifest_writer = None
+manifest_writer_lock = threading.Lock()
+
+
+def get_manifest_writer():
+    """Return the run's `ManifestWriter`, or None when none are written."""
+    global manifest_writer
+
+    if not config.CONFIG["checksums"]["WRITE_MANIFESTS"]:
+        return None
+
+    with manifest_writer_lock:
+        if manifest_writer is None:
+            manifest_writer = ManifestWriter()
+
+    return manifest_writer
+
+
+def close_manifest_writer(completed=False):
+    """Finish the open writer.
+
+    Args:
+        completed (bool): The run finished; manifests of directories not yet
+            written are committed. Otherwise they are discarded.
+    """
+    global manifest_writer
+
+    with manifest_writer_lock:
+        if manifest_writer is not None:
+            if completed:
+                manifest_writer.commit_all()
+                logger.info(f"Checksum files written: {manifest_writer.written}")
+            else:
+                manifest_writer.discard_all()
+        manifest_writer = None
+
+
+class ManifestWriter:
+    """Write md5sum-format manifests and sidecars from computed digests.
+
+    Args:
+        algorithms (list[str], optional): Algorithms to write. Defaults to
+            the configured `WRITE_MANIFESTS`.
+
+    Attributes:
+        pending (dict[tuple[str, str], tuple[str, file]]): (directory,
+            algorithm) -> (temporary path, open file) of manifests in
+            progress; None for a directory that could not be written.
+        manifest_names (dict[str, str]): Directory -> existing manifest the
+            new manifests are named after.
+        written (int): Checksum files written so far.
+    """
+    def __init__(self, algorithms=None):
+
+        self.algorithms = algorithms or config.CONFIG["checksums"]["WRITE_MANIFESTS"]
+        self.film_pattern = config.CONFIG["extensions"]["FILM"]
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.manifest_names = {}
+        self.written = 0
+
+    def register_manifest(self, dirpath, manifest):
+        """Name a directory's new manifests after its existing manifest."""
+        with self.lock:
+            self.manifest_names[os.path.normpath(dirpath)] = manifest
+
+    def add_digests(self, file, digests):
+        """Add a verified file's digests: a manifest entry or a sidecar.
+
+        Args:
+            file (str): Verified DPX frame or mag file.
+            digests (dict[str, str]): Algorithm -> hex digest.
+        """
+        file_name = os.path.basename(file)
+        for algorithm in self.algorithms:
+            digest = digests.get(algorithm)
+            if digest is None:
+                logger.warning(f"{file}, no {algorithm} digest to write")
+                continue
+
+            line = self.manifest_line(algorithm, digest, file_name)
+            if fnmatch.fnmatch(file_name, self.film_pattern):
+                self.add_manifest_entry(os.path.dirname(file), algorithm, line)
+            else:
+                self.write_sidecar(file, algorithm, line)
+
+    def manifest_line(self, algorithm, digest, file_name):
+        """Return one manifest line for `file_name`.
+
+        XXH3 lines are tagged BSD style, because `xxhsum -c` would take an
+        untagged 16 digit digest for XXH64.
+        """
+        if algorithm == "xxh3":
+            return f"XXH3 ({file_name}) = {digest}\n"
+        return f"{digest}  {file_name}\n"
+
+    def add_manifest_entry(self, dirpath, algorithm, line):
+        """Append a line to the directory's temporary manifest."""
+        key = (os.path.normpath(dirpath), algorithm)
+        with self.lock:
+            if key not in self.pending:
+                self.pending[key] = self.open_manifest(*key)
+            if self.pending[key] is not None:
+                self.pending[key][1].write(line)
+
+    def open_manifest(self, dirpath, algorithm):
+        """Open the hidden temporary manifest of `dirpath`.
+
+        The name is fixed per directory and algorithm, so a partial manifest
+        left by a crash is replaced by the next run over the directory.
+
+        Returns:
+            tuple[str, file] | None: Temporary path and open file, or None
+            when the directory is not writable (the manifest is skipped).
+        """
+        temporary = os.path.join(dirpath, f".dpx_manifest.{algorithm}.partial")
+        try:
+            return temporary, open(temporary, "w", encoding="utf-8", errors="surrogateescape")
+        except OSError as e:
+            logger.error(f"Unable to write {algorithm} manifest in {dirpath}: {e}")
+            return None
+
+    def manifest_path(self, dirpath, algorithm):
+        """Return the path of a directory's new manifest for `algorithm`."""
+        manifest = self.manifest_names.get(dirpath)
+        if manifest is not None:
+            stem = os.path.splitext(os.path.basename(manifest))[0]
+        else:
+            stem = os.path.basename(dirpath)
+        return os.path.join(dirpath, f"{stem}.{algorithm}")
+
+    def finish_directory(self, dirpath):
+        """Commit the manifests of a directory whose verdicts are all in."""
+        dirpath = os.path.normpath(dirpath)
+        with self.lock:
+            for key in [key for key in self.pending if key[0] == dirpath]:
+                self.commit_manifest(key)
+
+    def discard_directory(self, dirpath):
+        """Remove the temporary manifests of a directory (sequence rejected).
+
+        Later entries for the directory are ignored.
+        """
+        dirpath = os.path.normpath(dirpath)
+        with self.lock:
+            for algorithm in self.algorithms:
+                pending = self.pending.get((dirpath, algorithm))
+                if pending is not None:
+                    pending[1].close()
+                    self.remove_file(pending[0])
+                self.pending[(dirpath, algorithm)] = None
+
+    def commit_all(self):
+        """Commit every manifest still in progress (end of a completed run)."""
+        with self.lock:
+            for key in list(self.pending):
+                self.commit_manifest(key)
+
+    def discard_all(self):
+        """Remove every temporary manifest (run stopped early)."""
+        with self.lock:
+            for temporary, manifest in filter(None, self.pending.values()):
+                manifest.close()
+                self.remove_file(temporary)
+            self.pending.clear()
+
+    def commit_manifest(self, key):
+        """Sync a temporary manifest and rename it into place (lock held)."""
+        dirpath, algorithm = key
+        pending = self.pending.pop(key)
+        if pending is None:
+            return
+
+        temporary, manifest = pending
+        path = self.manifest_path(dirpath, algorithm)
+        try:
+            manifest.flush()
+            os.fsync(manifest.fileno())
+            manifest.close()
+            if os.path.exists(path):
+                logger.warning(f"{path} already exists; new {algorithm} manifest not written")
+                self.remove_file(temporary)
+                return
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, path)
+            self.written += 1
+            logger.info(f"Wrote {algorithm} manifest {path}")
+
+        except OSError as e:
+            logger.error(f"Unable to write manifest {path}: {e}")
+            self.remove_file(temporary)
+
+    def write_sidecar(self, file, algorithm, line):
+        """Write a single-entry sidecar next to `file`, atomically."""
+        path = f"{file}.{algorithm}"
+        if os.path.exists(path):
+            logger.warning(f"{path} already exists; new {algorithm} sidecar not written")
+            return
+
+        try:
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(file), prefix=".sidecar_")
+        except OSError as e:
+            logger.error(f"Unable to write sidecar {path}: {e}")
+            return
+
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8", errors="surrogateescape") as sidecar:
+                sidecar.write(line)
+                sidecar.flush()
+                os.fsync(sidecar.fileno())
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, path)
+            with self.lock:
+                self.written += 1
+
+        except OSError as e:
+            logger.error(f"Unable to write sidecar {path}: {e}")
+            self.remove_file(temporary)
+
+    def remove_file(self, path):
+        """Remove a temporary file, ignoring one already gone."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
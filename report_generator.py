@@ -1,16 +1,26 @@
 """Markdown report generation for DPX validation results.
 
-`ReportGenerator` assembles a human‑readable Markdown summary capturing:
+`ReportGenerator` writes a human‑readable Markdown summary capturing:
     * Run timing (start, end, duration)
     * File counts (DPX vs. manifest, mag)
-    * Sequence validation (first/last frame, missing frames list)
+    * Sequence validation (first/last frame, missing frame ranges, sequences
+      rejected by the fast-fail policy)
+    * DPX structure pre-check results
     * Checksum verification results
     * File attribute (profile) validation results
+
+Each section is written to the report file as it is produced, and long
+lists (failed files, missing ranges) are written line by line, so the report
+is never held in memory as a whole however many entries it lists. File counts
+and failure lists are read from the run's `ResultStore`, which streams them
+back from SQLite.
 """
 
 import logging
 import os
 
+from validators.dpx_sequence_validator import format_frame_range
+
 logger = logging.getLogger(__name__)
 
 class ReportGenerator:
@@ -21,147 +31,152 @@ class ReportGenerator:
         start_time (datetime): Validation start timestamp.
         end_time (datetime): Validation end timestamp.
         duration (timedelta): Total run duration.
-        mag_list (list[str]): List of processed mag (WAV) file paths.
-        film_list (list[str]): List of processed DPX frame file paths.
-        manifest_files (int|list): Manifest line count or representation.
-        missing_files (list[int|str]): Identifiers of missing sequence items.
-        files_failed (list[str]): Files failing attribute/profile validation.
-        checksums_verified (list[str]): Files passing checksum validation.
-        checksums_failed (list[str]): Files failing checksum validation.
+        result_store (ResultStore): The run's recorded per-file outcomes
+            (processed mag / film files, attribute and checksum results).
+        manifest_files (int): Manifest line count.
+        missing_files (list[tuple[int, int]]): Missing frame ranges, as
+            recorded in `SequenceValidator.missing_ranges`.
     """
-    def __init__(self, write_location, start_time, end_time, duration, mag_list, film_list, manifest_files, missing_files, files_failed, checksums_verified, checksums_failed):
+    def __init__(self, write_location, start_time, end_time, duration, result_store, manifest_files, missing_files):
         self.write_location = write_location
         self.start_time = start_time
         self.end_time = end_time
         self.duration = duration
-        self.wav_files = mag_list
-        self.first_mag_file = mag_list[0].split("/")[-1]
-        self.last_mag_file = mag_list[-1].split("/")[-1]
-        self.dpx_files = film_list
-        self.first_film_file = film_list[0].split("/")[-1]
-        self.last_film_file = film_list[-1].split("/")[-1]
+        self.result_store = result_store
+        self.wav_count = result_store.count("mag")
+        self.first_mag_file = self.file_name(result_store.first_file("mag"))
+        self.last_mag_file = self.file_name(result_store.last_file("mag"))
+        self.dpx_count = result_store.count("film")
+        self.first_film_file = self.file_name(result_store.first_file("film"))
+        self.last_film_file = self.file_name(result_store.last_file("film"))
         self.manifest_files = manifest_files
         self.missing_files = missing_files
-        self.files_failed = files_failed
-        self.checksums_verified = checksums_verified
-        self.checksums_failed = checksums_failed
         # self.total_size = total_size
 
-        self.file_count_report = None
-        self.missing_sequence_report = None
-        self.file_attributes_report = None
-        self.checksum_report = None
-        self.report = None
+        self.report_file = None
+
+    def file_name(self, file):
+        """Return the basename of `file`, or None."""
+        return os.path.basename(file) if file else None
 
     def write_report(self):
-        """Write the generated Markdown report to file.
+        """Write the Markdown report, section by section, to file.
 
         Report filename pattern: <basename_of_write_location>_<end_time>.md
         """
         try:
-            report_name = f"{self.write_location.split('/')[-1]}_{self.end_time}.md"
-            with open(os.path.join(self.write_location, report_name), "w", encoding=("utf-8")) as f:
-                f.write(os.path.join(self.report))
+            report_name = f"{os.path.basename(self.write_location)}_{self.end_time}.md"
+            self.report_file = os.path.join(self.write_location, report_name)
+            with open(self.report_file, "w", encoding=("utf-8")) as report:
+                self.generate_report(report)
         except Exception as e:
             logger.error(f"Error writing report: {e}")
-    
-    def generate_report(self):
-        """Assemble the full Markdown report body in `self.report`."""
 
-        self.report = f"""
+    def generate_report(self, report):
+        """Write every report section to the open `report` file."""
+        report.write(f"""
 # DPX DATA REPORT: {self.write_location}
 
 ## Report Summary
 * Location: {self.write_location}
-* Started on {self.start_time} 
+* Started on {self.start_time}
 * Ended on {self.end_time}
 * Total duration: {self.duration}
-* Total number of files: {len(self.dpx_files) + len(self.wav_files)}
+* Total number of files: {self.dpx_count + self.wav_count}
+""")
 
-## DPX File Count
-{self.file_count_report}
+        report.write("\n## DPX File Count\n")
+        self.line_count_file_summary(report)
 
+        report.write(f"""
 ## DPX Sequence Validation
 * First file in sequence: {self.first_film_file}
 * Last file in sequence: {self.last_film_file}
-{self.missing_sequence_report}
+""")
+        self.missing_sequence_summary(report)
+        self.rejected_sequence_summary(report)
 
+        report.write("\n## DPX Structure Check\n")
+        self.structure_summary(report)
+
+        report.write(f"""
 ## Mag File Count
-Count: {len(self.wav_files)}
+Count: {self.wav_count}
 * First file in sequence: {self.first_mag_file}
 * Last file in sequence: {self.last_mag_file}
+""")
 
-## Checksum Validation
-{self.checksum_report}
-
-## File Attributes Validation
-{self.file_attributes_report}
+        report.write("\n## Checksum Validation\n")
+        self.checksum_summary(report)
 
-        """
+        report.write("\n## File Attributes Validation\n")
+        self.file_attributes_summary(report)
 
-    def line_count_file_summary(self):
-        """Build the DPX vs. manifest file count section.
+    def write_items(self, report, items):
+        """Write one Markdown bullet per item."""
+        for item in items:
+            report.write(f"* {item}\n")
 
-        Populates `file_count_report` with PASS/ERROR messaging.
-        """
-        if self.dpx_files != self.manifest_files:
-            self.file_count_report = f""" 
-* DPX files in folder: {len(self.dpx_files)}
+    def line_count_file_summary(self, report):
+        """Write the DPX vs. manifest file count section (PASS/ERROR)."""
+        report.write(f"""
+* DPX files in folder: {self.dpx_count}
 * DPX files in manifest: {self.manifest_files}
 
-ERROR: number of dpx files in folder != the number listed in the checksum mainfest
-    """
-
+""")
+        if self.dpx_count != self.manifest_files:
+            report.write("ERROR: number of dpx files in folder != the number listed in the checksum mainfest\n")
         else:
-            self.file_count_report = f"""    
-* DPX files in folder: {self.dpx_files}
-* DPX files in manifest: {self.manifest_files}
-
-PASS: number of dpx files in folder == number listed in the checksum mainfest
-    """
-
-    def missing_sequence_summary(self):
-        """Build the missing sequence frames section.
-
-        Populates `missing_sequence_report`, enumerating missing items when
-        present.
-        """
-        if self.missing_files != []:
-            self.missing_sequence_report = f"""
-ERROR: {len(self.missing_files)} missing items from file sequence.  See log for complete list.
-    """
-            for item in self.missing_files:
-                self.missing_sequence_report += f"""
-* {item}"""
+            report.write("PASS: number of dpx files in folder == number listed in the checksum mainfest\n")
+
+    def missing_sequence_summary(self, report):
+        """Write the missing sequence section, one line per missing range."""
+        if self.missing_files:
+            missing_count = sum(last - first + 1 for first, last in self.missing_files)
+            report.write(
+                f"\nERROR: {missing_count} missing items from file sequence "
+                f"in {len(self.missing_files)} ranges\n\n"
+            )
+            self.write_items(report, (format_frame_range(first, last) for first, last in self.missing_files))
         else:
-            self.missing_sequence_report = f"""
-PASS: no missing items from file sequence 
-    """
-    
-    def checksum_summary(self):
-        """Build the checksum validation section (PASS/ERROR)."""
-        if self.checksums_failed != []:
-            self.checksum_report = f"""
-ERROR: {len(self.checksums_failed)} checksums failed
-    """
-            for item in self.checksums_failed:
-                self.checksum_report += f"""
-* {item}"""
+            report.write("\nPASS: no missing items from file sequence\n")
+
+    def rejected_sequence_summary(self, report):
+        """Write the sequences rejected by the fast-fail policy, if any."""
+        sequences_rejected = self.result_store.count("sequence_rejected")
+        if sequences_rejected:
+            report.write(
+                f"\nERROR: {sequences_rejected} sequences rejected; their remaining frames were not "
+                f"validated, so the checksum and attribute results below are incomplete\n\n"
+            )
+            self.write_items(report, self.result_store.files("sequence_rejected"))
+
+    def structure_summary(self, report):
+        """Write the DPX structure pre-check section (PASS/ERROR)."""
+        structure_failed = self.result_store.count("structure_failed")
+        if structure_failed:
+            report.write(f"\nERROR: {structure_failed} frames truncated, padded or inconsistent with their header\n\n")
+            self.write_items(report, self.result_store.files("structure_failed"))
         else:
-            self.checksum_report = f"""
-PASS: all checksums verified
-    """
-    
-    def file_attributes_summary(self):
-        """Build the file attribute/profile validation section."""
-        if self.files_failed != []:
-            self.file_attributes_report = f"""
-ERROR: {len(self.files_failed)} files failed profile validation.  See log for complete list.
-    """
-            for item in self.files_failed:
-                self.file_attributes_report += f"""
-* {item}"""
+            report.write("\nPASS: all frame sizes consistent with their headers\n")
+
+    def checksum_summary(self, report):
+        """Write the checksum validation section (PASS/ERROR)."""
+        checksums_failed = self.result_store.count("checksum_failed")
+        if checksums_failed:
+            report.write(f"\nERROR: {checksums_failed} checksums failed\n\n")
+            self.write_items(report, self.result_store.files("checksum_failed"))
+        else:
+            report.write("\nPASS: all checksums verified\n")
+
+    def file_attributes_summary(self, report):
+        """Write the file attribute/profile validation section."""
+        files_failed = self.result_store.count("attributes_failed")
+        if files_failed:
+            report.write(
+                f"\nERROR: {files_failed} files failed profile validation.  "
+                f"See log for complete list.\n\n"
+            )
+            self.write_items(report, self.result_store.files("attributes_failed"))
         else:
-            self.file_attributes_report = f"""
-PASS: all files passed format profile validation
-    """
\ No newline at end of file
+            report.write("\nPASS: all files passed format profile validation\n")
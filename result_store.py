@@ -0,0 +1,246 @@
+"""Compact, disk-backed store of per-file validation outcomes.
+
+This module defines `ResultStore`, which records the run's per-file results
+(files processed, attribute failures, header outliers, checksum verdicts,
+missing sidecars, and the directories failing the sequence check) without holding a path string per file. Each file name is split into an
+interned template (directory, prefix, frame token width, suffix) and an
+integer frame number:
+
+    /mnt/reel/BL_R_S1_F1_V1_00086400.dpx -> template 3, frame 86400
+
+so a million frames of one sequence cost one template plus a million
+integers. Outcomes are buffered in typed arrays and spilled to a local SQLite
+file every `SPILL_SIZE` entries, so memory stays flat however large the run;
+counts are kept in memory for the summary. The database is left in
+`./results` after the run and can be queried directly, e.g.:
+
+    SELECT path FROM result_paths WHERE kind = 'checksum_failed';
+
+The store is opened lazily, once per process, by `get_result_store`.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from datetime import datetime
+
+import config
+
+logger = logging.getLogger(__name__)
+
+result_store = None
+
+# Outcome kinds, stored by index
+kinds = (
+    "mag",
+    "film",
+    "attributes_failed",
+    "header_outlier",
+    "checksum_verified",
+    "checksum_failed",
+    "sequence_failed",
+    "checksum_missing",
+    "structure_failed",
+    "sequence_rejected",
+)
+
+# <prefix><digits><suffix>: the trailing number before the extension
+name_pattern = re.compile(r"^(.*?)(\d{1,18})(\.[^.]*)$")
+
+schema = """
+CREATE TABLE IF NOT EXISTS kinds (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS templates (
+    id INTEGER PRIMARY KEY,
+    directory TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    suffix TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    kind INTEGER NOT NULL,
+    template INTEGER NOT NULL,
+    frame INTEGER NOT NULL
+);
+CREATE VIEW IF NOT EXISTS result_paths AS
+SELECT kinds.name AS kind,
+       templates.directory || '/' || templates.prefix
+       || CASE WHEN results.frame < 0 THEN '' ELSE printf('%0' || templates.width || 'd', results.frame) END
+       || templates.suffix AS path
+FROM results
+JOIN kinds ON kinds.id = results.kind
+JOIN templates ON templates.id = results.template;
+"""
+
+select_files = (
+    "SELECT templates.directory, templates.prefix, templates.width, templates.suffix, "
+    "results.frame FROM results JOIN templates ON templates.id = results.template "
+    "WHERE results.kind = ?"
+)
+
+
+def get_result_store():
+    """Return this process's `ResultStore`, opening it on first use."""
+    global result_store
+
+    if result_store is None:
+        result_store = ResultStore()
+        result_store.open_store()
+
+    return result_store
+
+
+def close_result_store():
+    """Flush and close this process's store, if open."""
+    global result_store
+
+    if result_store is not None:
+        result_store.close_store()
+    result_store = None
+
+
+class ResultStore:
+    """Record per-file outcomes as interned templates and frame numbers.
+
+    Args:
+        store_file (str, optional): SQLite database path. Defaults to
+            `<DIRECTORY>/<timestamp>_dpx_results.sqlite`.
+
+    Attributes:
+        counts (dict[str, int]): Outcome kind -> number of files recorded.
+    """
+    def __init__(self, store_file=None):
+
+        results_config = config.CONFIG["results"]
+        directory = results_config["DIRECTORY"] or os.path.join(os.getcwd(), "results")
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.store_file = store_file or os.path.join(directory, f"{timestamp}_dpx_results.sqlite")
+        self.spill_size = results_config["SPILL_SIZE"]
+        self.connection = None
+        self.lock = threading.Lock()
+        self.templates = {}
+        self.pending_templates = []
+        self.pending_kinds = array("b")
+        self.pending_template_ids = array("l")
+        self.pending_frames = array("q")
+        self.counts = {kind: 0 for kind in kinds}
+
+    def open_store(self):
+        """Create the SQLite database and its tables."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.store_file)), exist_ok=True)
+        self.connection = sqlite3.connect(self.store_file, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.executescript(schema)
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO kinds VALUES (?, ?)", list(enumerate(kinds))
+        )
+        self.connection.commit()
+
+    def close_store(self):
+        """Spill buffered outcomes and close the database."""
+        if self.connection is not None:
+            with self.lock:
+                self.spill()
+            self.connection.close()
+            self.connection = None
+
+    def intern_file(self, file):
+        """Return (template id, frame number) for a file path.
+
+        Names without a trailing number before the extension are stored
+        whole as the template prefix, with frame -1.
+        """
+        directory, name = os.path.split(file)
+        match = name_pattern.match(name)
+        if match:
+            prefix, digits, suffix = match.groups()
+            key = (directory, prefix, len(digits), suffix)
+            frame = int(digits)
+        else:
+            key = (directory, name, 0, "")
+            frame = -1
+
+        template = self.templates.get(key)
+        if template is None:
+            template = self.templates[key] = len(self.templates)
+            self.pending_templates.append((template, *key))
+
+        return template, frame
+
+    def template_path(self, template, frame):
+        """Rebuild a file path from its template row and frame number."""
+        directory, prefix, width, suffix = template
+        number = "" if frame < 0 else f"{frame:0{width}d}"
+        return os.path.join(directory, f"{prefix}{number}{suffix}")
+
+    def add(self, kind, files):
+        """Record `files` under outcome `kind`.
+
+        Args:
+            kind (str): One of `kinds`.
+            files (Iterable[str]): File paths.
+        """
+        kind_id = kinds.index(kind)
+        with self.lock:
+            for file in files:
+                template, frame = self.intern_file(file)
+                self.pending_kinds.append(kind_id)
+                self.pending_template_ids.append(template)
+                self.pending_frames.append(frame)
+                self.counts[kind] += 1
+                if len(self.pending_frames) >= self.spill_size:
+                    self.spill()
+
+    def spill(self):
+        """Write buffered templates and outcomes to SQLite (lock held)."""
+        if self.pending_templates:
+            self.connection.executemany(
+                "INSERT INTO templates VALUES (?, ?, ?, ?, ?)", self.pending_templates
+            )
+            self.pending_templates = []
+
+        if self.pending_frames:
+            self.connection.executemany(
+                "INSERT INTO results VALUES (?, ?, ?)",
+                zip(self.pending_kinds, self.pending_template_ids, self.pending_frames),
+            )
+            self.pending_kinds = array("b")
+            self.pending_template_ids = array("l")
+            self.pending_frames = array("q")
+
+        self.connection.commit()
+
+    def count(self, kind):
+        """Return the number of files recorded under `kind`."""
+        return self.counts[kind]
+
+    def files(self, kind):
+        """Yield the file paths recorded under `kind`, in recording order."""
+        with self.lock:
+            self.spill()
+            cursor = self.connection.execute(
+                f"{select_files} ORDER BY results.rowid", (kinds.index(kind),)
+            )
+
+        for *template, frame in cursor:
+            yield self.template_path(template, frame)
+
+    def first_file(self, kind):
+        """Return the first file recorded under `kind`, or None."""
+        return next(self.files(kind), None)
+
+    def last_file(self, kind):
+        """Return the last file recorded under `kind`, or None."""
+        with self.lock:
+            self.spill()
+            row = self.connection.execute(
+                f"{select_files} ORDER BY results.rowid DESC LIMIT 1", (kinds.index(kind),)
+            ).fetchone()
+
+        return self.template_path(row[:4], row[4]) if row else None
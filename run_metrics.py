@@ -0,0 +1,332 @@
+"""Per-stage run instrumentation.
+
+This module defines `RunMetrics`, which collects for each stage of a run:
+
+    * wall time (first start to last finish) and busy time (sum of per-file
+      durations, which exceeds wall time when a stage runs concurrently)
+    * bytes processed and file count
+    * a latency histogram of the per-file (or per-batch) durations
+
+plus the peak resident set size of the process and of its children
+(MediaInfo, process workers). Stages are recorded by the code doing the work
+through `observe_stage`:
+
+    started = time.perf_counter()
+    ...
+    observe_stage("hashing", started, bytes_processed=n)
+
+At the end of a run `write_metrics` saves a JSON document under
+`./metrics` and a Prometheus textfile‑collector file (written atomically so
+the node exporter never reads a partial file). Settings live in
+`config.CONFIG["metrics"]`.
+
+Optional profiling for a single run: `PROFILE` runs cProfile over the main
+thread and every thread started after it (pipeline stages, scheduler and
+pool workers) and dumps the merged stats next to the JSON; `TRACE_MEMORY`
+enables tracemalloc and adds the largest allocation sites to the JSON.
+
+Metrics are kept per process; stages run inside `EXECUTOR = "process"`
+workers are only reflected in the parent's wall time and byte counts.
+"""
+
+import bisect
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import config
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+run_metrics = None
+run_metrics_pid = None
+
+
+def get_run_metrics():
+    """Return this process's `RunMetrics`, or None when disabled."""
+    global run_metrics, run_metrics_pid
+
+    if not config.CONFIG["metrics"]["ENABLED"]:
+        return None
+
+    if run_metrics is None or run_metrics_pid != os.getpid():
+        run_metrics = RunMetrics()
+        run_metrics_pid = os.getpid()
+
+    return run_metrics
+
+
+def observe_stage(stage, started, bytes_processed=0, files=1):
+    """Record one unit of work for `stage` when metrics are enabled.
+
+    Args:
+        stage (str): Stage name, e.g. "hashing".
+        started (float): `time.perf_counter()` value taken when the work began.
+        bytes_processed (int): Bytes read or hashed.
+        files (int): Files covered by this unit of work.
+    """
+    metrics = get_run_metrics()
+    if metrics is not None:
+        metrics.observe(stage, started, time.perf_counter(), bytes_processed, files)
+
+
+def peak_rss_bytes(who):
+    """Return the peak RSS in bytes for `who` (RUSAGE_SELF / RUSAGE_CHILDREN).
+
+    Returns None where the `resource` module is unavailable (Windows).
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageMetrics:
+    """Counters and latency histogram for a single stage.
+
+    Args:
+        buckets (list[float]): Histogram upper bounds in seconds.
+    """
+    def __init__(self, buckets):
+
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.observations = 0
+        self.files = 0
+        self.bytes_processed = 0
+        self.busy_seconds = 0.0
+        self.max_seconds = 0.0
+        self.first_start = None
+        self.last_end = None
+
+    def observe(self, started, finished, bytes_processed, files):
+        """Add one observation."""
+        duration = finished - started
+        self.bucket_counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.observations += 1
+        self.files += files
+        self.bytes_processed += bytes_processed
+        self.busy_seconds += duration
+        self.max_seconds = max(self.max_seconds, duration)
+        self.first_start = started if self.first_start is None else min(self.first_start, started)
+        self.last_end = finished if self.last_end is None else max(self.last_end, finished)
+
+    def wall_seconds(self):
+        """Return the time from the first start to the last finish."""
+        if self.first_start is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    def summary(self):
+        """Return the stage as a JSON-serialisable dict."""
+        wall = self.wall_seconds()
+        return {
+            "wall_seconds": round(wall, 6),
+            "busy_seconds": round(self.busy_seconds, 6),
+            "files": self.files,
+            "bytes": self.bytes_processed,
+            "files_per_second": round(self.files / wall, 3) if wall else None,
+            "mb_per_second": round(self.bytes_processed / wall / 1e6, 3) if wall and self.bytes_processed else None,
+            "latency": {
+                "count": self.observations,
+                "mean_seconds": round(self.busy_seconds / self.observations, 6) if self.observations else None,
+                "max_seconds": round(self.max_seconds, 6),
+                "buckets": {
+                    **{str(bound): count for bound, count in zip(self.buckets, self.bucket_counts)},
+                    "+Inf": self.bucket_counts[-1],
+                },
+            },
+        }
+
+
+class RunMetrics:
+    """Collect stage metrics for one run and export them.
+
+    Attributes:
+        stages (dict[str, StageMetrics]): Stage name -> metrics, in the order
+            stages were first observed.
+    """
+    def __init__(self):
+
+        metrics_config = config.CONFIG["metrics"]
+        self.directory = metrics_config["DIRECTORY"] or os.path.join(os.getcwd(), "metrics")
+        self.prometheus_file = metrics_config["PROMETHEUS_FILE"] or os.path.join(
+            self.directory, "dpx_validation.prom"
+        )
+        self.buckets = sorted(metrics_config["LATENCY_BUCKETS"])
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.profiler = None
+        self.thread_profilers = []
+
+    def observe(self, stage, started, finished, bytes_processed=0, files=1):
+        """Record one unit of work for `stage`."""
+        with self.lock:
+            stage_metrics = self.stages.get(stage)
+            if stage_metrics is None:
+                stage_metrics = self.stages[stage] = StageMetrics(self.buckets)
+            stage_metrics.observe(started, finished, bytes_processed, files)
+
+    def start_profiling(self):
+        """Start cProfile and/or tracemalloc if configured for this run."""
+        metrics_config = config.CONFIG["metrics"]
+        if metrics_config["TRACE_MEMORY"]:
+            tracemalloc.start()
+        if metrics_config["PROFILE"]:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            # From 3.12 cProfile sees every thread; before, only the one
+            # that enabled it, so each new thread gets its own profiler
+            if sys.version_info < (3, 12):
+                threading.setprofile(self.profile_thread)
+
+    def profile_thread(self, frame, event, arg):
+        """Start a cProfile profiler on a newly started thread (setprofile hook)."""
+        profiler = cProfile.Profile()
+        with self.lock:
+            self.thread_profilers.append(profiler)
+        profiler.enable()
+
+    def stop_profiling(self):
+        """Stop profiling, writing cProfile stats; returns tracemalloc results."""
+        if self.profiler is not None:
+            threading.setprofile(None)
+            self.profiler.disable()
+            stats = pstats.Stats(self.profiler)
+            with self.lock:
+                thread_profilers, self.thread_profilers = self.thread_profilers, []
+            for profiler in thread_profilers:
+                stats.add(profiler)
+
+            profile_file = os.path.join(self.directory, f"{self.timestamp}_dpx_profile.prof")
+            stats.dump_stats(profile_file)
+            logger.info(f"cProfile stats written to {profile_file} ({len(thread_profilers) + 1} threads)")
+            self.profiler = None
+
+        if not tracemalloc.is_tracing():
+            return None
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top_allocations": [
+                {"location": str(statistic.traceback), "bytes": statistic.size, "blocks": statistic.count}
+                for statistic in snapshot.statistics("lineno")[:25]
+            ],
+        }
+
+    def summary(self):
+        """Return the run's metrics as a JSON-serialisable dict."""
+        with self.lock:
+            stages = {stage: stage_metrics.summary() for stage, stage_metrics in self.stages.items()}
+
+        return {
+            "timestamp": self.timestamp,
+            "run_seconds": round(time.perf_counter() - self.started, 6),
+            "peak_rss_bytes": peak_rss_bytes(resource.RUSAGE_SELF) if resource else None,
+            "peak_rss_children_bytes": peak_rss_bytes(resource.RUSAGE_CHILDREN) if resource else None,
+            "stages": stages,
+        }
+
+    def prometheus_text(self, summary):
+        """Format a summary in the Prometheus text exposition format."""
+        lines = [
+            "# HELP dpx_validation_run_seconds Wall time of the last validation run.",
+            "# TYPE dpx_validation_run_seconds gauge",
+            f"dpx_validation_run_seconds {summary['run_seconds']}",
+        ]
+        if summary["peak_rss_bytes"] is not None:
+            lines += [
+                "# HELP dpx_validation_peak_rss_bytes Peak resident set size.",
+                "# TYPE dpx_validation_peak_rss_bytes gauge",
+                f'dpx_validation_peak_rss_bytes{{process="self"}} {summary["peak_rss_bytes"]}',
+                f'dpx_validation_peak_rss_bytes{{process="children"}} {summary["peak_rss_children_bytes"]}',
+            ]
+
+        gauges = [
+            ("stage_wall_seconds", "wall_seconds", "Wall time per stage."),
+            ("stage_busy_seconds", "busy_seconds", "Summed per-file time per stage."),
+            ("stage_files", "files", "Files processed per stage."),
+            ("stage_bytes", "bytes", "Bytes processed per stage."),
+        ]
+        for metric, key, description in gauges:
+            lines += [
+                f"# HELP dpx_validation_{metric} {description}",
+                f"# TYPE dpx_validation_{metric} gauge",
+            ]
+            lines += [
+                f'dpx_validation_{metric}{{stage="{stage}"}} {values[key]}'
+                for stage, values in summary["stages"].items()
+            ]
+
+        lines += [
+            "# HELP dpx_validation_stage_latency_seconds Per-file latency per stage.",
+            "# TYPE dpx_validation_stage_latency_seconds histogram",
+        ]
+        for stage, values in summary["stages"].items():
+            cumulative = 0
+            for bound, count in values["latency"]["buckets"].items():
+                cumulative += count
+                lines.append(
+                    f'dpx_validation_stage_latency_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'dpx_validation_stage_latency_seconds_sum{{stage="{stage}"}} {values["busy_seconds"]}')
+            lines.append(f'dpx_validation_stage_latency_seconds_count{{stage="{stage}"}} {values["latency"]["count"]}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path, text):
+        """Write `text` to `path` atomically (temporary file + rename)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".metrics_")
+        try:
+            with os.fdopen(descriptor, "w") as f:
+                f.write(text)
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, path)
+        except OSError:
+            os.unlink(temporary)
+            raise
+
+    def write_metrics(self):
+        """Stop any profiling and write the JSON and Prometheus files.
+
+        Returns:
+            dict: The summary that was written.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        memory_trace = self.stop_profiling()
+        summary = self.summary()
+        if memory_trace is not None:
+            summary["tracemalloc"] = memory_trace
+
+        try:
+            json_file = os.path.join(self.directory, f"{self.timestamp}_dpx_metrics.json")
+            self.write_file(json_file, json.dumps(summary, indent=4))
+            self.write_file(self.prometheus_file, self.prometheus_text(summary))
+            logger.info(f"Run metrics written to {json_file} and {self.prometheus_file}")
+        except OSError as e:
+            logger.error(f"Unable to write run metrics: {e}")
+
+        return summary
@@ -0,0 +1,314 @@
+"""Persistent validation result cache.
+
+This module defines `ValidationCache`, a local SQLite store of per-file
+results keyed on file identity (path, size, mtime_ns, inode):
+
+    checksums:  computed digest per hash algorithm (`ChecksumValidator`)
+    attributes: attribute verdict per validation profile (`FileValidator`)
+
+A file whose identity is unchanged since its result was stored can be served
+from the cache instead of being re-read, so re-validating a delivery after
+one reel is replaced only costs the changed files. Cached results are only
+served when `TRUST_CACHE` is enabled (`--trust-cache`); otherwise
+(`--verify-all`) everything is recomputed and the cache refreshed.
+
+Attribute verdicts are stored against a fingerprint of the validation maps
+and the WAV backend (the native one also checks the data length), so
+changing the expected profile invalidates them automatically. Entries are
+evicted at the end of a run by age (`MAX_AGE_DAYS`), by number of entries
+per table (`MAX_ENTRIES`) and by database size (`MAX_SIZE_MB`), oldest
+first.
+
+The cache is only an optimisation: an SQLite error (database locked by
+another process, disk full, corrupt file) is logged once and the lookup
+treated as a miss, the store skipped.
+
+The cache is opened lazily, once per process, by `get_validation_cache`;
+it returns None when caching is disabled.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import config
+from data.file_attributes_model import dpx_validation_map, wav_validation_map
+
+logger = logging.getLogger(__name__)
+
+validation_cache = None
+validation_cache_pid = None
+
+schema = """
+CREATE TABLE IF NOT EXISTS checksums (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (path, algorithm)
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    path TEXT NOT NULL PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    profile TEXT NOT NULL,
+    format_verified INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checksums_updated ON checksums (updated);
+CREATE INDEX IF NOT EXISTS attributes_updated ON attributes (updated);
+"""
+
+
+def profile_fingerprint():
+    """Return a short hash of the attribute validation maps and WAV backend."""
+    maps = json.dumps(
+        [dpx_validation_map, wav_validation_map, config.CONFIG["attributes"]["WAV_BACKEND"]], sort_keys=True
+    )
+    return hashlib.md5(maps.encode("utf-8")).hexdigest()
+
+
+def get_validation_cache():
+    """Return this process's `ValidationCache`, or None when disabled.
+
+    The cache is opened on first use in each process (thread and process
+    workers alike) and reused afterwards.
+    """
+    global validation_cache, validation_cache_pid
+
+    if not config.CONFIG["cache"]["ENABLED"]:
+        return None
+
+    if validation_cache is None or validation_cache_pid != os.getpid():
+        validation_cache = ValidationCache()
+        validation_cache.open_cache()
+        validation_cache_pid = os.getpid()
+
+    return validation_cache
+
+
+def close_validation_cache():
+    """Evict expired entries and close this process's cache, if open."""
+    global validation_cache
+
+    if validation_cache is not None and validation_cache_pid == os.getpid():
+        validation_cache.evict_entries()
+        validation_cache.close_cache()
+    validation_cache = None
+
+
+class ValidationCache:
+    """SQLite-backed store of digests and attribute verdicts.
+
+    Args:
+        cache_file (str, optional): SQLite database path. Defaults to the
+            configured `PATH`, or `./cache/validation_cache.sqlite`.
+    """
+    def __init__(self, cache_file=None):
+
+        cache_config = config.CONFIG["cache"]
+        self.cache_file = cache_file or cache_config["PATH"] or os.path.join(
+            os.getcwd(), "cache", "validation_cache.sqlite"
+        )
+        self.trusted = cache_config["TRUST_CACHE"]
+        self.profile = profile_fingerprint()
+        self.connection = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.error_logged = False
+
+    def open_cache(self):
+        """Open (creating if needed) the SQLite database.
+
+        The cache stays closed, every lookup a miss, when it cannot be
+        opened.
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            self.connection = sqlite3.connect(
+                self.cache_file, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(schema)
+
+        except (sqlite3.Error, OSError) as e:
+            self.cache_error(e)
+            self.close_cache()
+
+    def cache_error(self, e):
+        """Log the first SQLite error of the run; later ones are ignored."""
+        if not self.error_logged:
+            self.error_logged = True
+            logger.warning(f"Validation cache {self.cache_file} unavailable, continuing without it: {e}")
+
+    def close_cache(self):
+        """Close the database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def file_identity(self, file):
+        """Return (path, size, mtime_ns, inode) for `file`, or None if unreadable."""
+        try:
+            stat = os.stat(file)
+        except OSError as e:
+            logger.error(f"{file}, {e}")
+            return None
+
+        return os.path.abspath(file), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def get_checksum(self, file, algorithm):
+        """Return the cached digest for an unchanged file, or None.
+
+        Always returns None unless the cache is trusted.
+        """
+        if not self.trusted or self.connection is None:
+            return None
+
+        identity = self.file_identity(file)
+        if identity is None:
+            return None
+
+        row = self.execute(
+            "SELECT digest FROM checksums WHERE path = ? AND algorithm = ? "
+            "AND size = ? AND mtime_ns = ? AND inode = ?",
+            (identity[0], algorithm, *identity[1:]),
+        )
+
+        self.record_lookup(row)
+        return row[0] if row else None
+
+    def store_checksum(self, file, algorithm, digest):
+        """Store a computed digest against the file's current identity."""
+        if self.connection is None:
+            return
+
+        identity = self.file_identity(file)
+        if identity is None or digest is None:
+            return
+
+        self.execute(
+            "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (identity[0], algorithm, *identity[1:], digest, time.time()),
+        )
+
+    def get_attributes(self, file):
+        """Return the cached attribute verdict (bool) for an unchanged file, or None.
+
+        Always returns None unless the cache is trusted.
+        """
+        if not self.trusted or self.connection is None:
+            return None
+
+        identity = self.file_identity(file)
+        if identity is None:
+            return None
+
+        row = self.execute(
+            "SELECT format_verified FROM attributes WHERE path = ? AND profile = ? "
+            "AND size = ? AND mtime_ns = ? AND inode = ?",
+            (identity[0], self.profile, *identity[1:]),
+        )
+
+        self.record_lookup(row)
+        return bool(row[0]) if row else None
+
+    def store_attributes(self, file, format_verified):
+        """Store an attribute verdict against the file's current identity."""
+        if self.connection is None:
+            return
+
+        identity = self.file_identity(file)
+        if identity is None:
+            return
+
+        self.execute(
+            "INSERT OR REPLACE INTO attributes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*identity, self.profile, int(format_verified), time.time()),
+        )
+
+    def execute(self, statement, parameters=()):
+        """Run one statement, returning its first row.
+
+        Returns:
+            tuple | None: The first result row; None when there is none or
+            the statement failed with an SQLite error.
+        """
+        try:
+            with self.lock:
+                return self.connection.execute(statement, parameters).fetchone()
+        except sqlite3.Error as e:
+            self.cache_error(e)
+            return None
+
+    def record_lookup(self, row):
+        """Count cache hits and misses for the run summary."""
+        if row:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def evict_entries(self):
+        """Delete entries older than `MAX_AGE_DAYS`, beyond `MAX_ENTRIES`, then beyond `MAX_SIZE_MB`."""
+        if self.connection is None:
+            return
+
+        cache_config = config.CONFIG["cache"]
+        oldest = time.time() - cache_config["MAX_AGE_DAYS"] * 86400
+
+        for table in ("checksums", "attributes"):
+            self.execute(f"DELETE FROM {table} WHERE updated < ?", (oldest,))
+            self.execute(
+                f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} "
+                f"ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+                (cache_config["MAX_ENTRIES"],),
+            )
+
+        if cache_config["MAX_SIZE_MB"]:
+            self.evict_to_size(cache_config["MAX_SIZE_MB"] * 1024 * 1024)
+
+    def database_size(self):
+        """Return the bytes of database pages in use, or None on error."""
+        page_count = self.execute("PRAGMA page_count")
+        freelist_count = self.execute("PRAGMA freelist_count")
+        page_size = self.execute("PRAGMA page_size")
+        if None in (page_count, freelist_count, page_size):
+            return None
+        return (page_count[0] - freelist_count[0]) * page_size[0]
+
+    def evict_to_size(self, max_size):
+        """Delete the oldest entries until the database fits `max_size` bytes.
+
+        Entries are removed in proportion to the excess, a few rounds at
+        most, then the file is compacted so it shrinks on disk.
+        """
+        evicted = False
+        for _ in range(4):
+            size = self.database_size()
+            if size is None or size <= max_size:
+                break
+            keep = max_size / size
+            for table in ("checksums", "attributes"):
+                count = self.execute(f"SELECT COUNT(*) FROM {table}")
+                if count is None:
+                    return
+                self.execute(
+                    f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} "
+                    f"ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+                    (int(count[0] * keep * 0.9),),
+                )
+            evicted = True
+
+        if evicted:
+            self.execute("VACUUM")
+            self.execute("PRAGMA wal_checkpoint(TRUNCATE)")
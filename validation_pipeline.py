@@ -0,0 +1,463 @@
+"""Streaming validation pipeline.
+
+This module defines `ValidationPipeline`, which runs the validation phase as
+a set of concurrent stages connected by bounded queues, so that reading,
+hashing and attribute checks overlap instead of running as consecutive
+per-directory passes:
+
+    discovery   Feeds the directory plans built by `FileDiscovery`.
+    sequence    Per directory: manifest index, line count, frame gap and
+                DPX structure checks and batched MediaInfo reads (via the
+                service's `prepare_directory` callback), then one task per
+                file, the fast-fail sample frames of each sequence first.
+    read        Streams each file to be hashed once through `FileReadEngine`;
+                the first buffer goes to the attribute stage, every buffer to
+                the hash stage. A file verified from the validation cache is
+                not read here; its attributes come from the cache or, if
+                not cached, from the header alone.
+    hash        Digests the buffers of each file and compares the result
+                with the manifest / sidecar (`ChecksumValidator`).
+    attributes  Validates technical attributes (`FileValidator`), from the
+                header captured by the read stage where possible.
+    sink        Records every verdict through the `record_result` callback
+                as soon as it is available, and calls `finish_directory`
+                once the last verdict of a directory is in, so each
+                directory is completed (journaled, manifests written) as it
+                finishes rather than at the end of the run.
+
+Once `ValidationPolicy` rejects a sequence, the read stage skips its frames
+still queued, so only the frames already in flight are validated.
+
+Each stage's concurrency is configured in `config.CONFIG["pipeline"]`. Every
+queue is bounded (`QUEUE_SIZE`), so a full downstream stage blocks its
+producers. File content is read into a fixed `BufferPool` of `BUFFER_POOL`
+buffers that are handed to the hash stage without copying and returned once
+digested, so buffer memory stays bounded by `BUFFER_POOL * BUFFER_SIZE`
+however long the sequences are and however many directories are in flight. A hash worker receives all buffers of a given file, in order, because
+files are assigned to hash workers by task number.
+
+With a `DirectoryScheduler`, one pipeline serves every directory of the run:
+the scheduler admits directories within its total and per-volume caps, and
+each finished directory frees a slot for the next, so validating several
+reels at once does not multiply the stages, queues or buffer pool.
+
+An unexpected error while handling a file (e.g. a locked cache database)
+fails that file's verdict instead of stopping its stage thread, so every
+queue keeps draining and the run always finishes.
+"""
+
+import logging
+import queue
+import sys
+import threading
+
+import config
+from validators.checksum_validator import ChecksumValidator
+from validators.dpx_header_reader import HEADER_SIZE
+from validators.file_attributes_validator import FileValidator
+from validators.read_engine import BufferPool, FileReadEngine
+from validation_policy import get_validation_policy
+
+logger = logging.getLogger(__name__)
+
+STOP = object()
+
+
+class FileTask:
+    """A single file travelling through the pipeline.
+
+    Args:
+        number (int): Sequential task number (selects the hash worker).
+        file (str): Path to the file.
+        checksum_file (str | None): Manifest or sidecar; None skips hashing.
+        manifest_index (ChecksumManifest, optional): Shared parsed manifest;
+            a mag file's sidecar index is added by the read stage.
+        file_attributes (bytes, optional): MediaInfo JSON prefetched for the
+            file.
+        dirpath (str, optional): Directory (plan) the file belongs to.
+
+    Attributes:
+        remaining (int): Verdicts still to be recorded, one checksum (or
+            missing checksum) and one attributes verdict.
+    """
+    def __init__(self, number, file, checksum_file, manifest_index=None, file_attributes=None, dirpath=None):
+
+        self.number = number
+        self.file = file
+        self.dirpath = dirpath
+        self.remaining = 2
+        self.checksum_file = checksum_file
+        self.manifest_index = manifest_index
+        self.file_attributes = file_attributes
+        self.header = None
+
+
+class ValidationPipeline:
+    """Run the validation phase as bounded, concurrent stages.
+
+    Args:
+        plans (list[DirectoryPlan]): Directories to validate.
+        prepare_directory (callable): Called once per plan by the sequence
+            stage; returns `(checksum_file, manifest_index, file_attributes)`:
+            the manifest and index for the plan's DPX frames (None when it
+            has none) and the MediaInfo JSON prefetched by file.
+        record_result (callable): Called by the sink with
+            `(kind, file, verified)`, kind being "attributes" or "checksum";
+            computed checksums add the digests, `(kind, file, verified,
+            digests)`.
+        desc (str): Progress bar label.
+        finish_directory (callable, optional): Called by the sink with a plan
+            once every verdict of its files has been recorded.
+        scheduler (DirectoryScheduler, optional): Admits directories to the
+            pipeline within its total and per-volume caps; without one every
+            plan is queued at once.
+    """
+    def __init__(
+        self, plans, prepare_directory, record_result, desc="Validation", finish_directory=None, scheduler=None
+    ):
+
+        pipeline_config = config.CONFIG["pipeline"]
+        self.plans = plans
+        self.prepare_directory = prepare_directory
+        self.record_result = record_result
+        self.desc = desc
+        self.finish_directory = finish_directory
+        self.scheduler = scheduler
+        self.sequence_workers = pipeline_config["SEQUENCE_WORKERS"]
+        if scheduler is not None:
+            # One sequence worker per admitted directory, so their tasks interleave
+            self.sequence_workers = max(self.sequence_workers, scheduler.max_directories)
+        self.read_workers = pipeline_config["READ_WORKERS"]
+        self.hash_workers = pipeline_config["HASH_WORKERS"]
+        self.attribute_workers = pipeline_config["ATTRIBUTE_WORKERS"]
+        queue_size = pipeline_config["QUEUE_SIZE"]
+
+        self.directory_queue = queue.Queue(maxsize=queue_size)
+        self.read_queue = queue.Queue(maxsize=queue_size)
+        self.hash_queues = [queue.Queue(maxsize=queue_size) for _ in range(self.hash_workers)]
+        self.attribute_queue = queue.Queue(maxsize=queue_size)
+        self.result_queue = queue.Queue(maxsize=queue_size)
+        self.finished_directories = queue.Queue()
+        self.buffer_pool = BufferPool(pipeline_config["BUFFER_POOL"], config.CONFIG["checksums"]["BUFFER_SIZE"])
+
+        self.task_count = 0
+        self.task_lock = threading.Lock()
+        # Directory path -> (plan, tasks not yet finished + 1 until all are queued)
+        self.directories = {}
+        self.fatal_error = False
+        self.native_dpx = config.CONFIG["attributes"]["DPX_BACKEND"] == "native"
+
+    def next_task(self, file, checksum_file, manifest_index=None, file_attributes=None, dirpath=None):
+        """Create a `FileTask` with the next sequential task number."""
+        with self.task_lock:
+            self.task_count += 1
+            return FileTask(self.task_count, file, checksum_file, manifest_index, file_attributes, dirpath)
+
+    def put_result(self, task, *result):
+        """Queue a verdict of `task` for the sink."""
+        self.result_queue.put((task, result))
+
+    def start_stage(self, target, count, *args):
+        """Start `count` daemon threads running `target`."""
+        threads = [threading.Thread(target=target, args=args, daemon=True) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def stop_stage(self, threads, stage_queues, count=None):
+        """Wait for upstream threads, then send STOP to a downstream stage."""
+        for thread in threads:
+            thread.join()
+        for stage_queue in stage_queues:
+            for _ in range(count or 1):
+                stage_queue.put(STOP)
+
+    def run(self):
+        """Run every stage to completion.
+
+        A fatal error in a stage (e.g. MediaInfo missing) stops further file
+        reads; the remaining tasks drain as failures and the process exits
+        once the pipeline has stopped, as the sequential loop would.
+        """
+        total_files = sum(
+            len(plan.pending_files(plan.mag_files)) + len(plan.pending_files(plan.film_files))
+            for plan in self.plans
+        )
+
+        sink = self.start_stage(self.sink_stage, 1, total_files)
+        attributes = self.start_stage(self.attribute_stage, self.attribute_workers)
+        hashers = [
+            threading.Thread(target=self.hash_stage, args=(hash_queue,), daemon=True)
+            for hash_queue in self.hash_queues
+        ]
+        for thread in hashers:
+            thread.start()
+        readers = self.start_stage(self.read_stage, self.read_workers)
+        sequencers = self.start_stage(self.sequence_stage, self.sequence_workers)
+
+        self.feed_directories()
+
+        self.stop_stage([], [self.directory_queue], self.sequence_workers)
+        self.stop_stage(sequencers, [self.read_queue], self.read_workers)
+        self.stop_stage(readers, self.hash_queues)
+        self.stop_stage([], [self.attribute_queue], self.attribute_workers)
+        self.stop_stage(hashers + attributes, [self.result_queue])
+        for thread in sink:
+            thread.join()
+        self.buffer_pool.close()
+
+        if self.fatal_error:
+            sys.exit(1)
+
+    def feed_directories(self):
+        """Queue the plans for the sequence stage.
+
+        With a scheduler a directory is admitted only while the total and
+        its volume have a free slot; a slot frees when the sink finishes a
+        directory. After a fatal error no further directory is admitted.
+        """
+        if self.scheduler is None:
+            for plan in self.plans:
+                self.directory_queue.put(plan)
+            return
+
+        self.scheduler.group_by_volume()
+        running = 0
+        while True:
+            for plan in self.scheduler.next_plans(running):
+                running += 1
+                self.directory_queue.put(plan)
+            if not running or self.fatal_error:
+                return
+
+            try:
+                plan = self.finished_directories.get(timeout=1)
+            except queue.Empty:
+                continue
+            self.scheduler.directory_finished(plan)
+            running -= 1
+
+    def sequence_stage(self):
+        """Prepare each directory and emit one task per file still to validate."""
+        while (plan := self.directory_queue.get()) is not STOP:
+            try:
+                checksum_file, manifest_index, file_attributes = self.prepare_directory(plan)
+            except Exception as e:
+                logger.critical(f"Error preparing {plan.dirpath}: {e}")
+                checksum_file, manifest_index, file_attributes = None, None, {}
+
+            mag_files = plan.pending_files(plan.mag_files)
+            film_files = plan.pending_files(plan.film_files)
+            self.directories[plan.dirpath] = [plan, len(mag_files) + len(film_files) + 1]
+
+            for file in mag_files:
+                checksum_file_for_mag = plan.sidecars.get(file)
+                task = self.next_task(
+                    file, checksum_file_for_mag, file_attributes=file_attributes.get(file), dirpath=plan.dirpath
+                )
+                if checksum_file_for_mag is None:
+                    logger.error(f"No checksum file for {file}")
+                    self.put_result(task, "checksum_missing", file, False)
+                self.read_queue.put(task)
+
+            validation_policy = get_validation_policy()
+            if validation_policy is not None:
+                film_files = validation_policy.order_files(plan.dirpath, film_files)
+            for file in film_files:
+                task = self.next_task(file, checksum_file, manifest_index, file_attributes.get(file), plan.dirpath)
+                if checksum_file is None:
+                    self.put_result(task, "checksum", file, False)
+                self.read_queue.put(task)
+
+            # Every task is queued: the directory may now finish
+            self.put_result(None, plan.dirpath)
+
+    def read_stage(self):
+        """Stream each file once, fanning buffers out to hash and attribute stages.
+
+        Files whose checksum is served from the validation cache are not
+        streamed; the attribute stage then reads only what it needs.
+        Frames of a sequence rejected by the fast-fail policy are skipped.
+        """
+        validation_policy = get_validation_policy()
+        while (task := self.read_queue.get()) is not STOP:
+            if validation_policy is not None and validation_policy.skip_file(task.file):
+                self.put_result(task, "skipped", task.file, False)
+                continue
+            if self.fatal_error:
+                self.attribute_queue.put(task)
+                continue
+
+            hash_queue = self.hash_queues[task.number % self.hash_workers]
+            needs_hash = False
+            try:
+                needs_hash = task.checksum_file is not None and not self.checksum_from_cache(task)
+                needs_header = needs_hash and self.native_dpx and task.file.lower().endswith(".dpx")
+
+                if needs_hash:
+                    for buffer, count in FileReadEngine(task.file).read_pooled(self.buffer_pool):
+                        if needs_header and task.header is None:
+                            task.header = buffer[:min(count, HEADER_SIZE)]
+                        hash_queue.put((task, (buffer, count)))
+                    hash_queue.put((task, STOP))
+
+            except Exception as e:
+                logger.error(f"{task.file}, {e}")
+                if needs_hash:
+                    hash_queue.put((task, None))
+                elif task.checksum_file is not None:
+                    self.put_result(task, "checksum", task.file, False)
+
+            self.attribute_queue.put(task)
+
+    def checksum_from_cache(self, task):
+        """Verify a file from a trusted cached digest without reading it.
+
+        A sidecar indexed here is kept on the task for the hash stage, so it
+        is parsed once.
+
+        Returns:
+            bool: True when the result was served from the validation cache.
+        """
+        checksum_validator = ChecksumValidator(task.file, task.checksum_file, task.manifest_index)
+        task.manifest_index = checksum_validator.manifest_index
+        if not checksum_validator.read_cached_checksums():
+            return False
+
+        self.compare_checksum(task, checksum_validator)
+        return True
+
+    def hash_stage(self, hash_queue):
+        """Digest buffers per file and compare each finished digest.
+
+        A file whose hashing raises is failed and its remaining buffers are
+        dropped, so the stage keeps draining its queue. Every pooled buffer
+        is returned to the pool once digested or dropped.
+        """
+        active = {}
+        failed = set()
+        while (item := hash_queue.get()) is not STOP:
+            task, buffer = item
+            try:
+                self.hash_buffer(task, buffer, active, failed)
+            finally:
+                if isinstance(buffer, tuple):
+                    self.buffer_pool.release(buffer[0])
+
+    def hash_buffer(self, task, buffer, active, failed):
+        """Digest one pooled buffer of a file, or finish the file on STOP / None."""
+        if task.number in failed:
+            if buffer is STOP or buffer is None:
+                failed.discard(task.number)
+            return
+
+        try:
+            checksum_validator = active.get(task.number)
+            if checksum_validator is None:
+                checksum_validator = ChecksumValidator(task.file, task.checksum_file, task.manifest_index)
+                active[task.number] = checksum_validator
+
+            if buffer is STOP:
+                del active[task.number]
+                checksum_validator.finalise_file_hash()
+                self.compare_checksum(task, checksum_validator)
+            elif buffer is None:
+                del active[task.number]
+                self.put_result(task, "checksum", task.file, False)
+            else:
+                pooled, count = buffer
+                with memoryview(pooled)[:count] as chunk:
+                    checksum_validator.update_file_hash(chunk)
+
+        except Exception as e:
+            logger.error(f"{task.file}, {e}")
+            active.pop(task.number, None)
+            if buffer is not STOP and buffer is not None:
+                failed.add(task.number)
+            self.put_result(task, "checksum", task.file, False)
+
+    def compare_checksum(self, task, checksum_validator):
+        """Compare a computed digest with the manifest and emit the verdict."""
+        try:
+            checksum_validator.file_name_extract()
+            checksum_validator.seek_in_manifest()
+            checksum_validator.validate_checksum()
+        except Exception as e:
+            logger.error(f"{checksum_validator.file}, {e}")
+
+        self.put_result(
+            task, "checksum", checksum_validator.file, checksum_validator.hash_verified, checksum_validator.checksums
+        )
+
+    def attribute_stage(self):
+        """Validate technical attributes for each file."""
+        while (task := self.attribute_queue.get()) is not STOP:
+            file_validator = FileValidator(task.file, file_attributes=task.file_attributes)
+            if self.fatal_error:
+                self.put_result(task, "attributes", task.file, False)
+                continue
+
+            try:
+                if task.header is not None and not file_validator.read_cached_verdict():
+                    file_validator.read_native_attributes(task.header)
+                    if config.CONFIG["attributes"]["MEDIAINFO_CROSS_CHECK"]:
+                        file_validator.mediainfo_cross_check()
+                elif task.header is None:
+                    file_validator.read_attributes()
+                file_validator.format_attributes_validation()
+            except SystemExit:
+                self.fatal_error = True
+            except Exception as e:
+                logger.error(f"{task.file}, {e}")
+
+            self.put_result(task, "attributes", task.file, file_validator.format_verified)
+
+    def sink_stage(self, total_files):
+        """Record results as they arrive and report progress.
+
+        Skipped frames only advance the progress bar. A result that cannot
+        be recorded is logged and the sink carries on. Once a directory's
+        files all have their verdicts, `finish_directory` is called for it.
+        """
+        from tqdm import tqdm
+
+        with tqdm(total=total_files, desc=self.desc) as progress:
+            while (item := self.result_queue.get()) is not STOP:
+                task, result = item
+                if task is None:
+                    self.directory_task_done(result[0])
+                    continue
+
+                if result[0] == "skipped":
+                    progress.update(1)
+                    task.remaining = 1
+                else:
+                    try:
+                        self.record_result(*result)
+                    except Exception as e:
+                        logger.error(f"Unable to record {result[0]} result for {result[1]}: {e}")
+                    if result[0] == "attributes":
+                        progress.update(1)
+
+                task.remaining -= 1
+                if task.remaining == 0:
+                    self.directory_task_done(task.dirpath)
+
+    def directory_task_done(self, dirpath):
+        """Count one finished task of a directory; finish it after the last.
+
+        A finished directory frees its scheduler slot.
+        """
+        directory = self.directories[dirpath]
+        directory[1] -= 1
+        if directory[1]:
+            return
+
+        del self.directories[dirpath]
+        if self.finish_directory is not None:
+            try:
+                self.finish_directory(directory[0])
+            except Exception as e:
+                logger.error(f"Unable to finish directory {dirpath}: {e}")
+        if self.scheduler is not None:
+            self.finished_directories.put(directory[0])
@@ -0,0 +1,246 @@
+"""Cost-ordered fast-fail policy for DPX sequences.
+
+This module defines `ValidationPolicy`, which tallies the failures of each
+DPX sequence (directory of frames) as the checks run, cheapest first:
+
+    sequence    manifest line count, frame gaps and frames the manifest
+                does not list (no file reads)
+    structure   header size / offset pre-check (2 KB per frame)
+    sample      `SAMPLE_SIZE` frames spread evenly over the sequence are
+                hashed (and, with the fused read, profile checked) first
+    full        the remaining frames
+
+Once a sequence reaches `MAX_FAILURES` failed or missing frames, or
+`MAX_FAILURE_PERCENT` of its frames (of the sample, while only sample
+frames have failed) with at least `MIN_FAILURES` of them, it is rejected:
+the rejection is logged and recorded, and frames not yet read are skipped
+instead of validated, so a badly broken delivery (wrong resolution, wrong
+manifest) is known in minutes rather than after every frame has been
+hashed. Fast-fail is off by default, so every frame is validated; it is
+enabled with `--fast-fail` or `ENABLED` in `config.CONFIG["fast_fail"]`.
+
+The policy is opened lazily, once per run, by `get_validation_policy`; it
+returns None when fast-fail is disabled.
+"""
+
+import fnmatch
+import logging
+import os
+import threading
+
+import config
+
+logger = logging.getLogger(__name__)
+
+validation_policy = None
+validation_policy_lock = threading.Lock()
+
+
+def get_validation_policy():
+    """Return the run's `ValidationPolicy`, or None when fast-fail is off."""
+    global validation_policy
+
+    if not config.CONFIG["fast_fail"]["ENABLED"]:
+        return None
+
+    with validation_policy_lock:
+        if validation_policy is None:
+            validation_policy = ValidationPolicy()
+
+    return validation_policy
+
+
+def close_validation_policy():
+    """Report the sequences still open and discard the run's policy."""
+    global validation_policy
+
+    with validation_policy_lock:
+        if validation_policy is not None:
+            for dirpath in list(validation_policy.sequences):
+                validation_policy.finish_sequence(dirpath)
+        validation_policy = None
+
+
+class SequencePolicy:
+    """Failure tally of one DPX sequence.
+
+    Args:
+        dirpath (str): Directory holding the sequence.
+        frame_count (int): Frames in the sequence.
+        sample (set[str]): Frames validated ahead of the others.
+
+    Attributes:
+        failed_files (set[str]): Frames with at least one failed check.
+        missing_frames (int): Frames the sequence check found missing.
+        sample_failures (int): Failed frames belonging to the sample.
+        rejected (bool): The sequence crossed a threshold.
+        skipped (int): Frames skipped after the rejection.
+    """
+    def __init__(self, dirpath, frame_count, sample):
+
+        self.dirpath = dirpath
+        self.frame_count = frame_count
+        self.sample = sample
+        self.failed_files = set()
+        self.missing_frames = 0
+        self.sample_failures = 0
+        self.rejected = False
+        self.skipped = 0
+
+    @property
+    def failures(self):
+        """Failed plus missing frames."""
+        return len(self.failed_files) + self.missing_frames
+
+
+class ValidationPolicy:
+    """Reject DPX sequences whose failures cross the configured thresholds.
+
+    Args:
+        max_failures (int, optional): Failed or missing frames rejecting a
+            sequence (0 = no limit). Defaults to `MAX_FAILURES`.
+        max_failure_percent (float, optional): Percentage of frames rejecting
+            a sequence (0 = no limit). Defaults to `MAX_FAILURE_PERCENT`.
+        min_failures (int, optional): Failures needed before the
+            percentage applies. Defaults to `MIN_FAILURES`.
+        sample_size (int, optional): Frames validated first. Defaults to
+            `SAMPLE_SIZE`.
+
+    Attributes:
+        sequences (dict[str, SequencePolicy]): Directory -> tally.
+    """
+    def __init__(self, max_failures=None, max_failure_percent=None, min_failures=None, sample_size=None):
+
+        fast_fail_config = config.CONFIG["fast_fail"]
+        self.max_failures = fast_fail_config["MAX_FAILURES"] if max_failures is None else max_failures
+        self.max_failure_percent = (
+            fast_fail_config["MAX_FAILURE_PERCENT"] if max_failure_percent is None else max_failure_percent
+        )
+        self.min_failures = fast_fail_config["MIN_FAILURES"] if min_failures is None else min_failures
+        self.sample_size = fast_fail_config["SAMPLE_SIZE"] if sample_size is None else sample_size
+        self.film_pattern = config.CONFIG["extensions"]["FILM"]
+        self.lock = threading.Lock()
+        self.sequences = {}
+
+    def start_sequence(self, dirpath, files):
+        """Open the tally of a sequence, once; later calls keep it.
+
+        Args:
+            dirpath (str): Directory holding the sequence.
+            files (list[str]): Every frame of the sequence, in order.
+        """
+        dirpath = os.path.normpath(dirpath)
+        with self.lock:
+            if dirpath not in self.sequences:
+                self.sequences[dirpath] = SequencePolicy(dirpath, len(files), set(self.sample_frames(files)))
+
+    def sample_frames(self, files):
+        """Return `sample_size` frames spread evenly over `files`."""
+        if len(files) <= self.sample_size:
+            return list(files)
+        step = len(files) / self.sample_size
+        return [files[int(index * step)] for index in range(self.sample_size)]
+
+    def order_files(self, dirpath, files):
+        """Return `files` with the sequence's sample frames first."""
+        sequence = self.sequences.get(os.path.normpath(dirpath))
+        if sequence is None:
+            return files
+        return [file for file in files if file in sequence.sample] + [
+            file for file in files if file not in sequence.sample
+        ]
+
+    def add_missing(self, dirpath, missing_frames):
+        """Count frames the sequence check found missing.
+
+        Returns:
+            bool: True when this rejected the sequence.
+        """
+        with self.lock:
+            sequence = self.sequences.get(os.path.normpath(dirpath))
+            if sequence is None:
+                return False
+            sequence.missing_frames += missing_frames
+            return self.check_thresholds(sequence, "sequence")
+
+    def add_failure(self, file, stage):
+        """Count a failed check of a frame; each frame counts once.
+
+        Args:
+            file (str): Frame that failed.
+            stage (str): Check that failed, e.g. "manifest", "structure",
+                "attributes" or "checksum".
+
+        Returns:
+            bool: True when this rejected the frame's sequence.
+        """
+        with self.lock:
+            sequence = self.sequences.get(os.path.dirname(os.path.normpath(file)))
+            if sequence is None or file in sequence.failed_files:
+                return False
+            sequence.failed_files.add(file)
+            if file in sequence.sample:
+                sequence.sample_failures += 1
+            return self.check_thresholds(sequence, stage)
+
+    def check_thresholds(self, sequence, stage):
+        """Reject `sequence` when a threshold is crossed (lock held).
+
+        The percentage applies to the whole sequence and, while every
+        failure found so far is a sample frame, to the sample alone; either
+        way only from `min_failures` failures on, so a short sequence is not
+        rejected for one bad frame.
+        """
+        if sequence.rejected:
+            return False
+
+        failures = sequence.failures
+        percent_limit = self.max_failure_percent if failures >= self.min_failures else 0
+        over_count = self.max_failures and failures >= self.max_failures
+        over_percent = percent_limit and sequence.frame_count and (
+            failures * 100 / sequence.frame_count >= percent_limit
+        )
+        over_sample = percent_limit and sequence.sample and failures == sequence.sample_failures and (
+            sequence.sample_failures * 100 / len(sequence.sample) >= percent_limit
+        )
+        if not (over_count or over_percent or over_sample):
+            return False
+
+        sequence.rejected = True
+        logger.critical(
+            f"Sequence rejected: {sequence.dirpath}: {failures} of {sequence.frame_count} frames failed "
+            f"or missing ({stage} check); remaining frames are not validated"
+        )
+        return True
+
+    def rejected(self, dirpath):
+        """Return True when the sequence in `dirpath` was rejected."""
+        sequence = self.sequences.get(os.path.normpath(dirpath))
+        return sequence is not None and sequence.rejected
+
+    def skip_file(self, file):
+        """Return True, counting the frame, when `file` should be skipped.
+
+        Only DPX frames of rejected sequences are skipped.
+        """
+        if not fnmatch.fnmatch(os.path.basename(file), self.film_pattern):
+            return False
+
+        with self.lock:
+            sequence = self.sequences.get(os.path.dirname(os.path.normpath(file)))
+            if sequence is None or not sequence.rejected:
+                return False
+            sequence.skipped += 1
+            return True
+
+    def skip_files(self, files):
+        """Count frames of a rejected sequence left unvalidated."""
+        for file in files:
+            self.skip_file(file)
+
+    def finish_sequence(self, dirpath):
+        """Log how much of a rejected sequence was skipped; drop its tally."""
+        with self.lock:
+            sequence = self.sequences.pop(os.path.normpath(dirpath), None)
+        if sequence is not None and sequence.rejected:
+            logger.info(f"{sequence.dirpath}: {sequence.skipped} frames not validated after rejection")
@@ -0,0 +1,232 @@
+"""Parallel checksum validation.
+
+This module defines `ChecksumEngine`, which runs `ChecksumValidator` over many
+files concurrently. Work is spread over a bounded pool of `WORKERS` threads
+or processes (`EXECUTOR` in `config.CONFIG["checksums"]`). hashlib releases
+the GIL while digesting large buffers, so the thread executor already scales
+across cores; the process executor is available for hosts where it does not.
+
+Results are yielded in the order the jobs were supplied, so callers record
+verified / failed files in sequence order exactly as a serial run would. The
+progress bar reports aggregate throughput (MB/s) across all workers.
+
+Process pools are expensive to start, so they are kept warm: a pool is
+returned to an idle list after each run and reused by the next run (the next
+directory, or the next root of a batch) until `shutdown_process_pools`. A run
+that ends in an error (e.g. `BrokenProcessPool` after a worker was killed)
+or is abandoned shuts its pool down instead, so the next run starts a fresh
+one. Each process worker parses a manifest once and keeps the index for
+later jobs (`worker_manifest_index`).
+
+With an `abort` check (the fast-fail policy), jobs are submitted a few at a
+time, in order, and no further job starts once it returns True; the jobs
+never started are left in `skipped_jobs`.
+
+    engine = ChecksumEngine()
+    for file, hash_verified, digests in engine.run(jobs, manifest_index):
+        ...
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import config
+from validators.checksum_manifest import ChecksumManifest
+from validators.checksum_validator import ChecksumValidator
+
+logger = logging.getLogger(__name__)
+
+# Manifest indexes parsed in this worker: path -> (mtime_ns, size, index)
+worker_manifests = {}
+WORKER_MANIFEST_LIMIT = 16
+
+# Warm process pools between runs: (workers, pool)
+idle_process_pools = []
+process_pools_lock = threading.Lock()
+
+
+def worker_manifest_index(checksum_file):
+    """Return the parsed index of `checksum_file`, parsing it once per worker.
+
+    Indexes are reused while the manifest's mtime and size are unchanged;
+    the oldest is dropped beyond `WORKER_MANIFEST_LIMIT` manifests.
+    """
+    try:
+        stat = os.stat(checksum_file)
+    except OSError:
+        return None
+
+    cached = worker_manifests.get(checksum_file)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    manifest_index = ChecksumManifest(checksum_file)
+    manifest_index.parse_manifest()
+    if len(worker_manifests) >= WORKER_MANIFEST_LIMIT:
+        del worker_manifests[next(iter(worker_manifests))]
+    worker_manifests[checksum_file] = (stat.st_mtime_ns, stat.st_size, manifest_index)
+
+    return manifest_index
+
+
+def acquire_process_pool(workers):
+    """Return an idle warm process pool of `workers`, or start a new one.
+
+    A pool broken since it was released (a worker killed) refuses a no-op
+    submit; it is shut down and replaced.
+    """
+    with process_pools_lock:
+        for position, (pool_workers, pool) in enumerate(idle_process_pools):
+            if pool_workers == workers:
+                del idle_process_pools[position]
+                break
+        else:
+            pool = None
+
+    if pool is not None:
+        try:
+            pool.submit(int)
+            return pool
+        except BrokenProcessPool:
+            pool.shutdown(wait=False)
+
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def release_process_pool(pool, workers):
+    """Return a process pool to the idle list for the next run."""
+    with process_pools_lock:
+        idle_process_pools.append((workers, pool))
+
+
+def shutdown_process_pools():
+    """Shut down every idle process pool (end of run / batch)."""
+    with process_pools_lock:
+        pools = [pool for _, pool in idle_process_pools]
+        idle_process_pools.clear()
+
+    for pool in pools:
+        pool.shutdown()
+
+
+def verify_file(job, manifest_index=None):
+    """Hash a single file and compare it with its manifest entry.
+
+    Args:
+        job (tuple[str, str]): (file path, checksum manifest / sidecar path).
+        manifest_index (ChecksumManifest, optional): Shared parsed manifest;
+            falls back to this worker's index of the job's manifest.
+
+    Returns:
+        tuple[str, bool, dict, int]: File path, verification result, digests
+        by algorithm, bytes hashed.
+    """
+    file, checksum_file = job
+    checksum_validator = ChecksumValidator(
+        file, checksum_file, manifest_index or worker_manifest_index(checksum_file)
+    )
+    checksum_validator.generate_file_hash()
+    checksum_validator.file_name_extract()
+    checksum_validator.seek_in_manifest()
+    checksum_validator.validate_checksum()
+
+    return file, checksum_validator.hash_verified, checksum_validator.checksums, checksum_validator.bytes_read
+
+
+class ChecksumEngine:
+    """Run checksum validation over a bounded worker pool.
+
+    Args:
+        workers (int, optional): Concurrent hashing workers. Defaults to the
+            configured `WORKERS`.
+        executor (str, optional): "thread" or "process". Defaults to the
+            configured `EXECUTOR`.
+    """
+    def __init__(self, workers=None, executor=None):
+
+        self.workers = workers or config.CONFIG["checksums"]["WORKERS"]
+        self.executor = executor or config.CONFIG["checksums"]["EXECUTOR"]
+        self.bytes_hashed = 0
+        self.skipped_jobs = []
+
+    def create_executor(self, worker, manifest_index):
+        """Create (or reuse) the worker pool and matching worker callable.
+
+        Process workers index the manifest themselves, once per worker.
+        """
+        if self.executor == "process":
+            return acquire_process_pool(self.workers), worker
+
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        return pool, partial(worker, manifest_index=manifest_index)
+
+    def run(self, jobs, manifest_index=None, desc="Checksums", worker=verify_file, abort=None):
+        """Validate every job, yielding results in job order.
+
+        Args:
+            jobs (list[tuple[str, str]]): (file, checksum file) pairs.
+            manifest_index (ChecksumManifest, optional): Index shared by all
+                jobs (DPX manifest); None when each job has its own sidecar.
+            desc (str): Progress bar label.
+            worker (callable): Module level job function returning a result
+                tuple whose last item is the number of bytes read. Defaults
+                to `verify_file`.
+            abort (callable, optional): Checked before each job starts; once
+                it returns True the remaining jobs are skipped.
+
+        Yields:
+            tuple: The worker's result without the byte count, e.g.
+            (file, hash_verified, digests) for `verify_file`.
+        """
+        from tqdm import tqdm
+
+        pool, worker = self.create_executor(worker, manifest_index)
+        chunksize = max(1, len(jobs) // (self.workers * 16)) if self.executor == "process" else 1
+        start = time.monotonic()
+        completed = False
+
+        try:
+            with tqdm(total=len(jobs), desc=desc) as progress:
+                if abort is None:
+                    results = pool.map(worker, jobs, chunksize=chunksize)
+                else:
+                    results = self.submit_until_abort(pool, worker, jobs, abort)
+                for *result, bytes_read in results:
+                    self.bytes_hashed += bytes_read
+                    elapsed = time.monotonic() - start
+                    if elapsed:
+                        progress.set_postfix_str(f"{self.bytes_hashed / elapsed / 1e6:.1f} MB/s", refresh=False)
+                    progress.update(1)
+
+                    yield tuple(result)
+            completed = True
+        finally:
+            if not completed:
+                pool.shutdown(cancel_futures=True)
+            elif self.executor == "process":
+                release_process_pool(pool, self.workers)
+            else:
+                pool.shutdown()
+
+    def submit_until_abort(self, pool, worker, jobs, abort):
+        """Yield job results in order, keeping a few jobs in flight.
+
+        Jobs not started when `abort` returns True are left in `skipped_jobs`.
+        """
+        remaining = deque(jobs)
+        in_flight = deque()
+        while remaining or in_flight:
+            while remaining and len(in_flight) < self.workers * 4:
+                if abort():
+                    self.skipped_jobs = list(remaining)
+                    remaining.clear()
+                    break
+                in_flight.append(pool.submit(worker, remaining.popleft()))
+            if in_flight:
+                yield in_flight.popleft().result()
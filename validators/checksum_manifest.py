@@ -0,0 +1,210 @@
+"""Checksum manifest indexing.
+
+This module defines `ChecksumManifest`, which parses a checksum manifest (or
+a single‑file sidecar) once into an exact filename -> digest map. A sequence
+directory's manifest is parsed a single time and the index shared by every
+frame lookup, instead of re‑reading and scanning the manifest per frame.
+
+Two manifest layouts are accepted:
+
+    md5sum:  <digest>  <filename>      (text mode)
+             <digest> *<filename>      (binary mode)
+             <digest> <filename>       (single space or tab, hex digest)
+    BSD:     MD5 (<filename>) = <digest>
+
+The layout is detected once from the first entry. md5sum manifests, by far
+the most common and the largest, are split with plain string partitioning;
+a line only takes that fast path when its digest is pure hex of a known
+length. Anything else (leading whitespace, other separators, md5sum's
+escaped lines) goes through the regular expressions, and the BSD one is
+only applied when a line does not follow the md5sum layout.
+
+md5sum escapes a filename containing a backslash or newline and marks the
+line with a leading backslash; the marker is removed and the filename
+unescaped before it is indexed. Backslashes in unescaped names are read as
+Windows path separators.
+
+Filenames are keyed on their basename so entries written with relative or
+absolute paths still match, and lookups are exact, so one filename being a
+suffix of another can no longer select the wrong line.
+
+The digest algorithm is detected rather than assumed: the BSD tag names it
+(`SHA256 (...) = ...`), otherwise the file extension (`reel.sha256`,
+`file.wav.xxh128`), otherwise the length of the digests (32 hex digits md5,
+40 sha1, 64 sha256, 128 sha512, 16 xxh3). Digests whose length contradicts
+the extension are checked by their length, with a warning.
+"""
+
+import logging
+import os
+import re
+
+from validators.multi_digest import DIGEST_LENGTHS, HEX_LENGTHS, algorithm_name
+
+logger = logging.getLogger(__name__)
+
+bsd_line = re.compile(r"^(?P<algorithm>[\w-]+) ?\((?P<name>.+)\) ?= ?(?P<digest>[0-9A-Fa-f]+)$")
+loose_line = re.compile(r"^(?P<digest>(?:XXH3_)?[0-9A-F]+)\s+\*?(?P<name>.+)$", re.IGNORECASE)
+hex_characters = "0123456789abcdefABCDEF"
+escape_sequence = re.compile(r"\\(.)")
+
+# md5sum filename escapes: \\ -> \, \n -> newline, \r -> carriage return
+escaped_characters = {"\\": "\\", "n": "\n", "r": "\r"}
+
+
+def known_digest(digest):
+    """Return True when `digest` is pure hex of a known length (XXH3_ allowed)."""
+    if digest[:5].casefold() == "xxh3_":
+        digest = digest[5:]
+    return len(digest) in DIGEST_LENGTHS and not digest.strip(hex_characters)
+
+
+def unescape_line(line):
+    """Strip a line and remove md5sum's escape marker.
+
+    Returns:
+        tuple(str, bool): The stripped line, and True when it was escaped.
+    """
+    line = line.strip()
+    if line.startswith("\\"):
+        return line[1:], True
+    return line, False
+
+
+def unescape_name(name):
+    """Undo md5sum's escaping of backslashes and newlines in a filename."""
+    return escape_sequence.sub(lambda match: escaped_characters.get(match.group(1), match.group(0)), name)
+
+
+def manifest_algorithm(manifest):
+    """Return the algorithm named by a checksum file's extension, or None."""
+    return algorithm_name(os.path.splitext(manifest)[1][1:])
+
+
+class ChecksumManifest:
+    """Parse-once index of a checksum manifest.
+
+    Args:
+        manifest (str): Path to the manifest or sidecar file.
+
+    Attributes:
+        entries (dict[str, str]): Basename -> lower case hex digest.
+        line_count (int): Number of lines in the manifest.
+        layout (str): Detected layout, "md5sum" or "bsd".
+        algorithm (str): Digest algorithm of the entries, e.g. "md5".
+    """
+    def __init__(self, manifest):
+
+        self.manifest = manifest
+        self.entries = {}
+        self.line_count = 0
+        self.layout = None
+        self.algorithm = manifest_algorithm(manifest) or "md5"
+
+    def parse_manifest(self):
+        """Read the manifest once and populate `entries`.
+
+        Logs errors when the manifest cannot be read, leaving the index
+        empty so that every lookup fails.
+        """
+        try:
+            with open(self.manifest, "r", encoding="utf-8", errors="replace") as register:
+                lines = register.read().splitlines()
+
+        except FileNotFoundError as e:
+            logger.error(f"{self.manifest}, {e}")
+            return
+        except (IOError, OSError) as e:
+            logger.error(f"{self.manifest}, {e}")
+            return
+
+        self.line_count = len(lines)
+        self.layout = self.detect_layout(lines)
+
+        if self.layout == "bsd":
+            for line in lines:
+                self.add_bsd_entry(line)
+        else:
+            for line in lines:
+                digest, _, name = line.partition(" ")
+                if name[:1] in (" ", "*") and len(digest) in DIGEST_LENGTHS and not digest.strip(hex_characters):
+                    self.add_entry(name[1:], digest)
+                elif line.strip():
+                    self.add_loose_entry(line)
+
+        self.detect_algorithm(lines)
+
+    def detect_layout(self, lines):
+        """Return "bsd" when the first non-blank line is BSD style, else "md5sum"."""
+        for line in lines:
+            stripped, _ = unescape_line(line)
+            if stripped:
+                return "bsd" if bsd_line.match(stripped) else "md5sum"
+
+        return "md5sum"
+
+    def detect_algorithm(self, lines):
+        """Set `algorithm` from the BSD tag, else check it against digest length."""
+        if self.layout == "bsd":
+            for line in lines:
+                match = bsd_line.match(unescape_line(line)[0])
+                if match:
+                    tagged = algorithm_name(match.group("algorithm"))
+                    if tagged is not None:
+                        self.algorithm = tagged
+                        return
+                    break
+
+        if not self.entries:
+            return
+
+        length = len(next(iter(self.entries.values())))
+        if HEX_LENGTHS.get(self.algorithm) != length and length in DIGEST_LENGTHS:
+            if manifest_algorithm(self.manifest) is not None:
+                logger.warning(
+                    f"{self.manifest}: {length} digit digests do not match its extension; "
+                    f"checking as {DIGEST_LENGTHS[length]}"
+                )
+            self.algorithm = DIGEST_LENGTHS[length]
+
+    def add_loose_entry(self, line):
+        """Add a known hex digest and filename split by any whitespace, else try BSD."""
+        stripped, escaped = unescape_line(line)
+        match = loose_line.match(stripped)
+        if match and known_digest(match.group("digest")):
+            self.add_entry(match.group("name"), match.group("digest"), escaped)
+        else:
+            self.add_bsd_entry(line)
+
+    def add_bsd_entry(self, line):
+        """Parse a BSD style line and add it to the index."""
+        stripped, escaped = unescape_line(line)
+        match = bsd_line.match(stripped)
+        if match:
+            self.add_entry(match.group("name"), match.group("digest"), escaped)
+        elif stripped:
+            logger.warning(f"Unrecognised manifest line in {self.manifest}: {line}")
+
+    def add_entry(self, name, digest, escaped=False):
+        """Add a filename -> digest entry, keyed on the file's basename.
+
+        Args:
+            name (str): Filename as written in the manifest.
+            digest (str): Hex digest.
+            escaped (bool): The line carried md5sum's escape marker, so
+                `name` is unescaped and its backslashes are literal.
+        """
+        if escaped:
+            file_name = os.path.basename(unescape_name(name.strip()))
+        else:
+            file_name = os.path.basename(name.strip().replace("\\", "/"))
+        if file_name in self.entries:
+            logger.warning(f"Duplicate manifest entry in {self.manifest}: {file_name}")
+            return
+
+        # xxhsum marks 64-bit XXH3 digests in the md5sum layout: XXH3_<digest>
+        self.entries[file_name] = digest.casefold().removeprefix("xxh3_")
+
+    def lookup(self, file_name):
+        """Return the manifest digest for `file_name`, or None if absent."""
+        return self.entries.get(file_name)
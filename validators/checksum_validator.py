@@ -1,69 +1,180 @@
 """Checksum validation utilities.
 
 This module defines `ChecksumValidator`, a helper class responsible for:
-    * Generating an MD5 digest for a supplied file
+    * Generating the digests of a supplied file (every configured algorithm
+      from the same read, see `MultiDigest`)
     * Extracting the filename for matching within a checksum manifest
     * Seeking a matching entry inside a checksum manifest file
     * Comparing the computed digest against the manifest entry and recording
       pass/fail state
 
-The manifest format stores each line beginning with a
-32‑character hexadecimal MD5 hash followed by whitespace / filename; the
-validator slices the first 32 characters to obtain the expected digest.
+Manifest lookups go through a `ChecksumManifest` index (md5sum or BSD
+layout, exact filename match). A sequence directory's index can be passed in
+so that it is parsed once and shared by every frame; otherwise the manifest
+or sidecar is indexed when the validator is created.
+
+The manifest's own algorithm (`ChecksumManifest.algorithm`) is always
+computed and is the one compared; the `ALGORITHMS` and `WRITE_MANIFESTS` of
+`config.CONFIG["checksums"]` are computed alongside it in the same pass, so
+one read serves an md5 manifest today and a sha256 manifest generated from it.
 
 Attributes of interest after running the full sequence of methods:
     hash_verified (bool): True if checksum matches manifest entry.
-    file_found (bool): True if a line containing the file name was located.
-    checksum (str): Hexadecimal MD5 digest computed for the file.
+    file_found (bool): True if the manifest holds an entry for the file name.
+    checksum (str): Hex digest computed with the manifest's algorithm.
+    checksums (dict[str, str]): Algorithm -> hex digest for every digest
+        computed.
+    manifest_hash (str): Digest recorded for the file in the manifest.
 
 """
 
 import logging
 import os
-import hashlib
+import time
+
+import config
+from validators.checksum_manifest import ChecksumManifest
+from validators.multi_digest import OPTIONAL_PACKAGES, SUPPORTED_ALGORITHMS, MultiDigest
+from validators.read_engine import FileReadEngine
+from validation_cache import get_validation_cache
+from run_metrics import observe_stage
 
 logger = logging.getLogger(__name__)
 
+
+def digest_algorithms(algorithm):
+    """Return `algorithm` followed by every other configured algorithm.
+
+    Args:
+        algorithm (str): Algorithm of the manifest / sidecar being checked.
+
+    Returns:
+        list[str]: Algorithms to compute in one read, without duplicates;
+        algorithms whose optional package is not installed are left out.
+    """
+    checksums = config.CONFIG["checksums"]
+    algorithms = dict.fromkeys([algorithm, *checksums["ALGORITHMS"], *checksums["WRITE_MANIFESTS"]])
+    return [algorithm for algorithm in algorithms if algorithm in SUPPORTED_ALGORITHMS]
+
+
 class ChecksumValidator:
     """Validate a single file's checksum against a manifest entry.
 
     Args:
         file (str): Path to the file being validated.
         checksum_manifest (str): Path to the checksum register / manifest file.
+        manifest_index (ChecksumManifest, optional): Pre-parsed index of
+            `checksum_manifest` shared across files.
     """
-    def __init__(self, file, checksum_manifest):
+    def __init__(self, file, checksum_manifest, manifest_index=None):
 
         self.hash_verified = False
         self.file = file
         self.file_name_only = None
         self.checksum_manifest = checksum_manifest
+        self.manifest_index = manifest_index or self.index_manifest()
+        self.manifest_hash = None
         self.line_count = None
-        self.checksum_algorithm = hashlib.md5()
+        self.algorithm = self.manifest_index.algorithm
+        self.algorithms = digest_algorithms(self.algorithm)
+        self.checksum_algorithm = MultiDigest(self.algorithms)
         self.checksum = None
+        self.checksums = {}
+        self.bytes_read = 0
+        self.hash_started = None
         self.file_found = False
-        self.line = None
+
+    def index_manifest(self):
+        """Parse the manifest / sidecar when no shared index was supplied.
+
+        Parsed up front because the manifest's contents (BSD tag, digest
+        length) decide which digest is compared.
+        """
+        manifest_index = ChecksumManifest(self.checksum_manifest)
+        manifest_index.parse_manifest()
+        return manifest_index
 
     def generate_file_hash(self):
-        """Compute the MD5 checksum of the target file in streaming chunks.
+        """Compute the file's digests in streaming chunks.
+
+        Streams the file through `FileReadEngine` (read mode, buffer size and
+        page cache hints from `config.CONFIG["checksums"]`) to avoid loading
+        large files fully into memory. Stores every hex digest in
+        `self.checksums`, the manifest algorithm's in `self.checksum`, and
+        the number of bytes hashed in `self.bytes_read`. Logs errors if the
+        file cannot be opened/read.
 
-        Reads the file in 8KB blocks to avoid loading large files fully into
-        memory. Stores the resulting 32‑character hex digest in `self.checksum`.
-        Logs errors if the file cannot be opened/read.
+        When the validation cache is trusted and holds every digest for the
+        unchanged file, those digests are used and the file is not read.
         """
-        self.checksum_algorithm = hashlib.md5()
+        self.checksum_algorithm = MultiDigest(self.algorithms)
+
+        if self.read_cached_checksums():
+            return
 
         try:
-            with open(self.file, 'rb') as f:
-                while buffer := f.read(8192):
-                    self.checksum_algorithm.update(buffer)
+            self.hash_started = time.perf_counter()
+            for buffer in FileReadEngine(self.file).read_buffers():
+                self.update_file_hash(buffer)
 
-                self.checksum = self.checksum_algorithm.hexdigest()
+            self.finalise_file_hash()
         except FileNotFoundError as e:
             logger.error(f"{self.file}, {e}")
 
         except (IOError, OSError) as e:
             logger.error(f"{self.file}, {e}")
 
+    def update_file_hash(self, buffer):
+        """Feed a buffer of file content into the running digest.
+
+        Used by `generate_file_hash` and by callers that stream the file
+        themselves (e.g. `FusedFrameValidator`).
+        """
+        if self.hash_started is None:
+            self.hash_started = time.perf_counter()
+        self.checksum_algorithm.update(buffer)
+        self.bytes_read += len(buffer)
+
+    def finalise_file_hash(self):
+        """Store the hex digest of everything passed to `update_file_hash`.
+
+        The digest is also written to the validation cache when enabled, and
+        the time since the first buffer recorded as the file's hashing latency.
+        """
+        self.set_checksums(self.checksum_algorithm.hexdigests())
+        observe_stage("hashing", self.hash_started or time.perf_counter(), self.bytes_read)
+
+        validation_cache = get_validation_cache()
+        if validation_cache is not None:
+            for algorithm, digest in self.checksums.items():
+                validation_cache.store_checksum(self.file, algorithm, digest)
+
+    def set_checksums(self, checksums):
+        """Store computed digests, selecting the manifest algorithm's."""
+        self.checksums = checksums
+        self.checksum = checksums.get(self.algorithm)
+
+    def read_cached_checksums(self):
+        """Serve every required digest from the trusted validation cache.
+
+        Returns:
+            bool: True when all of `self.algorithms` were cached for the
+            unchanged file; the file then need not be read.
+        """
+        validation_cache = get_validation_cache()
+        if validation_cache is None:
+            return False
+
+        checksums = {}
+        for algorithm in self.algorithms:
+            digest = validation_cache.get_checksum(self.file, algorithm)
+            if digest is None:
+                return False
+            checksums[algorithm] = digest
+
+        self.set_checksums(checksums)
+        return True
+
     def file_name_extract(self):
         """Derive the basename of the file for manifest matching.
 
@@ -78,35 +189,35 @@ class ChecksumValidator:
             logger.error(f"{self.file}, {e}")
 
     def seek_in_manifest(self):
-        """Search for the file's basename within the checksum manifest.
+        """Look up the file's basename in the checksum manifest index.
 
-        Iterates line by line; if the filename substring appears in a line,
-        marks `self.file_found` True and stores the raw line in `self.line`.
+        On an exact match marks `self.file_found` True and stores the
+        recorded digest in `self.manifest_hash`.
         """
-        try:
-            with open(self.checksum_manifest, 'r') as register:
-                for self.line in register:
-                    self.line = self.line.strip("\n")
-                    if self.file_name in self.line:
-                        self.file_found = True
-                        break
+        started = time.perf_counter()
+        self.manifest_hash = self.manifest_index.lookup(self.file_name)
+        self.file_found = self.manifest_hash is not None
+        observe_stage("manifest_lookup", started)
+        if not self.file_found:
+            logger.error(f"{self.file}, not found in {self.checksum_manifest}")
 
-        except FileNotFoundError as e:
-            logger.error(f"{self.file}, {e}")
-        except (IOError, OSError) as e:
-            logger.error(f"{self.file}, {e}")
-        
     def validate_checksum(self):
         """Compare computed checksum against the manifest entry.
 
-        Extracts the first 32 characters of the stored manifest line and performs 
-        a case‑insensitive comparison with the
+        Performs a case‑insensitive comparison of the manifest digest with the
         previously computed checksum. Sets `hash_verified` accordingly and
-        logs an error on mismatch.
+        logs an error on mismatch, or when the manifest's algorithm needs an
+        optional package that is not installed.
         """
-        line_hash = self.line[:32].casefold() if self.line else None
+        if self.algorithm not in SUPPORTED_ALGORITHMS:
+            self.hash_verified = False
+            logger.error(
+                f"{self.file}, {self.algorithm} digests need the "
+                f"{OPTIONAL_PACKAGES.get(self.algorithm, self.algorithm)} package"
+            )
+            return
 
-        if line_hash and line_hash == self.checksum:
+        if self.manifest_hash and self.manifest_hash == self.checksum:
             self.hash_verified = True
         else:
             self.hash_verified = False
@@ -0,0 +1,222 @@
+"""Native DPX header parsing.
+
+This module defines `DPXHeaderReader`, an in‑process reader for the SMPTE
+268M DPX file header. Only the first 2048 bytes of a frame (generic, image,
+orientation, film and television headers) are read, so inspecting a frame
+costs a single small read instead of a MediaInfo subprocess.
+
+Both byte orders are supported; the magic number at offset 0 ("SDPX" for big
+endian, "XPDS" for little endian) selects the struct format used for every
+subsequent field.
+
+The parsed values are exposed using the same field names and string
+formatting MediaInfo emits in its JSON output, so the result can be validated
+directly against `dpx_validation_map`:
+
+    r = DPXHeaderReader(path_to_frame)
+    r.read_header()
+    r.parse_header()
+    if r.header_valid:
+        r.attributes["Width"]   # "2048"
+"""
+
+import logging
+import struct
+
+logger = logging.getLogger(__name__)
+
+HEADER_SIZE = 2048
+
+MAGIC_BIG = b"SDPX"
+MAGIC_LITTLE = b"XPDS"
+
+# Header field offsets (SMPTE 268M)
+OFFSET_IMAGE_DATA = 4
+OFFSET_VERSION = 8
+OFFSET_FILE_SIZE = 16
+OFFSET_PIXELS_PER_LINE = 772
+OFFSET_LINES_PER_ELEMENT = 776
+OFFSET_ELEMENT_DESCRIPTOR = 800
+OFFSET_ELEMENT_BIT_SIZE = 803
+OFFSET_ELEMENT_PACKING = 804
+OFFSET_ELEMENT_ENCODING = 806
+OFFSET_ELEMENT_DATA_OFFSET = 808
+OFFSET_ELEMENT_EOL_PADDING = 812
+OFFSET_ELEMENT_EOI_PADDING = 816
+OFFSET_PIXEL_ASPECT_RATIO = 1628
+
+# Smallest header that still contains every field read below
+MINIMUM_HEADER_SIZE = OFFSET_PIXEL_ASPECT_RATIO + 8
+
+UNDEFINED_U32 = 0xFFFFFFFF
+
+# MediaInfo labels for the image element packing and descriptor codes
+packing_labels = {
+    0: "Packed",
+    1: "Filled A",
+    2: "Filled B",
+}
+
+descriptor_labels = {
+    1: "R",
+    2: "G",
+    3: "B",
+    4: "A",
+    6: "Y",
+    50: "RGB",
+    51: "RGBA",
+    52: "ABGR",
+    100: "YUV",
+    101: "YUVA",
+    102: "YUV",
+    103: "YUVA",
+}
+
+encoding_labels = {
+    0: "Raw",
+    1: "RLE",
+}
+
+
+class DPXHeaderReader:
+    """Read and decode the technical fields of a DPX frame header.
+
+    Args:
+        file (str): Path to the DPX frame.
+
+    Attributes:
+        header (bytes): Raw header bytes (up to 2048).
+        byte_order (str): struct byte order prefix (">" or "<").
+        attributes (dict): MediaInfo style field -> value map.
+        image_data_offset (int): Generic header offset to the image data.
+        declared_file_size (int): Generic header total file size.
+        element_data_offset (int): First image element's data offset.
+        line_padding (int): End-of-line padding bytes of the first element.
+        image_padding (int): End-of-image padding bytes of the first element.
+        header_valid (bool): True once the header parsed successfully.
+    """
+    def __init__(self, file):
+
+        self.file = file
+        self.header = None
+        self.byte_order = None
+        self.image_data_offset = None
+        self.declared_file_size = None
+        self.element_data_offset = None
+        self.line_padding = 0
+        self.image_padding = 0
+        self.attributes = {}
+        self.header_valid = False
+
+    def read_header(self):
+        """Read the leading 2048 header bytes of the frame into `self.header`."""
+        try:
+            with open(self.file, "rb") as f:
+                self.header = f.read(HEADER_SIZE)
+
+        except FileNotFoundError as e:
+            logger.error(f"{self.file}, {e}")
+        except (IOError, OSError) as e:
+            logger.error(f"{self.file}, {e}")
+
+    def unpack(self, fmt, offset):
+        """Unpack a single value from the header using the detected byte order."""
+        return struct.unpack_from(self.byte_order + fmt, self.header, offset)[0]
+
+    def read_string(self, offset, length):
+        """Decode a NUL padded ASCII header field."""
+        raw = self.header[offset:offset + length].split(b"\x00", 1)[0]
+        return raw.decode("ascii", errors="replace").strip()
+
+    def parse_header(self, header=None):
+        """Decode the header into MediaInfo style attributes.
+
+        Args:
+            header (bytes, optional): Header bytes already read by the caller
+                (e.g. the first buffer of a streaming read). Defaults to the
+                bytes loaded by `read_header`.
+
+        Sets `header_valid` True when the magic number is recognised and the
+        header is long enough to contain every validated field.
+        """
+        if header is not None:
+            self.header = header
+
+        if not self.header or len(self.header) < MINIMUM_HEADER_SIZE:
+            logger.critical(f"DPX header truncated or unreadable {self.file}")
+            return
+
+        magic = self.header[:4]
+        if magic == MAGIC_BIG:
+            self.byte_order = ">"
+            endianness = "Big"
+        elif magic == MAGIC_LITTLE:
+            self.byte_order = "<"
+            endianness = "Little"
+        else:
+            logger.critical(f"DPX magic number not recognised {self.file}: {magic!r}")
+            return
+
+        try:
+            version = self.read_string(OFFSET_VERSION, 8)
+            width = self.unpack("I", OFFSET_PIXELS_PER_LINE)
+            height = self.unpack("I", OFFSET_LINES_PER_ELEMENT)
+            descriptor = self.header[OFFSET_ELEMENT_DESCRIPTOR]
+            bit_depth = self.header[OFFSET_ELEMENT_BIT_SIZE]
+            packing = self.unpack("H", OFFSET_ELEMENT_PACKING)
+            encoding = self.unpack("H", OFFSET_ELEMENT_ENCODING)
+            aspect_h = self.unpack("I", OFFSET_PIXEL_ASPECT_RATIO)
+            aspect_v = self.unpack("I", OFFSET_PIXEL_ASPECT_RATIO + 4)
+            self.image_data_offset = self.unpack("I", OFFSET_IMAGE_DATA)
+            self.declared_file_size = self.unpack("I", OFFSET_FILE_SIZE)
+            self.element_data_offset = self.unpack("I", OFFSET_ELEMENT_DATA_OFFSET)
+            line_padding = self.unpack("I", OFFSET_ELEMENT_EOL_PADDING)
+            image_padding = self.unpack("I", OFFSET_ELEMENT_EOI_PADDING)
+
+        except struct.error as e:
+            logger.error(f"{self.file}, {e}")
+            return
+
+        # Undefined (all ones) padding fields mean no padding
+        self.line_padding = 0 if line_padding == UNDEFINED_U32 else line_padding
+        self.image_padding = 0 if image_padding == UNDEFINED_U32 else image_padding
+
+        if aspect_h in (0, UNDEFINED_U32) or aspect_v in (0, UNDEFINED_U32):
+            pixel_aspect_ratio = 1.0
+        else:
+            pixel_aspect_ratio = aspect_h / aspect_v
+
+        display_aspect_ratio = width * pixel_aspect_ratio / height if height else 0.0
+
+        self.attributes = {
+            "Format": "DPX",
+            "Format_Version": version.lstrip("Vv"),
+            "Format_Compression": encoding_labels.get(encoding, str(encoding)),
+            "Format_Settings_Endianness": endianness,
+            "Format_Settings_Packing": packing_labels.get(packing, str(packing)),
+            "Width": str(width),
+            "Height": str(height),
+            "PixelAspectRatio": f"{pixel_aspect_ratio:.3f}",
+            "DisplayAspectRatio": f"{display_aspect_ratio:.3f}",
+            "ColorSpace": descriptor_labels.get(descriptor, str(descriptor)),
+            "BitDepth": str(bit_depth),
+            "Compression_Mode": "Lossless" if encoding in encoding_labels else "Lossy",
+        }
+        self.header_valid = True
+
+    def media_info_data(self):
+        """Return the attributes wrapped in MediaInfo's JSON structure.
+
+        Returns:
+            dict: `{"media": {"track": [General, Image]}}` mirroring the
+            layout `FileValidator` reads from MediaInfo output.
+        """
+        return {
+            "media": {
+                "@ref": self.file,
+                "track": [
+                    {"@type": "General", "Format": "DPX"},
+                    {"@type": "Image", **self.attributes},
+                ],
+            }
+        }
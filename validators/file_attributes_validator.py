@@ -5,21 +5,30 @@ output mode) against DPX image files and WAV audio (mag) files and validates
 selected technical metadata fields against expected reference values defined
 in the data model maps (`dpx_validation_map`, `wav_validation_map`).
 
+DPX frames are read in‑process by default using `DPXHeaderReader` (the
+"native" backend configured in `config.CONFIG["attributes"]`), which avoids a
+MediaInfo subprocess per frame. MediaInfo remains available as the DPX
+backend, or as an optional cross‑check of the native values. WAV files are
+likewise read in‑process by `WAVChunkReader` (`WAV_BACKEND`), which also
+fails files whose declared data length does not fit the file and exposes the
+Broadcast WAVE `bext` chunk as `bext`.
+
 Workflow (typical):
     v = FileValidator(path_to_file)
-    v.read_attributes()                 # runs MediaInfo -> raw JSON bytes
+    v.read_attributes()                 # native header or MediaInfo JSON
     v.format_attributes_validation()    # parses, dispatches, validates
     if v.format_verified:
         ...
 
 Validation logic is format‑specific:
-    * WAV: SamplingRate, BitDepth
+    * WAV: SamplingRate, BitDepth (and, natively read, the data length)
     * DPX: Version, Compression, Endianness, Packing, Width, Height,
       PixelAspectRatio, DisplayAspectRatio, ColorSpace, BitDepth,
       Compression_Mode
 
 On failure a critical log is emitted and `format_verified` remains False.
-Fatal issues launching MediaInfo trigger a process exit
+MediaInfo failing on a single file fails that file only; MediaInfo missing
+from the system PATH triggers a process exit.
 """
 
 import logging
@@ -27,8 +36,14 @@ import os
 import subprocess
 import json
 import sys
+import time
 
+import config
 from data.file_attributes_model import switches, dpx_validation_map, wav_validation_map
+from validators.dpx_header_reader import DPXHeaderReader
+from validators.wav_chunk_reader import WAVChunkReader
+from validation_cache import get_validation_cache
+from run_metrics import observe_stage
 
 logger = logging.getLogger(__name__)
 
@@ -38,11 +53,20 @@ class FileValidator:
 
     Args:
         file (str): Path to the target media file (DPX or WAV).
+        backend (str, optional): DPX attribute backend, "native" or
+            "mediainfo". Defaults to the configured `DPX_BACKEND`.
+        file_attributes (bytes, optional): MediaInfo JSON already read for
+            this file (e.g. by `MediaInfoBatchReader`); skips the per-file
+            MediaInfo run.
+
+    Attributes:
+        bext (dict | None): Broadcast WAVE metadata of a natively read WAV.
     """
-    def __init__(self, file):
+    def __init__(self, file, backend=None, file_attributes=None):
 
         self.file = file
-        self.file_attributes = None
+        self.backend = backend or config.CONFIG["attributes"]["DPX_BACKEND"]
+        self.file_attributes = file_attributes
         self.parsed_data = None
         self.format = None
         self.sample_rate = None
@@ -57,24 +81,143 @@ class FileValidator:
         self.frame_rate = None
         self.color_space = None
         self.compression_mode = None
+        self.cross_check_failed = False
+        self.length_verified = True
+        self.bext = None
+        self.from_cache = False
+        self.started = None
         self.format_verified = False
 
     def read_attributes(self):
+        """Read technical attributes using the configured backend.
+
+        DPX frames use the native header reader unless the MediaInfo backend
+        is selected, and WAV files the native chunk reader unless
+        `WAV_BACKEND` is "mediainfo"; all other files are read with
+        MediaInfo. A trusted validation cache verdict for the unchanged file
+        skips reading.
+        """
+        self.started = time.perf_counter()
+        if self.read_cached_verdict():
+            return
+
+        if self.backend == "native" and self.file.lower().endswith(".dpx"):
+            self.read_native_attributes()
+            if config.CONFIG["attributes"]["MEDIAINFO_CROSS_CHECK"]:
+                self.mediainfo_cross_check()
+        elif config.CONFIG["attributes"]["WAV_BACKEND"] == "native" and self.file.lower().endswith(".wav"):
+            self.read_native_wav_attributes()
+        else:
+            self.read_mediainfo_attributes()
+
+    def read_cached_verdict(self):
+        """Load the attribute verdict from the validation cache if trusted.
+
+        Returns:
+            bool: True when `format_verified` was served from the cache.
+        """
+        validation_cache = get_validation_cache()
+        if validation_cache is None:
+            return False
+
+        cached_verdict = validation_cache.get_attributes(self.file)
+        if cached_verdict is None:
+            return False
+
+        self.format_verified = cached_verdict
+        self.from_cache = True
+        return True
+
+    def read_native_attributes(self, header=None):
+        """Parse the DPX header in‑process.
+
+        Args:
+            header (bytes, optional): Leading bytes of the file already read
+                by the caller; the header is read from disk when omitted.
+
+        Side Effects:
+            Populates `self.parsed_data` with a MediaInfo shaped structure, or
+            logs a critical message when the header cannot be decoded.
+        """
+        if self.started is None:
+            self.started = time.perf_counter()
+        header_reader = DPXHeaderReader(self.file)
+        if header is None:
+            header_reader.read_header()
+        header_reader.parse_header(header)
+
+        if header_reader.header_valid:
+            self.parsed_data = header_reader.media_info_data()
+        else:
+            logger.critical(f"Unable to read DPX header {self.file}")
+
+    def read_native_wav_attributes(self):
+        """Walk the WAV chunks in‑process.
+
+        Side Effects:
+            Populates `self.parsed_data` with a MediaInfo shaped structure,
+            `self.length_verified` and `self.bext`; leaves `parsed_data` None
+            when the file is not a readable WAVE file.
+        """
+        if self.started is None:
+            self.started = time.perf_counter()
+        chunk_reader = WAVChunkReader(self.file)
+        chunk_reader.read_chunks()
+
+        if chunk_reader.header_valid:
+            self.parsed_data = chunk_reader.media_info_data()
+            self.length_verified = chunk_reader.length_verified
+            self.bext = chunk_reader.bext
+        else:
+            logger.critical(f"Unable to read WAV chunks {self.file}")
+
+    def mediainfo_cross_check(self):
+        """Compare native DPX attributes with MediaInfo's interpretation.
+
+        Any field in `dpx_validation_map` on which the two backends disagree
+        is logged; the disagreement is recorded in `cross_check_failed` and
+        fails attribute validation.
+        """
+        if self.parsed_data is None:
+            return
+
+        self.read_mediainfo_attributes()
+        try:
+            mediainfo_track = json.loads(self.file_attributes)["media"]["track"][1]
+        except (json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
+            logger.error(f"{self.file}, MediaInfo cross-check unreadable: {e}")
+            self.cross_check_failed = True
+            return
+
+        native_track = self.parsed_data["media"]["track"][1]
+        for key in dpx_validation_map:
+            if native_track.get(key) != mediainfo_track.get(key):
+                self.cross_check_failed = True
+                logger.critical(
+                    f"MediaInfo cross-check mismatch {self.file}: {key}: "
+                    f"native {native_track.get(key)} != mediainfo {mediainfo_track.get(key)}"
+                )
+
+    def read_mediainfo_attributes(self):
         """Run MediaInfo with predefined switches and capture JSON output.
 
         Side Effects:
-            Populates `self.file_attributes` (raw JSON bytes).
-            Exits process on fatal MediaInfo invocation errors.
+            Populates `self.file_attributes` (raw JSON bytes) unless it was
+            supplied at construction; leaves it None when MediaInfo fails on
+            the file, which then fails validation.
+            Exits process when MediaInfo is not installed.
         """
+        if self.file_attributes is not None:
+            return
 
         command = ["mediainfo", switches, self.file]
+        started = time.perf_counter()
 
         try:
             self.file_attributes = subprocess.check_output(command)
+            observe_stage("mediainfo", started)
         except subprocess.CalledProcessError as e:
-            logging.critical(f"MediaInfo failed to process the file {self.file}: {e}")
-            print(f"MediaInfo failed to process the file {self.file}. SYSTEM EXIT.")
-            sys.exit(1)
+            logger.critical(f"MediaInfo failed to process the file {self.file}: {e}")
 
         except FileNotFoundError as e:
             logging.critical(
@@ -86,9 +229,7 @@ class FileValidator:
             sys.exit(1)
 
         except (IOError, OSError) as e:
-            logging.critical(f"An error occurred while trying to run MediaInfo: {e}")
-            print(f"An error occurred while trying to run MediaInfo. SYSTEM EXIT. {e}")
-            sys.exit(1)
+            logger.critical(f"An error occurred while trying to run MediaInfo on {self.file}: {e}")
 
     def wav_file_attributes(self):
         """Extract WAV attribute subset (sampling rate, bit depth) from JSON."""
@@ -114,10 +255,18 @@ class FileValidator:
 
         Determines file format (DPX/WAV) then delegates extraction and
         validation steps. Sets `format_verified` when all expected fields
-        match reference values.
+        match reference values. The verdict is stored in the validation cache
+        when enabled, and the time since the read began recorded as the file's
+        attribute latency.
         """
+        if self.from_cache:
+            return
+
         try:
-            self.parsed_data = json.loads(self.file_attributes)
+            if self.parsed_data is None:
+                if self.file_attributes is None:
+                    return
+                self.parsed_data = json.loads(self.file_attributes)
             self.format_type = self.parsed_data["media"]["track"][1]["Format"]
 
             if self.format_type == wav_validation_map["Format"]:
@@ -133,12 +282,19 @@ class FileValidator:
         except json.JSONDecodeError as e:
             logger.error(f"{self.file}, {e}")
 
+        observe_stage("attributes", self.started or time.perf_counter())
+
+        validation_cache = get_validation_cache()
+        if validation_cache is not None and self.parsed_data is not None:
+            validation_cache.store_attributes(self.file, self.format_verified)
+
     def wav_validate_attributes(self):
         """Validate extracted WAV attributes against reference map."""
         try:
             if (
                 self.sample_rate == wav_validation_map["SamplingRate"]
                 and self.bit_depth == wav_validation_map["BitDepth"]
+                and self.length_verified
             ):
                 self.format_verified = True
             else:
@@ -166,6 +322,7 @@ class FileValidator:
                 and self.colour_space == dpx_validation_map["ColorSpace"]
                 and self.bit_depth == dpx_validation_map["BitDepth"]
                 and self.compression_mode == dpx_validation_map["Compression_Mode"]
+                and not self.cross_check_failed
             ):
                 self.format_verified = True
             else:
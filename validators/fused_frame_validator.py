@@ -0,0 +1,128 @@
+"""Single-read DPX frame validation.
+
+This module defines `FusedFrameValidator`, which validates both the technical
+attributes and the checksum of a DPX frame from one streaming read. The first
+buffer read supplies the header to `FileValidator` (native backend) and every
+buffer, including the first, feeds the `ChecksumValidator` digest, so each
+frame crosses the network once instead of twice.
+
+    v = FusedFrameValidator(path_to_frame, manifest_path, manifest_index)
+    v.read_frame()
+    v.validate_attributes()
+    v.validate_checksum()
+    v.format_verified, v.hash_verified
+
+`verify_frame` wraps the same steps as a `ChecksumEngine` worker.
+"""
+
+import logging
+
+import validators.checksum_engine as checksum_engine
+from validators.checksum_validator import ChecksumValidator
+from validators.dpx_header_reader import HEADER_SIZE
+from validators.file_attributes_validator import FileValidator
+from validators.read_engine import FileReadEngine
+
+logger = logging.getLogger(__name__)
+
+
+class FusedFrameValidator:
+    """Validate a DPX frame's attributes and checksum from a single read.
+
+    Args:
+        file (str): Path to the DPX frame.
+        checksum_manifest (str): Path to the sequence checksum manifest.
+        manifest_index (ChecksumManifest, optional): Shared parsed manifest.
+    """
+    def __init__(self, file, checksum_manifest, manifest_index=None):
+
+        self.file = file
+        self.header = None
+        self.file_validator = FileValidator(file, backend="native")
+        self.checksum_validator = ChecksumValidator(file, checksum_manifest, manifest_index)
+        self.format_verified = False
+        self.hash_verified = False
+
+    def read_frame(self):
+        """Stream the frame once, keeping the header and hashing every buffer.
+
+        The header is copied out of the first buffer because `FileReadEngine`
+        may reuse buffers between chunks. The read is skipped entirely when
+        the trusted validation cache holds both results for the frame.
+        """
+        if self.read_from_cache():
+            return
+
+        try:
+            for buffer in FileReadEngine(self.file).read_buffers():
+                if self.header is None:
+                    self.header = bytes(buffer[:HEADER_SIZE])
+                self.checksum_validator.update_file_hash(buffer)
+
+            self.checksum_validator.finalise_file_hash()
+
+        except FileNotFoundError as e:
+            logger.error(f"{self.file}, {e}")
+        except (IOError, OSError) as e:
+            logger.error(f"{self.file}, {e}")
+
+    def read_from_cache(self):
+        """Serve digest and attribute verdict from the validation cache.
+
+        Returns:
+            bool: True when both results were cached for the unchanged frame.
+        """
+        return (
+            self.checksum_validator.read_cached_checksums()
+            and self.file_validator.read_cached_verdict()
+        )
+
+    def validate_attributes(self):
+        """Validate the header captured by `read_frame` against the DPX profile."""
+        if self.file_validator.from_cache:
+            self.format_verified = self.file_validator.format_verified
+            return
+
+        if self.header is None:
+            logger.critical(f"Unable to read DPX header {self.file}")
+            return
+
+        self.file_validator.read_native_attributes(self.header)
+        self.file_validator.format_attributes_validation()
+        self.format_verified = self.file_validator.format_verified
+
+    def validate_checksum(self):
+        """Compare the digest computed by `read_frame` with the manifest."""
+        self.checksum_validator.file_name_extract()
+        self.checksum_validator.seek_in_manifest()
+        self.checksum_validator.validate_checksum()
+        self.hash_verified = self.checksum_validator.hash_verified
+
+
+def verify_frame(job, manifest_index=None):
+    """`ChecksumEngine` worker running the fused single-read validation.
+
+    Args:
+        job (tuple[str, str]): (frame path, checksum manifest path).
+        manifest_index (ChecksumManifest, optional): Shared parsed manifest;
+            falls back to the process worker's index of the job's manifest.
+
+    Returns:
+        tuple[str, bool, bool, dict, int]: File path, attribute verdict,
+        checksum verdict, digests by algorithm, bytes read.
+    """
+    file, checksum_file = job
+    fused_validator = FusedFrameValidator(
+        file, checksum_file, manifest_index or checksum_engine.worker_manifest_index(checksum_file)
+    )
+    fused_validator.read_frame()
+    fused_validator.validate_attributes()
+    fused_validator.validate_checksum()
+
+    return (
+        file,
+        fused_validator.format_verified,
+        fused_validator.hash_verified,
+        fused_validator.checksum_validator.checksums,
+        fused_validator.checksum_validator.bytes_read,
+    )
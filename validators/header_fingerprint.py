@@ -0,0 +1,103 @@
+"""DPX header fingerprint grouping.
+
+This module defines `HeaderFingerprinter`, which groups the frames of a DPX
+sequence by the content of their headers. Fields that legitimately change
+from frame to frame (file name, timestamps, key numbers, frame position,
+frame id, time code and user bits) are masked before the header bytes are
+hashed, so every frame scanned with the same settings yields the same
+fingerprint.
+
+Attribute validation then only needs to run once per group rather than once
+per frame, while any frame whose header differs from the rest of the
+sequence surfaces as an outlier:
+
+    f = HeaderFingerprinter(files)
+    f.group_frames()
+    f.find_outliers()
+    for fingerprint, group in f.groups.items():
+        ...
+"""
+
+import hashlib
+import logging
+
+from validators.dpx_header_reader import DPXHeaderReader
+
+logger = logging.getLogger(__name__)
+
+# (start, end) byte ranges of per-frame header fields (SMPTE 268M)
+masked_fields = [
+    (36, 136),      # generic header: image file name
+    (136, 160),     # generic header: creation date/time
+    (1432, 1532),   # orientation header: source image file name
+    (1532, 1556),   # orientation header: source date/time
+    (1668, 1680),   # film header: key number offset, prefix and count
+    (1712, 1716),   # film header: frame position in sequence
+    (1732, 1764),   # film header: frame identification
+    (1920, 1928),   # television header: time code and user bits
+]
+
+
+class HeaderFingerprinter:
+    """Group DPX frames by masked header fingerprint.
+
+    Args:
+        files (list[str]): Ordered list of DPX frame file paths.
+
+    Attributes:
+        groups (dict[str, list[str]]): Fingerprint -> frames sharing it, in
+            sequence order. The first frame of each group is its
+            representative for attribute validation.
+        outliers (list[str]): Frames outside the majority header group.
+        unreadable (list[str]): Frames whose header could not be read.
+    """
+    def __init__(self, files):
+
+        self.files = files
+        self.groups = {}
+        self.outliers = []
+        self.unreadable = []
+
+    def fingerprint_file(self, file):
+        """Return the masked header fingerprint for a frame.
+
+        Args:
+            file (str): Path to the DPX frame.
+
+        Returns:
+            str | None: Hex digest of the masked header, or None when the
+            header could not be read.
+        """
+        header_reader = DPXHeaderReader(file)
+        header_reader.read_header()
+        if not header_reader.header:
+            return None
+
+        header = bytearray(header_reader.header)
+        for start, end in masked_fields:
+            header[start:end] = bytes(len(header[start:end]))
+
+        return hashlib.blake2b(header, digest_size=16).hexdigest()
+
+    def group_frames(self):
+        """Fingerprint every frame and collect frames into `groups`."""
+        for file in self.files:
+            fingerprint = self.fingerprint_file(file)
+            if fingerprint is None:
+                self.unreadable.append(file)
+                logger.critical(f"Unable to read DPX header {file}")
+            else:
+                self.groups.setdefault(fingerprint, []).append(file)
+
+    def find_outliers(self):
+        """Record and log every frame outside the largest header group."""
+        if len(self.groups) <= 1:
+            return
+
+        majority = max(self.groups, key=lambda fingerprint: len(self.groups[fingerprint]))
+        for fingerprint, group in self.groups.items():
+            if fingerprint == majority:
+                continue
+            for file in group:
+                self.outliers.append(file)
+                logger.critical(f"Header outlier: {file} differs from sequence header")
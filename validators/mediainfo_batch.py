@@ -0,0 +1,137 @@
+"""Batched MediaInfo attribute reading.
+
+This module defines `MediaInfoBatchReader`, which runs MediaInfo over many
+files per invocation instead of one process per file. Files are split into
+batches of `MEDIAINFO_BATCH_SIZE`, each batch is passed to a single
+`mediainfo --Output=JSON` call, and the batches run on a bounded pool of
+`MEDIAINFO_WORKERS` threads (each thread only waits on its subprocess).
+
+The multi‑file JSON output is split back into one document per file,
+re‑serialised in the single‑file layout (`{"media": {...}}`) so that
+`FileValidator.format_attributes_validation` consumes it unchanged:
+
+    r = MediaInfoBatchReader(files)
+    r.read_attributes()
+    r.file_attributes[path]     # raw JSON bytes for one file
+
+Files missing from the output (e.g. a failed batch) are simply absent from
+`file_attributes`; callers fall back to a per‑file MediaInfo run for them.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from data.file_attributes_model import switches
+from run_metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+
+class MediaInfoBatchReader:
+    """Read MediaInfo JSON for many files using batched invocations.
+
+    Args:
+        files (list[str]): Paths of the files to read.
+        batch_size (int, optional): Files per MediaInfo invocation. Defaults
+            to the configured `MEDIAINFO_BATCH_SIZE`.
+        workers (int, optional): Concurrent MediaInfo processes. Defaults to
+            the configured `MEDIAINFO_WORKERS`.
+
+    Attributes:
+        file_attributes (dict[str, bytes]): File path -> single-file JSON.
+    """
+    def __init__(self, files, batch_size=None, workers=None):
+
+        self.files = files
+        self.batch_size = batch_size or config.CONFIG["attributes"]["MEDIAINFO_BATCH_SIZE"]
+        self.workers = workers or config.CONFIG["attributes"]["MEDIAINFO_WORKERS"]
+        self.batches = []
+        self.file_attributes = {}
+
+    def build_batches(self):
+        """Split `files` into consecutive batches of `batch_size`."""
+        self.batches = [
+            self.files[i:i + self.batch_size]
+            for i in range(0, len(self.files), self.batch_size)
+        ]
+
+    def read_batch(self, batch):
+        """Run one MediaInfo invocation over a batch of files.
+
+        Args:
+            batch (list[str]): File paths passed to a single MediaInfo call.
+
+        Returns:
+            dict[str, bytes]: Per-file JSON for every file found in the output.
+        """
+        command = ["mediainfo", switches, *batch]
+        started = time.perf_counter()
+
+        try:
+            output = subprocess.check_output(command)
+            observe_stage("mediainfo", started, files=len(batch))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"MediaInfo batch failed ({len(batch)} files from {batch[0]}): {e}")
+            return {}
+        except (IOError, OSError) as e:
+            logger.error(f"An error occurred while trying to run MediaInfo: {e}")
+            return {}
+
+        return self.split_output(output, batch)
+
+    def split_output(self, output, batch):
+        """Split multi-file MediaInfo JSON into single-file documents.
+
+        MediaInfo emits a list of `{"media": {...}}` objects for several
+        inputs (older releases use `{"media": [...]}`); each media entry's
+        `@ref` identifies the input path it describes.
+
+        Args:
+            output (bytes): Raw MediaInfo JSON output.
+            batch (list[str]): File paths that were passed to MediaInfo.
+
+        Returns:
+            dict[str, bytes]: File path -> single-file JSON bytes.
+        """
+        try:
+            parsed = json.loads(output)
+        except json.JSONDecodeError as e:
+            logger.error(f"MediaInfo batch output unreadable from {batch[0]}: {e}")
+            return {}
+
+        if isinstance(parsed, list):
+            media_entries = [item.get("media") for item in parsed]
+        elif isinstance(parsed.get("media"), list):
+            media_entries = parsed["media"]
+        else:
+            media_entries = [parsed.get("media")]
+
+        batch_paths = {os.path.abspath(file): file for file in batch}
+        results = {}
+        for media in media_entries:
+            if not media:
+                continue
+            file = batch_paths.get(os.path.abspath(media.get("@ref", "")))
+            if file is None:
+                logger.error(f"MediaInfo returned an unexpected file: {media.get('@ref')}")
+                continue
+            results[file] = json.dumps({"media": media}).encode("utf-8")
+
+        return results
+
+    def read_attributes(self):
+        """Read every batch on the worker pool and collect per-file JSON."""
+        self.build_batches()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for results in executor.map(self.read_batch, self.batches):
+                self.file_attributes.update(results)
+
+        missing = len(self.files) - len(self.file_attributes)
+        if missing:
+            logger.warning(f"MediaInfo batch returned no data for {missing} files")
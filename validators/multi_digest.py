@@ -0,0 +1,120 @@
+"""Several digests from a single read.
+
+This module defines `MultiDigest`, which feeds every buffer of a file to one
+hash object per algorithm, so md5 plus sha256 / sha512 / blake2b costs one
+read of the file instead of one read per algorithm:
+
+    digest = MultiDigest(["md5", "sha256"])
+    digest.update(buffer)
+    digest.hexdigests()         # {"md5": "...", "sha256": "..."}
+
+Algorithm names follow the checksum file extensions (`.md5`, `.sha256`, ...)
+and hashlib's names. hashlib provides md5, sha1, sha256, sha512, blake2b and
+blake2s. The faster non-cryptographic xxh3 (64-bit) and xxh128 need the
+`xxhash` package, and blake3 the `blake3` package; they are available when
+installed:
+
+    md5      ~0.6 GB/s per core     blake2b        ~0.6-1 GB/s
+    sha256   ~0.5-2 GB/s (SHA-NI)   blake3         several GB/s (SIMD)
+    sha512   ~0.6-0.9 GB/s          xxh3 / xxh128  ~6-10+ GB/s
+
+`python -m benchmarks.hash_benchmark` measures them on the host.
+"""
+
+import hashlib
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+HASHLIB_ALGORITHMS = ("md5", "sha1", "sha256", "sha512", "blake2b", "blake2s")
+OPTIONAL_ALGORITHMS = ("xxh3", "xxh128", "blake3")
+
+# Every algorithm recognised in checksum file names and BSD tags
+KNOWN_ALGORITHMS = HASHLIB_ALGORITHMS + OPTIONAL_ALGORITHMS
+
+# Algorithms that can be computed here
+SUPPORTED_ALGORITHMS = HASHLIB_ALGORITHMS + tuple(
+    algorithm
+    for algorithm, module in (("xxh3", xxhash), ("xxh128", xxhash), ("blake3", blake3))
+    if module is not None
+)
+
+# Checksum file extensions / tool tags naming an algorithm differently
+ALGORITHM_ALIASES = {
+    "b2": "blake2b",
+    "b3": "blake3",
+    "xxh3_64": "xxh3",
+    "xxh3_128": "xxh128",
+}
+
+# Hex digest length of each algorithm
+HEX_LENGTHS = {
+    "md5": 32, "sha1": 40, "sha256": 64, "sha512": 128, "blake2b": 128, "blake2s": 64,
+    "xxh3": 16, "xxh128": 32, "blake3": 64,
+}
+
+# Hex digest length -> algorithm assumed when nothing else names it; the
+# common choice wins where lengths are shared (md5 / xxh128, sha256 /
+# blake3 / blake2s, sha512 / blake2b)
+DIGEST_LENGTHS = {16: "xxh3", 32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+
+# Packages providing the optional algorithms
+OPTIONAL_PACKAGES = {"xxh3": "xxhash", "xxh128": "xxhash", "blake3": "blake3"}
+
+
+def algorithm_name(name):
+    """Return the algorithm for an extension or BSD tag, or None if unknown.
+
+    Args:
+        name (str): e.g. "sha256", "SHA-256", "BLAKE2b", "XXH128", "b3".
+    """
+    name = name.lower().replace("-", "")
+    name = ALGORITHM_ALIASES.get(name, name)
+    return name if name in KNOWN_ALGORITHMS else None
+
+
+def new_hasher(algorithm):
+    """Return a new hash object with `update` / `hexdigest` for `algorithm`.
+
+    Raises:
+        ValueError: The algorithm is unknown or its package is not installed.
+    """
+    if algorithm in HASHLIB_ALGORITHMS:
+        return hashlib.new(algorithm)
+    if algorithm in SUPPORTED_ALGORITHMS:
+        if algorithm == "xxh3":
+            return xxhash.xxh3_64()
+        if algorithm == "xxh128":
+            return xxhash.xxh3_128()
+        return blake3.blake3()
+    if algorithm in OPTIONAL_PACKAGES:
+        raise ValueError(f"{algorithm} needs the {OPTIONAL_PACKAGES[algorithm]} package")
+
+    raise ValueError(f"Unsupported digest algorithm: {algorithm}")
+
+
+class MultiDigest:
+    """Compute several digests over the same stream of buffers.
+
+    Args:
+        algorithms (Iterable[str]): Algorithm names; duplicates are ignored.
+    """
+    def __init__(self, algorithms):
+
+        self.hashers = {algorithm: new_hasher(algorithm) for algorithm in dict.fromkeys(algorithms)}
+
+    def update(self, buffer):
+        """Feed a buffer to every digest."""
+        for hasher in self.hashers.values():
+            hasher.update(buffer)
+
+    def hexdigests(self):
+        """Return algorithm -> lower case hex digest."""
+        return {algorithm: hasher.hexdigest() for algorithm, hasher in self.hashers.items()}
@@ -0,0 +1,258 @@
+"""High-throughput file reading for checksum computation.
+
+This module defines `FileReadEngine`, which streams a file as a sequence of
+buffers using one of several read strategies (`READ_MODE` in
+`config.CONFIG["checksums"]`):
+
+    buffered  Plain `read()` calls returning a new bytes object per chunk
+              (the original behaviour).
+    readinto  `readinto()` a single reusable buffer; no per-chunk allocation.
+    mmap      Memory-map the file and hand out slices of the mapping.
+    direct    O_DIRECT reads into a page-aligned buffer, bypassing the page
+              cache. Falls back to `readinto` where the filesystem refuses
+              O_DIRECT.
+
+When `FADVISE` is enabled (and `os.posix_fadvise` exists), the kernel is told
+the file will be read sequentially, and pages already consumed are dropped
+(POSIX_FADV_DONTNEED), so hashing a multi-terabyte delivery does not evict
+everything else from the page cache.
+
+Buffers yielded by `read_buffers` may be reused for the next chunk; consumers
+must finish with (or copy) each buffer before requesting the next:
+
+    for buffer in FileReadEngine(path).read_buffers():
+        digest.update(buffer)
+
+Consumers in other threads (the validation pipeline's hash stage) read into
+buffers from a shared `BufferPool` instead (`read_pooled`): each buffer is
+handed over without a copy and returned to the pool once digested, so the
+pool's size bounds the memory of every file in flight.
+"""
+
+import logging
+import mmap
+import os
+import queue
+
+import config
+
+logger = logging.getLogger(__name__)
+
+READ_MODES = ("buffered", "readinto", "mmap", "direct")
+
+# O_DIRECT requires offsets, lengths and memory aligned to the block size
+DIRECT_ALIGNMENT = 4096
+
+
+class BufferPool:
+    """Fixed set of page-aligned buffers shared by reader and consumer threads.
+
+    Args:
+        count (int): Number of buffers; `acquire` blocks while all are in use.
+        buffer_size (int): Bytes per buffer, rounded up to `DIRECT_ALIGNMENT`
+            so the buffers also serve O_DIRECT reads.
+    """
+    def __init__(self, count, buffer_size):
+
+        self.buffer_size = -(-buffer_size // DIRECT_ALIGNMENT) * DIRECT_ALIGNMENT
+        self.buffers = [mmap.mmap(-1, self.buffer_size) for _ in range(count)]
+        # Last in, first out: buffers never needed are never touched
+        self.free = queue.LifoQueue()
+        for buffer in self.buffers:
+            self.free.put(buffer)
+
+    def acquire(self):
+        """Take a free buffer, waiting for one to be released."""
+        return self.free.get()
+
+    def release(self, buffer):
+        """Return a buffer to the pool."""
+        self.free.put(buffer)
+
+    def close(self):
+        """Unmap every buffer."""
+        for buffer in self.buffers:
+            buffer.close()
+
+
+class FileReadEngine:
+    """Stream a file as buffers using a configurable read strategy.
+
+    Args:
+        file (str): Path to the file to read.
+        mode (str, optional): One of `READ_MODES`. Defaults to the configured
+            `READ_MODE`.
+        buffer_size (int, optional): Bytes per buffer. Defaults to the
+            configured `BUFFER_SIZE`.
+        fadvise (bool, optional): Issue sequential / drop-behind hints.
+            Defaults to the configured `FADVISE`.
+    """
+    def __init__(self, file, mode=None, buffer_size=None, fadvise=None):
+
+        checksum_config = config.CONFIG["checksums"]
+        self.file = file
+        self.mode = mode or checksum_config["READ_MODE"]
+        self.buffer_size = buffer_size or checksum_config["BUFFER_SIZE"]
+        if fadvise is None:
+            fadvise = checksum_config["FADVISE"]
+        self.fadvise = fadvise and hasattr(os, "posix_fadvise")
+
+        if self.mode not in READ_MODES:
+            raise ValueError(f"Unknown read mode {self.mode}, expected one of {READ_MODES}")
+
+    def advise(self, fd, offset, length, advice):
+        """Pass an access pattern hint to the kernel when enabled."""
+        if self.fadvise:
+            try:
+                os.posix_fadvise(fd, offset, length, advice)
+            except OSError:
+                self.fadvise = False
+
+    def read_buffers(self):
+        """Yield the file content as consecutive buffers.
+
+        Raises:
+            OSError: When the file cannot be opened or read.
+        """
+        if self.mode == "direct":
+            yield from self.read_direct()
+            return
+
+        with open(self.file, "rb", buffering=0) as f:
+            fd = f.fileno()
+            self.advise(fd, 0, 0, getattr(os, "POSIX_FADV_SEQUENTIAL", 0))
+
+            if self.mode == "mmap":
+                yield from self.read_mmap(f)
+            elif self.mode == "readinto":
+                yield from self.read_into(f)
+            else:
+                yield from self.read_chunks(f)
+
+            self.advise(fd, 0, 0, getattr(os, "POSIX_FADV_DONTNEED", 0))
+
+    def read_pooled(self, buffer_pool):
+        """Yield (buffer, byte count) pairs read into buffers from `buffer_pool`.
+
+        A yielded buffer belongs to the consumer, which returns it with
+        `buffer_pool.release`. O_DIRECT reads are used in "direct" mode;
+        every other mode reads with `readinto`, since slices of a mapping
+        cannot outlive the read.
+
+        Raises:
+            OSError: When the file cannot be opened or read.
+        """
+        fd = self.open_direct() if self.mode == "direct" else None
+        if fd is not None:
+            with os.fdopen(fd, "rb", buffering=0) as f:
+                yield from self.read_pool_buffers(f, buffer_pool, direct=True)
+            return
+
+        with open(self.file, "rb", buffering=0) as f:
+            self.advise(f.fileno(), 0, 0, getattr(os, "POSIX_FADV_SEQUENTIAL", 0))
+            yield from self.read_pool_buffers(f, buffer_pool)
+            self.advise(f.fileno(), 0, 0, getattr(os, "POSIX_FADV_DONTNEED", 0))
+
+    def read_pool_buffers(self, f, buffer_pool, direct=False):
+        """Fill pool buffers from `f` until the end of the file."""
+        offset = 0
+        while True:
+            buffer = buffer_pool.acquire()
+            try:
+                count = os.preadv(f.fileno(), [buffer], offset) if direct else f.readinto(buffer)
+            except BaseException:
+                buffer_pool.release(buffer)
+                raise
+            if not count:
+                buffer_pool.release(buffer)
+                return
+
+            yield buffer, count
+            if not direct:
+                self.drop_behind(f.fileno(), offset, count)
+            offset += count
+            if direct and count < buffer_pool.buffer_size:
+                return
+
+    def read_chunks(self, f):
+        """Yield new bytes objects from plain `read` calls."""
+        offset = 0
+        while buffer := f.read(self.buffer_size):
+            yield buffer
+            self.drop_behind(f.fileno(), offset, len(buffer))
+            offset += len(buffer)
+
+    def read_into(self, f):
+        """Yield views of a single reusable buffer filled with `readinto`."""
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        offset = 0
+        while count := f.readinto(view):
+            yield view[:count]
+            self.drop_behind(f.fileno(), offset, count)
+            offset += count
+
+    def read_mmap(self, f):
+        """Yield slices of a read-only memory mapping of the file."""
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            if hasattr(mapping, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+
+            view = memoryview(mapping)
+            try:
+                for offset in range(0, size, self.buffer_size):
+                    chunk = view[offset:offset + self.buffer_size]
+                    yield chunk
+                    chunk.release()
+            finally:
+                view.release()
+
+    def open_direct(self):
+        """Open the file for O_DIRECT reads.
+
+        Returns:
+            int | None: The descriptor; None, with the mode switched to
+            `readinto`, where O_DIRECT is unsupported.
+        """
+        o_direct = getattr(os, "O_DIRECT", None)
+        if o_direct is not None:
+            try:
+                return os.open(self.file, os.O_RDONLY | o_direct)
+            except OSError as e:
+                logger.warning(f"O_DIRECT unavailable for {self.file} ({e}), using readinto")
+
+        self.mode = "readinto"
+        return None
+
+    def read_direct(self):
+        """Yield views of a page-aligned buffer filled with O_DIRECT reads."""
+        fd = self.open_direct()
+        if fd is None:
+            yield from self.read_buffers()
+            return
+
+        buffer_size = max(DIRECT_ALIGNMENT, self.buffer_size - self.buffer_size % DIRECT_ALIGNMENT)
+        # Anonymous mappings are page aligned, as O_DIRECT requires
+        buffer = mmap.mmap(-1, buffer_size)
+        view = memoryview(buffer)
+        try:
+            offset = 0
+            while count := os.preadv(fd, [buffer], offset):
+                chunk = view[:count]
+                yield chunk
+                chunk.release()
+                offset += count
+                if count < buffer_size:
+                    break
+        finally:
+            view.release()
+            buffer.close()
+            os.close(fd)
+
+    def drop_behind(self, fd, offset, length):
+        """Drop pages that have already been consumed from the page cache."""
+        self.advise(fd, offset, length, getattr(os, "POSIX_FADV_DONTNEED", 0))
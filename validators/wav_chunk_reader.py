@@ -0,0 +1,273 @@
+"""Native WAV (RIFF / RF64 / BWF) chunk parsing.
+
+This module defines `WAVChunkReader`, an in‑process reader for the chunk
+structure of mag WAV files. The chunk list is walked with seeks only: the
+8 byte header of each chunk is read and the body skipped, except for the
+small `fmt `, `ds64` and `bext` chunks, so the audio itself is never read and
+inspecting a file costs a few small reads instead of a MediaInfo subprocess.
+
+Three containers are accepted:
+
+    RIFF    classic WAVE, 32-bit chunk sizes (files up to 4 GiB)
+    RF64    EBU Tech 3306; the `ds64` chunk carries 64-bit RIFF and data
+    BW64    sizes, the 32-bit fields then hold 0xFFFFFFFF
+
+The `data` chunk's declared length is checked against the file size, so a
+truncated transfer (file shorter than its header says) fails validation;
+`length_verified` records the result. A data length that is not a whole
+number of sample frames fails as well.
+
+The Broadcast WAVE `bext` chunk (EBU Tech 3285) is decoded into `bext`:
+description, originator, origination date / time, time reference, UMID and
+coding history.
+
+The format fields use the names and string formatting of MediaInfo's JSON
+output, so the result validates directly against `wav_validation_map`:
+
+    r = WAVChunkReader(path_to_wav)
+    r.read_chunks()
+    if r.header_valid and r.length_verified:
+        r.attributes["SamplingRate"]   # "48000"
+        r.bext["originator"]
+"""
+
+import logging
+import os
+import struct
+
+logger = logging.getLogger(__name__)
+
+RIFF_CONTAINERS = (b"RIFF", b"RF64", b"BW64")
+WAVE_FORM = b"WAVE"
+
+# 32-bit size field deferring to the ds64 chunk (RF64 / BW64)
+SIZE_IN_DS64 = 0xFFFFFFFF
+
+CHUNK_HEADER_SIZE = 8
+
+# Chunk bodies read in full; any other chunk is skipped with a seek
+FMT_LIMIT = 1024
+DS64_LIMIT = 1024
+BEXT_LIMIT = 1024 * 1024
+
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# MediaInfo labels for the WAVE format codes
+format_labels = {
+    0x0001: "PCM",
+    0x0003: "PCM",
+    0x0006: "A-Law",
+    0x0007: "U-Law",
+    0x0055: "MPEG Audio",
+}
+
+# bext fixed fields (EBU Tech 3285 v2): name, struct format
+bext_fields = (
+    ("description", "256s"),
+    ("originator", "32s"),
+    ("originator_reference", "32s"),
+    ("origination_date", "10s"),
+    ("origination_time", "8s"),
+    ("time_reference", "Q"),
+    ("version", "H"),
+    ("umid", "64s"),
+    ("loudness_value", "h"),
+    ("loudness_range", "h"),
+    ("max_true_peak_level", "h"),
+    ("max_momentary_loudness", "h"),
+    ("max_short_term_loudness", "h"),
+)
+bext_struct = struct.Struct("<" + "".join(fmt for _, fmt in bext_fields))
+BEXT_RESERVED = 180
+BEXT_FIXED_SIZE = bext_struct.size + BEXT_RESERVED
+
+
+class WAVChunkReader:
+    """Walk a WAV file's chunks and decode its format, data extent and bext.
+
+    Args:
+        file (str): Path to the WAV file.
+
+    Attributes:
+        container (bytes): b"RIFF", b"RF64" or b"BW64".
+        file_size (int): Size of the file on disk.
+        riff_size (int): Declared RIFF form size (ds64 value for RF64).
+        data_offset (int): Offset of the first audio byte.
+        data_size (int): Declared length of the `data` chunk.
+        block_align (int): Bytes per sample frame.
+        attributes (dict): MediaInfo style field -> value map.
+        bext (dict | None): Decoded Broadcast WAVE extension, if present.
+        header_valid (bool): True once `fmt ` and `data` were found.
+        length_verified (bool): True when the declared lengths fit the file.
+    """
+    def __init__(self, file):
+
+        self.file = file
+        self.container = None
+        self.file_size = None
+        self.riff_size = None
+        self.data_offset = None
+        self.data_size = None
+        self.ds64_data_size = None
+        self.block_align = None
+        self.attributes = {}
+        self.bext = None
+        self.header_valid = False
+        self.length_verified = False
+
+    def read_chunks(self):
+        """Walk the chunk list, then check the declared lengths."""
+        try:
+            with open(self.file, "rb") as f:
+                self.file_size = os.fstat(f.fileno()).st_size
+                if self.read_form(f):
+                    self.walk_chunks(f)
+
+        except FileNotFoundError as e:
+            logger.error(f"{self.file}, {e}")
+            return
+        except (IOError, OSError) as e:
+            logger.error(f"{self.file}, {e}")
+            return
+
+        if self.container is None:
+            return
+        if not self.attributes:
+            logger.critical(f"WAV fmt chunk missing or unreadable {self.file}")
+        elif self.data_offset is None:
+            logger.critical(f"WAV data chunk missing {self.file}")
+        else:
+            self.header_valid = True
+            self.verify_length()
+
+    def read_form(self, f):
+        """Read the 12 byte RIFF / RF64 / BW64 WAVE form header.
+
+        Returns:
+            bool: True when the file is a WAVE form.
+        """
+        form = f.read(12)
+        if len(form) < 12 or form[:4] not in RIFF_CONTAINERS or form[8:12] != WAVE_FORM:
+            logger.critical(f"Not a RIFF / RF64 WAVE file {self.file}: {form[:4]!r}")
+            return False
+
+        self.container = form[:4]
+        self.riff_size = struct.unpack_from("<I", form, 4)[0]
+        return True
+
+    def walk_chunks(self, f):
+        """Visit every chunk header, seeking over bodies that are not needed."""
+        offset = 12
+        while offset + CHUNK_HEADER_SIZE <= self.file_size:
+            f.seek(offset)
+            chunk_header = f.read(CHUNK_HEADER_SIZE)
+            if len(chunk_header) < CHUNK_HEADER_SIZE:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            body_offset = offset + CHUNK_HEADER_SIZE
+
+            if chunk_id == b"ds64":
+                self.parse_ds64(f.read(min(chunk_size, DS64_LIMIT)))
+            elif chunk_id == b"fmt ":
+                self.parse_fmt(f.read(min(chunk_size, FMT_LIMIT)))
+            elif chunk_id == b"bext":
+                self.parse_bext(f.read(min(chunk_size, BEXT_LIMIT)))
+            elif chunk_id == b"data":
+                if chunk_size == SIZE_IN_DS64 and self.ds64_data_size is not None:
+                    chunk_size = self.ds64_data_size
+                self.data_offset = body_offset
+                self.data_size = chunk_size
+
+            # Chunks are word aligned: odd sized bodies carry a pad byte
+            offset = body_offset + chunk_size + (chunk_size & 1)
+
+    def parse_ds64(self, body):
+        """Take the 64-bit RIFF and data sizes of an RF64 / BW64 file."""
+        if len(body) < 16:
+            logger.error(f"{self.file}, ds64 chunk truncated")
+            return
+
+        riff_size, data_size = struct.unpack_from("<QQ", body)
+        if self.riff_size == SIZE_IN_DS64:
+            self.riff_size = riff_size
+        self.ds64_data_size = data_size
+
+    def parse_fmt(self, body):
+        """Decode WAVEFORMAT / WAVEFORMATEXTENSIBLE into MediaInfo fields."""
+        if len(body) < 16:
+            logger.error(f"{self.file}, fmt chunk truncated")
+            return
+
+        format_code, channels, sample_rate, _, block_align, bit_depth = struct.unpack_from("<HHIIHH", body)
+        if format_code == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+            valid_bits = struct.unpack_from("<H", body, 18)[0]
+            format_code = struct.unpack_from("<H", body, 24)[0]
+            bit_depth = valid_bits or bit_depth
+
+        self.block_align = block_align
+        self.attributes = {
+            "Format": format_labels.get(format_code, f"0x{format_code:04X}"),
+            "Channels": str(channels),
+            "SamplingRate": str(sample_rate),
+            "BitDepth": str(bit_depth),
+        }
+
+    def parse_bext(self, body):
+        """Decode the Broadcast WAVE extension chunk into `bext`."""
+        if len(body) < bext_struct.size:
+            logger.error(f"{self.file}, bext chunk truncated")
+            return
+
+        values = dict(zip((name for name, _ in bext_fields), bext_struct.unpack_from(body)))
+        for name, value in values.items():
+            if isinstance(value, bytes):
+                values[name] = value.split(b"\x00", 1)[0].decode("ascii", errors="replace").strip()
+        values["umid"] = body[348:412].hex() if any(body[348:412]) else ""
+        values["coding_history"] = (
+            body[BEXT_FIXED_SIZE:].split(b"\x00", 1)[0].decode("ascii", errors="replace").strip()
+        )
+        self.bext = values
+
+    def verify_length(self):
+        """Check the declared data and RIFF lengths against the file size.
+
+        Fails when the data chunk or the RIFF form ends past the end of the
+        file (a truncated transfer) or the data is not a whole number of
+        sample frames. Bytes beyond the declared RIFF form are only logged.
+        """
+        data_end = self.data_offset + self.data_size
+        riff_end = self.riff_size + 8
+
+        if data_end > self.file_size or riff_end > self.file_size:
+            logger.critical(
+                f"WAV truncated {self.file}: data declared to end at {data_end} bytes, "
+                f"RIFF at {riff_end}, file is {self.file_size}"
+            )
+            return
+        if self.block_align and self.data_size % self.block_align:
+            logger.critical(
+                f"WAV data length {self.data_size} is not a whole number of "
+                f"{self.block_align} byte sample frames {self.file}"
+            )
+            return
+        if riff_end + (riff_end & 1) < self.file_size:
+            logger.warning(f"{self.file}, {self.file_size - riff_end} bytes after the RIFF form")
+
+        self.length_verified = True
+
+    def media_info_data(self):
+        """Return the attributes wrapped in MediaInfo's JSON structure.
+
+        Returns:
+            dict: `{"media": {"track": [General, Audio]}}` mirroring the
+            layout `FileValidator` reads from MediaInfo output.
+        """
+        return {
+            "media": {
+                "@ref": self.file,
+                "track": [
+                    {"@type": "General", "Format": "Wave"},
+                    {"@type": "Audio", **self.attributes},
+                ],
+            }
+        }